@@ -0,0 +1 @@
+"""Benchmarks of HydroFlows workflows, run with airspeed velocity (asv)."""
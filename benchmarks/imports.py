@@ -0,0 +1,11 @@
+"""Benchmarks of the import time of HydroFlows and its command line interface."""
+
+
+class ImportTime:
+    """Import HydroFlows in a fresh interpreter."""
+
+    def timeraw_import_hydroflows(self):
+        return "import hydroflows"
+
+    def timeraw_import_cli(self):
+        return "import hydroflows.cli.main"
@@ -0,0 +1,110 @@
+"""Benchmarks of the construction, dryrun and export of workflows at scale.
+
+The synthetic workflows are built with the dummy methods: a rule which prepares
+`n_events` events, a rule which runs each event and a rule which combines the
+results of all events, i.e. with `n_events` + 2 method instances.
+"""
+
+import shutil
+import tempfile
+from pathlib import Path
+
+from hydroflows.methods.dummy import (
+    CombineDummyEvents,
+    PrepareDummyEvents,
+    RunDummyEvent,
+)
+from hydroflows.workflow import Workflow
+
+N_EVENTS = [10, 100, 1_000, 10_000]
+
+INPUT_FILES = {
+    "model_exe": "bin/model/model.exe",
+    "model_settings": "model/settings.toml",
+    "timeseries_csv": "data/timeseries.csv",
+}
+
+
+def create_workflow(root: Path, n_events: int) -> Workflow:
+    """Create a workflow with `n_events` + 2 method instances."""
+    wf = Workflow(root=root, config=INPUT_FILES, name="benchmark")
+    prepare_events = PrepareDummyEvents(
+        timeseries_csv=wf.get_ref("$config.timeseries_csv"),
+        output_dir="events",
+        rps=list(range(1, n_events + 1)),
+        wildcard="event",
+    )
+    wf.create_rule(prepare_events, rule_id="prepare_events")
+    simulate_events = RunDummyEvent(
+        event_csv=prepare_events.output.event_csv,
+        settings_toml=wf.get_ref("$config.model_settings"),
+        model_exe=wf.get_ref("$config.model_exe"),
+        output_dir="model",
+        event_name="{event}",
+    )
+    wf.create_rule(simulate_events, rule_id="simulate_events")
+    combine_events = CombineDummyEvents(
+        model_out_ncs=simulate_events.output.model_out_nc,
+        output_dir="results",
+    )
+    wf.create_rule(combine_events, rule_id="combine_events")
+    return wf
+
+
+class _WorkflowBenchmark:
+    params = N_EVENTS
+    param_names = ["n_events"]
+    timeout = 600
+
+    def setup(self, n_events: int):
+        self.root = Path(tempfile.mkdtemp())
+        for filename in INPUT_FILES.values():
+            file = self.root / filename
+            file.parent.mkdir(parents=True, exist_ok=True)
+            file.touch()
+        self.workflow = create_workflow(self.root, n_events)
+
+    def teardown(self, n_events: int):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+class Construction(_WorkflowBenchmark):
+    """Create the workflow and its rules."""
+
+    def time_create_workflow(self, n_events: int):
+        create_workflow(self.root, n_events)
+
+    def peakmem_create_workflow(self, n_events: int):
+        create_workflow(self.root, n_events)
+
+
+class Dryrun(_WorkflowBenchmark):
+    """Dryrun the workflow."""
+
+    def time_dryrun(self, n_events: int):
+        self.workflow.dryrun()
+
+    def peakmem_dryrun(self, n_events: int):
+        self.workflow.dryrun()
+
+
+class Export(_WorkflowBenchmark):
+    """Export the workflow to Snakemake, CWL and YAML."""
+
+    def time_to_snakemake(self, n_events: int):
+        self.workflow.to_snakemake("Snakefile")
+
+    def peakmem_to_snakemake(self, n_events: int):
+        self.workflow.to_snakemake("Snakefile")
+
+    def time_to_cwl(self, n_events: int):
+        self.workflow.to_cwl("benchmark.cwl")
+
+    def peakmem_to_cwl(self, n_events: int):
+        self.workflow.to_cwl("benchmark.cwl")
+
+    def time_to_yaml(self, n_events: int):
+        self.workflow.to_yaml(self.root / "benchmark.yml")
+
+    def peakmem_to_yaml(self, n_events: int):
+        self.workflow.to_yaml(self.root / "benchmark.yml")
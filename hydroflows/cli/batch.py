@@ -0,0 +1,193 @@
+"""Run many methods from a manifest file in one interpreter.
+
+A manifest is a JSON lines file with one method per line, e.g.::
+
+    {"method": "run_dummy_event", "kwargs": {"event_csv": "event1.csv", ...}}
+    {"method": "run_dummy_event", "kwargs": {"event_csv": "event2.csv", ...}}
+
+The manifest is run with ``hydroflows method --batch manifest.jsonl``, which avoids
+starting a new interpreter and importing the methods for each method. This is used by
+the Snakemake export to run all method instances of a rule with one job, see
+:py:meth:`~hydroflows.workflow.Workflow.to_snakemake`.
+
+The keyword-arguments in a manifest are resolved from the workflow config when the
+manifest is written. A manifest can therefore start with a ``{"config_hash": ...}`` line
+with the hash of this config (see :py:func:`hash_config`); reading the manifest fails if
+the hash does not match the current config, e.g. the Snakemake config.
+"""
+
+import hashlib
+import json
+import logging
+from concurrent.futures import as_completed
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional
+
+from hydroflows.workflow.executors import create_executor
+
+if TYPE_CHECKING:
+    from hydroflows.workflow.method import Method
+
+__all__ = [
+    "batch_records",
+    "hash_config",
+    "read_manifest",
+    "run_batch",
+    "run_from_kwargs",
+    "write_manifest",
+]
+
+logger = logging.getLogger(__name__)
+
+
+def hash_config(config: Dict[str, Any]) -> str:
+    """Return a hash of a (JSON serializable) workflow config."""
+    config_str = json.dumps(config, sort_keys=True, default=str)
+    return hashlib.sha256(config_str.encode()).hexdigest()
+
+
+def read_manifest(
+    manifest: Path, config_hash: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Read the method records of a manifest file.
+
+    Parameters
+    ----------
+    manifest : Path
+        The JSON lines manifest file.
+    config_hash : str, optional
+        The hash of the current workflow config, see :py:func:`hash_config`.
+        If the manifest was written with another config, a ValueError is raised.
+
+    Returns
+    -------
+    List[Dict[str, Any]]
+        The records with "method" and "kwargs" keys.
+    """
+    records = []
+    with open(manifest, "r") as f:
+        for i, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if i == 1 and isinstance(record, dict) and "config_hash" in record:
+                if config_hash is not None and record["config_hash"] != config_hash:
+                    raise ValueError(
+                        f"The config changed since {manifest} was written; "
+                        "export the workflow again to update the manifest."
+                    )
+                continue
+            if not isinstance(record, dict) or "method" not in record:
+                raise ValueError(f"Invalid record on line {i} of {manifest}: {line}")
+            kwargs = record.get("kwargs", {})
+            if not isinstance(kwargs, dict):
+                raise ValueError(f"Invalid kwargs on line {i} of {manifest}: {line}")
+            records.append({"method": record["method"], "kwargs": kwargs})
+    return records
+
+
+def batch_records(methods: Iterable["Method"]) -> List[Dict[str, Any]]:
+    """Return the manifest records of method instances."""
+    return [
+        {"method": method.name, "kwargs": method.to_kwargs(posix_path=True)}
+        for method in methods
+    ]
+
+
+def write_manifest(
+    manifest: Path, records: List[Dict[str, Any]], config_hash: Optional[str] = None
+) -> None:
+    """Write method records with "method" and "kwargs" keys to a manifest file.
+
+    If `config_hash` is set, it is written to the first line, see :py:func:`read_manifest`.
+    """
+    Path(manifest).parent.mkdir(parents=True, exist_ok=True)
+    with open(manifest, "w") as f:
+        if config_hash is not None:
+            f.write(json.dumps({"config_hash": config_hash}) + "\n")
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+
+def run_from_kwargs(
+    method_name: str,
+    kwargs: Dict[str, Any],
+    dry_run: bool = False,
+    touch_output: bool = False,
+) -> None:
+    """Initialize a method from its keyword-arguments and run it.
+
+    Parameters
+    ----------
+    method_name : str
+        The name of the method.
+    kwargs : Dict[str, Any]
+        The keyword-arguments of the method, see :py:meth:`Method.from_kwargs`.
+    dry_run, touch_output : bool, optional
+        Dryrun the method and create empty output files, see :py:meth:`Method.dryrun`.
+    """
+    from hydroflows.workflow.method import Method
+
+    method = Method.from_kwargs(method_name, **kwargs)
+    if dry_run:
+        method.dryrun(
+            input_files=[],
+            missing_file_error=touch_output,
+            touch_output=touch_output,
+        )
+    else:
+        method.run()
+
+
+def run_batch(
+    records: List[Dict[str, Any]],
+    max_workers: int = 1,
+    dry_run: bool = False,
+    touch_output: bool = False,
+) -> int:
+    """Run the methods of a manifest.
+
+    All methods are run, also if some fail. The errors are logged.
+
+    Parameters
+    ----------
+    records : List[Dict[str, Any]]
+        The records with "method" and "kwargs" keys, see :py:func:`read_manifest`.
+    max_workers : int, optional
+        The maximum number of methods to run in parallel in a process pool,
+        by default 1 (run in this process).
+    dry_run, touch_output : bool, optional
+        Dryrun the methods and create empty output files, see :py:meth:`Method.dryrun`.
+
+    Returns
+    -------
+    int
+        The number of failed methods.
+    """
+    run_kwargs = {"dry_run": dry_run, "touch_output": touch_output}
+    n_failed = 0
+    if max_workers <= 1:
+        for i, record in enumerate(records):
+            try:
+                run_from_kwargs(record["method"], record["kwargs"], **run_kwargs)
+            except Exception as e:
+                logger.error(f"{record['method']} (record {i + 1}) failed: {e}")
+                n_failed += 1
+    else:
+        with create_executor("processes", max_workers=max_workers) as pool:
+            futures = {
+                pool.submit(
+                    run_from_kwargs, record["method"], record["kwargs"], **run_kwargs
+                ): i
+                for i, record in enumerate(records)
+            }
+            for future in as_completed(futures):
+                i = futures[future]
+                if future.exception() is not None:
+                    method_name = records[i]["method"]
+                    logger.error(
+                        f"{method_name} (record {i + 1}) failed: {future.exception()}"
+                    )
+                    n_failed += 1
+    logger.info(f"Ran {len(records) - n_failed}/{len(records)} methods of the batch")
+    return n_failed
@@ -2,24 +2,30 @@
 
 We foresee the following commands:
 
-- hydroflows run: run a single method from the methods submodule, e.g.,:
-  hydroflows run build_wflow \
-    --params param1 param2 \
-    --inputs input1 input2 \
-    --outputs output1
+- hydroflows method: run a single method from the methods submodule, e.g.,:
+  hydroflows method build_wflow input=foo output=bar
+- hydroflows method --batch: run the methods of a manifest file, e.g.,:
+  hydroflows method --batch manifest.jsonl -j 4
+- hydroflows run: run a workflow from a yaml file, e.g.,:
+  hydroflows run workflow.yml --max-workers 4
+- hydroflows worker: keep methods imported to speed up `hydroflows method`, e.g.,:
+  hydroflows worker &
 
 optional
 - hydroflows init: initialize a new project
 - hydroflows create: create a new workflow
 """
 
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
 import click
 
 from hydroflows import __version__
+from hydroflows.cli.batch import read_manifest, run_batch
+from hydroflows.cli.worker import SOCKET_ENV, forward_method, serve
 from hydroflows.log import setuplog
 from hydroflows.workflow.method import Method
+from hydroflows.workflow.workflow import Workflow
 
 
 # Copied from rasterio.rio.options
@@ -78,6 +84,15 @@ overwrite_opt = click.option(
     help="Overwrite log message (instead of appending).",
 )
 
+socket_opt = click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(dir_okay=False),
+    default=None,
+    envvar=SOCKET_ENV,
+    help="Path of the worker socket.",
+)
+
 
 @click.group()
 @click.version_option(__version__, message="hydroflows version: %(version)s")
@@ -106,7 +121,7 @@ def cli(ctx, info, license, debug):  # , quiet, verbose):
 
 
 @cli.command(short_help="Run a method with a set of key-word arguments.")
-@click.argument("METHOD_NAME", type=str, nargs=1)
+@click.argument("METHOD_NAME", type=str, nargs=1, required=False)
 @click.argument(
     "KWARGS",
     nargs=-1,
@@ -120,6 +135,33 @@ def cli(ctx, info, license, debug):  # , quiet, verbose):
     is_flag=True,
     help="Create empty files at output location during dryrun.",
 )
+@click.option(
+    "--batch",
+    "manifest",
+    type=click.Path(exists=True, dir_okay=False),
+    default=None,
+    help="Run the methods of a JSON lines manifest instead of METHOD_NAME and KWARGS.",
+)
+@click.option(
+    "--config-hash",
+    type=str,
+    default=None,
+    help="Hash of the workflow config; fail if the --batch manifest was written "
+    "with another config.",
+)
+@click.option(
+    "--max-workers",
+    "-j",
+    type=int,
+    default=1,
+    help="Maximum number of methods of the --batch manifest to run in parallel.",
+)
+@click.option(
+    "--no-worker",
+    is_flag=True,
+    help="Run the method in this process, even if a worker is running.",
+)
+@socket_opt
 @click.pass_context
 def method(
     ctx: click.Context,
@@ -127,13 +169,49 @@ def method(
     kwargs: Dict[str, str],
     dry_run: bool = False,
     touch_output: bool = False,
+    manifest: Optional[str] = None,
+    config_hash: Optional[str] = None,
+    max_workers: int = 1,
+    no_worker: bool = False,
+    socket_path: Optional[str] = None,
 ):
     """Run a method with a set of key-word arguments.
 
     METHOD_NAME is the name of the method to run, e.g., 'build_wflow'.
     KWARGS is a list of key-value pairs, e.g., 'input=foo output=bar'.
+    The method is forwarded to a running worker, see 'hydroflows worker'.
+
+    With --batch, the methods of a manifest are run in this process, where each line
+    of the manifest is a JSON record like '{"method": "build_wflow", "kwargs": {...}}'.
     """
+    if manifest is not None and method_name is not None:
+        raise click.UsageError("METHOD_NAME and KWARGS cannot be used with --batch.")
+    elif manifest is None and method_name is None:
+        raise click.UsageError("Missing argument 'METHOD_NAME'.")
     logger = setuplog()
+    if manifest is not None:
+        try:
+            records = read_manifest(manifest, config_hash=config_hash)
+            n_failed = run_batch(
+                records,
+                max_workers=max_workers,
+                dry_run=dry_run,
+                touch_output=touch_output,
+            )
+        except Exception as e:
+            logger.error(e)
+            ctx.exit(1)
+        ctx.exit(1 if n_failed else 0)
+    if not no_worker:
+        success = forward_method(
+            method_name,
+            kwargs,
+            dry_run=dry_run,
+            touch_output=touch_output,
+            socket_path=socket_path,
+        )
+        if success is not None:
+            ctx.exit(0 if success else 1)
     try:
         method: Method = Method.from_kwargs(method_name, **kwargs)
         if dry_run:
@@ -149,5 +227,130 @@ def method(
         ctx.exit(1)
 
 
+@cli.command(short_help="Start a worker to run methods with warm imports.")
+@click.option(
+    "--preload",
+    multiple=True,
+    help="Name of a method to import at startup; by default all methods. Can be repeated.",
+)
+@socket_opt
+@click.pass_context
+def worker(
+    ctx: click.Context,
+    preload: Tuple[str] = (),
+    socket_path: Optional[str] = None,
+):
+    """Start a worker to run methods with warm imports.
+
+    The worker imports the methods once and listens on a Unix socket.
+    While it runs, 'hydroflows method' forwards methods to the worker,
+    which runs each in a forked process. Stop the worker with Ctrl+C or SIGTERM.
+    """
+    logger = setuplog()
+    try:
+        serve(socket_path=socket_path, preload=list(preload))
+    except Exception as e:
+        logger.error(e)
+        ctx.exit(1)
+
+
+@cli.command(short_help="Run a workflow from a yaml file.")
+@click.argument("WORKFLOW_FILE", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--max-workers",
+    "-j",
+    type=int,
+    default=1,
+    help="Maximum number of method instances to run concurrently.",
+)
+@click.option(
+    "--executor",
+    type=click.Choice(["threads", "processes", "serial"]),
+    default=None,
+    help="Executor to run method instances with.",
+)
+@click.option(
+    "--force", is_flag=True, help="Run all method instances, even if up to date."
+)
+@click.option(
+    "--force-rule",
+    "force_rules",
+    multiple=True,
+    help="Run all method instances of a rule, even if up to date. Can be repeated.",
+)
+@click.option(
+    "--checksum",
+    is_flag=True,
+    help="Compare the content of modified input files to check if outputs are up to date.",
+)
+@click.option(
+    "--cores",
+    type=int,
+    default=None,
+    help="Number of CPU cores available to all method instances [default: all cores].",
+)
+@click.option(
+    "--mem-mb",
+    type=int,
+    default=None,
+    help="Memory in MB available to all method instances [default: total memory].",
+)
+@click.option(
+    "--keep-going",
+    "-k",
+    is_flag=True,
+    help="Continue with independent method instances if a method instance fails.",
+)
+@click.option(
+    "--trace",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="Save a Chrome trace-event JSON file of the run, relative to the workflow root.",
+)
+@click.option(
+    "--profile",
+    is_flag=True,
+    help="Save a memory and CPU profile of each method instance next to its outputs.",
+)
+@click.pass_context
+def run(
+    ctx: click.Context,
+    workflow_file: str,
+    max_workers: int = 1,
+    executor: Optional[str] = None,
+    force: bool = False,
+    force_rules: Tuple[str] = (),
+    checksum: bool = False,
+    cores: Optional[int] = None,
+    mem_mb: Optional[int] = None,
+    keep_going: bool = False,
+    trace: Optional[str] = None,
+    profile: bool = False,
+):
+    """Run a workflow from a yaml file.
+
+    WORKFLOW_FILE is the path to the workflow yaml file, see Workflow.to_yaml.
+    Method instances with up-to-date outputs are skipped, unless forced.
+    """
+    logger = setuplog()
+    try:
+        workflow = Workflow.from_yaml(workflow_file)
+        workflow.run(
+            max_workers=max_workers,
+            executor=executor,
+            force=force,
+            force_rules=list(force_rules),
+            checksum=checksum,
+            cores=cores,
+            mem_mb=mem_mb,
+            keep_going=keep_going,
+            trace=trace,
+            profile=profile,
+        )
+    except Exception as e:
+        logger.error(e)
+        ctx.exit(1)
+
+
 if __name__ == "__main__":
     cli()
@@ -0,0 +1,340 @@
+"""Worker to run methods from the command line with warm imports.
+
+Workflow engines such as Snakemake run each method instance with a new
+``hydroflows method <name> KEY=VAL ...`` process, which imports the method and its
+dependencies (e.g. hydromt, xarray and geopandas) every time. A worker started with
+``hydroflows worker`` imports the methods once and listens on a Unix socket.
+When a worker is running, ``hydroflows method`` forwards its request to the worker,
+which forks a process with warm imports to run the method in the working directory
+and with the environment variables of the request (see :py:data:`FORWARD_ENV`).
+
+The socket is only accessible by the user who started the worker: it is created with
+mode 0600 in a private directory and, where supported, the user ID of the other side of
+the connection is checked by both the worker and the client.
+
+The request and response are sent as JSON lines. The request contains the method name,
+keyword-arguments, dryrun options, working directory and environment variables.
+The worker streams the output of the method as ``{"output": ...}`` lines, followed by
+a ``{"status": "success"}`` or ``{"status": "failed", "error": ...}`` line.
+
+The worker is only supported on platforms with Unix sockets and fork (Linux, macOS).
+"""
+
+import json
+import logging
+import os
+import signal
+import socket
+import stat
+import struct
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from hydroflows import __version__
+from hydroflows.cli.batch import run_from_kwargs
+
+__all__ = [
+    "FORWARD_ENV",
+    "default_socket_path",
+    "forward_method",
+    "serve",
+    "worker_supported",
+]
+
+logger = logging.getLogger(__name__)
+
+SOCKET_ENV = "HYDROFLOWS_WORKER_SOCKET"
+"""Environment variable with the path of the worker socket."""
+
+FORWARD_ENV = [
+    "PATH",
+    "PYTHONPATH",
+    "TMPDIR",
+    "OMP_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "JULIA_NUM_THREADS",
+    "HYDROFLOWS_*",
+]
+"""Environment variables of the client which are set for the method in the worker;
+names ending with * match all variables with that prefix."""
+
+
+def worker_supported() -> bool:
+    """Return True if the worker is supported on this platform."""
+    return hasattr(socket, "AF_UNIX") and hasattr(os, "fork")
+
+
+def default_socket_path() -> Path:
+    """Return the worker socket path from `HYDROFLOWS_WORKER_SOCKET` or a per-user default.
+
+    The default socket is in the private runtime directory of the user (`XDG_RUNTIME_DIR`)
+    or in a ``hydroflows-<uid>`` directory in the temporary directory, which the worker
+    creates with mode 0700.
+    """
+    if os.environ.get(SOCKET_ENV):
+        return Path(os.environ[SOCKET_ENV])
+    if os.environ.get("XDG_RUNTIME_DIR"):
+        return Path(os.environ["XDG_RUNTIME_DIR"], "hydroflows-worker.sock")
+    uid = os.getuid() if hasattr(os, "getuid") else os.getlogin()
+    return Path(tempfile.gettempdir(), f"hydroflows-{uid}", "worker.sock")
+
+
+def _is_owner(path: Path) -> bool:
+    """Return True if the path (not following symlinks) is owned by the current user."""
+    return os.lstat(path).st_uid == os.getuid()
+
+
+def _peer_uid(conn: socket.socket) -> Optional[int]:
+    """Return the user ID of the other side of a Unix socket; None if not supported."""
+    if not hasattr(socket, "SO_PEERCRED"):  # e.g. macOS
+        return None
+    size = struct.calcsize("3i")
+    _, uid, _ = struct.unpack(
+        "3i", conn.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, size)
+    )
+    return uid
+
+
+def _forward_env(name: str) -> bool:
+    """Return True if the environment variable is forwarded, see :py:data:`FORWARD_ENV`."""
+    return any(
+        name.startswith(pattern[:-1]) if pattern.endswith("*") else name == pattern
+        for pattern in FORWARD_ENV
+    )
+
+
+def _request_env() -> Dict[str, Optional[str]]:
+    """Return the forwarded environment variables; None for variables which are not set."""
+    env = {name: None for name in FORWARD_ENV if not name.endswith("*")}
+    env.update({k: v for k, v in os.environ.items() if _forward_env(k)})
+    return env
+
+
+def _send(conn: socket.socket, message: Dict[str, Any]) -> None:
+    conn.sendall((json.dumps(message) + "\n").encode())
+
+
+def forward_method(
+    method_name: str,
+    kwargs: Dict[str, Optional[str]],
+    dry_run: bool = False,
+    touch_output: bool = False,
+    socket_path: Optional[Path] = None,
+) -> Optional[bool]:
+    """Run a method with a running worker.
+
+    The output of the method is written to stderr.
+
+    Parameters
+    ----------
+    method_name : str
+        The name of the method.
+    kwargs : Dict[str, Optional[str]]
+        The keyword-arguments of the method.
+    dry_run, touch_output : bool, optional
+        Dryrun the method and create empty output files, see :py:meth:`Method.dryrun`.
+    socket_path : Path, optional
+        The worker socket, by default :py:func:`default_socket_path`.
+
+    Returns
+    -------
+    Optional[bool]
+        True if the method succeeded, False if it failed and None if no worker is running.
+    """
+    socket_path = Path(socket_path or default_socket_path())
+    if not worker_supported() or not socket_path.exists():
+        return None
+    # a socket of another user could be used to run methods with our environment
+    if not _is_owner(socket_path):
+        logger.warning(f"Ignoring worker socket {socket_path} of another user")
+        return None
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        conn.connect(str(socket_path))
+    except OSError:  # stale socket
+        conn.close()
+        return None
+    if _peer_uid(conn) not in (None, os.getuid()):
+        conn.close()
+        logger.warning(f"Ignoring worker at {socket_path} of another user")
+        return None
+    request = {
+        "version": __version__,
+        "method": method_name,
+        "kwargs": kwargs,
+        "dry_run": dry_run,
+        "touch_output": touch_output,
+        "cwd": os.getcwd(),
+        "env": _request_env(),
+    }
+    with conn, conn.makefile("r") as f:
+        _send(conn, request)
+        for line in f:
+            message = json.loads(line)
+            if "output" in message:
+                sys.stderr.write(message["output"])
+                sys.stderr.flush()
+            elif message.get("status") == "success":
+                return True
+            else:
+                logger.error(message.get("error", "Worker failed"))
+                return False
+    logger.error("Worker closed the connection")
+    return False
+
+
+def _run_request(request: Dict[str, Any]) -> None:
+    """Run a method request."""
+    if request.get("version") != __version__:
+        raise ValueError(
+            f"hydroflows version {request.get('version')} of the request does not "
+            f"match the version {__version__} of the worker"
+        )
+    os.chdir(request["cwd"])
+    for name, value in request["env"].items():
+        if not _forward_env(name):
+            continue
+        elif value is None:
+            os.environ.pop(name, None)
+        else:
+            os.environ[name] = value
+    logger.info(f"Running {request['method']} with worker (pid {os.getpid()})")
+    run_from_kwargs(
+        request["method"],
+        request["kwargs"],
+        dry_run=request.get("dry_run", False),
+        touch_output=request.get("touch_output", False),
+    )
+
+
+def _handle(conn: socket.socket) -> None:
+    """Handle a request in a forked process; the output is forwarded to the client."""
+    with conn.makefile("r") as f:
+        request = json.loads(f.readline())
+    # forward stdout and stderr, also of external programs, to the client
+    read_fd, write_fd = os.pipe()
+    os.dup2(write_fd, 1)
+    os.dup2(write_fd, 2)
+    os.close(write_fd)
+
+    def _forward_output() -> None:
+        with os.fdopen(read_fd, "r", errors="replace") as pipe:
+            for line in pipe:
+                _send(conn, {"output": line})
+
+    thread = threading.Thread(target=_forward_output, daemon=True)
+    thread.start()
+    try:
+        _run_request(request)
+        response = {"status": "success"}
+    except Exception as e:
+        logger.error(e)
+        response = {"status": "failed", "error": f"{type(e).__name__}: {e}"}
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.close(1)
+        os.close(2)
+        thread.join()
+    _send(conn, response)
+
+
+def _preload(method_names: Optional[List[str]] = None) -> None:
+    """Import methods (and their dependencies); all methods by default."""
+    from hydroflows.workflow.method_entrypoints import METHODS
+
+    for name in method_names or list(METHODS.entry_points):
+        try:
+            METHODS.load(name)
+        except Exception as e:
+            logger.warning(f"Could not import method {name}: {e}")
+
+
+def serve(
+    socket_path: Optional[Path] = None, preload: Optional[List[str]] = None
+) -> None:
+    """Run a worker until it is interrupted or terminated.
+
+    Parameters
+    ----------
+    socket_path : Path, optional
+        The socket to listen on, by default :py:func:`default_socket_path`.
+    preload : List[str], optional
+        Names of the methods to import at startup, by default all methods.
+    """
+    if not worker_supported():
+        raise RuntimeError("The worker requires Unix sockets and fork.")
+    socket_path = Path(socket_path or default_socket_path())
+    if socket_path.parent == Path(tempfile.gettempdir(), f"hydroflows-{os.getuid()}"):
+        # the default directory is created by the worker and should be private
+        socket_path.parent.mkdir(mode=0o700, exist_ok=True)
+        mode = os.lstat(socket_path.parent).st_mode
+        if not stat.S_ISDIR(mode) or mode & 0o077 or not _is_owner(socket_path.parent):
+            raise RuntimeError(
+                f"{socket_path.parent} should be a directory with mode 0700 "
+                "owned by the current user."
+            )
+    if socket_path.exists():
+        if not _is_owner(socket_path):
+            raise RuntimeError(f"{socket_path} is owned by another user.")
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(str(socket_path))
+            raise RuntimeError(f"A worker is already running at {socket_path}")
+        except OSError:
+            socket_path.unlink()  # stale socket
+        finally:
+            probe.close()
+    _preload(preload)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    # only the current user can connect to the socket
+    umask = os.umask(0o177)
+    try:
+        server.bind(str(socket_path))
+    finally:
+        os.umask(umask)
+    os.chmod(socket_path, 0o600)
+    server.listen()
+    # check for finished children and the stop signal every second
+    server.settimeout(1.0)
+    # stop gracefully on SIGTERM and SIGINT (Ctrl+C)
+    stop_signals = []
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, lambda signum, frame: stop_signals.append(signum))
+    logger.info(f"hydroflows worker listening on {socket_path}")
+    try:
+        while not stop_signals:
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                conn = None
+            if conn is not None and _peer_uid(conn) not in (None, os.getuid()):
+                logger.warning("Refused a request of another user")
+                conn.close()
+                conn = None
+            if conn is not None:
+                if os.fork() == 0:  # child
+                    try:
+                        server.close()
+                        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                        signal.signal(signal.SIGINT, signal.SIG_DFL)
+                        conn.settimeout(None)
+                        _handle(conn)
+                    finally:
+                        os._exit(0)
+                conn.close()
+            # reap finished children
+            try:
+                while os.waitpid(-1, os.WNOHANG)[0] > 0:
+                    pass
+            except ChildProcessError:
+                pass
+        logger.info("hydroflows worker stopped")
+    finally:
+        server.close()
+        if socket_path.exists():
+            socket_path.unlink()
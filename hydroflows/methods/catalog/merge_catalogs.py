@@ -61,6 +61,8 @@ class MergeCatalogs(Method):
 
     name: str = "merge_catalogs"
 
+    clone_instances = True
+
     _test_kwargs = dict(
         catalog_path1="catalog1.yml",
         catalog_path2="catalog2.yml",
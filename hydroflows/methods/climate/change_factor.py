@@ -106,6 +106,8 @@ class ClimateChangeFactors(ExpandMethod):
 
     name: str = "climate_change_factors"
 
+    clone_instances = True
+
     _test_kwargs = {
         "hist_climatology": Path("hist_climatology.nc"),
         "future_climatology": Path("future_climatology.nc"),
@@ -3,7 +3,7 @@
 import logging
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 import numpy as np
 import pandas as pd
@@ -15,7 +15,7 @@ from pydantic import model_validator
 
 from hydroflows._typing import FileDirPath, ListOfInt, ListOfStr, OutputDirPath
 from hydroflows.methods.coastal.coastal_utils import plot_hydrographs
-from hydroflows.methods.events import Event, EventSet
+from hydroflows.methods.events import Event, EventSet, write_forcing_data
 from hydroflows.workflow.method import ExpandMethod
 from hydroflows.workflow.method_parameters import Parameters
 
@@ -46,7 +46,7 @@ class Output(Parameters):
     see also :py:class:`hydroflows.methods.events.Event`."""
 
     event_csv: Path
-    """Path to event timeseries csv file"""
+    """The path to the event timeseries file in the format of :py:attr:`Params.forcing_format`."""
 
     event_set_yaml: FileDirPath
     """The path to the event set yml file,
@@ -69,6 +69,10 @@ class Params(Parameters):
     wildcard: str = "event"
     """The wildcard key for expansion over the design events."""
 
+    forcing_format: Literal["csv", "parquet", "feather", "nc"] = "csv"
+    """The file format of the event timeseries: csv, parquet, feather or nc (netCDF),
+    see also :py:func:`hydroflows.methods.events.write_forcing_data`."""
+
     ndays: int = 6
     """Duration of derived events in days."""
 
@@ -123,6 +127,9 @@ class CoastalDesignEvents(ExpandMethod):
 
     name: str = "coastal_design_events"
 
+    executor = "processes"
+    clone_instances = True
+
     _test_kwargs = {
         "surge_timeseries": "surge.nc",
         "tide_timeseries": "tide.nc",
@@ -159,7 +166,7 @@ class CoastalDesignEvents(ExpandMethod):
         wc = "{" + self.params.wildcard + "}"
         self.output: Output = Output(
             event_yaml=self.params.event_root / f"{wc}.yml",
-            event_csv=self.params.event_root / f"{wc}.csv",
+            event_csv=self.params.event_root / f"{wc}.{self.params.forcing_format}",
             event_set_yaml=self.params.event_root / "coastal_design_events.yml",
         )
 
@@ -271,8 +278,9 @@ class CoastalDesignEvents(ExpandMethod):
         events_list = []
         for name, rp in zip(self.params.event_names, self.params.rps):
             output = self.get_output_for_wildcards({self.params.wildcard: name})
-            h_hydrograph.sel(rps=rp).transpose().to_pandas().round(2).to_csv(
-                output["event_csv"]
+            metadata = write_forcing_data(
+                h_hydrograph.sel(rps=rp).transpose().to_pandas().round(2),
+                output["event_csv"],
             )
             # save event description file
             event = Event(
@@ -283,6 +291,7 @@ class CoastalDesignEvents(ExpandMethod):
                         "path": output["event_csv"],
                         "locs_path": self.input.bnd_locations.resolve(),
                         "locs_id_col": locs_col_id,
+                        **metadata,
                     }
                 ],
                 probability=1 / rp,
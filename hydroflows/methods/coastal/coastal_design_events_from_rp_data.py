@@ -2,7 +2,7 @@
 
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 import pandas as pd
 import xarray as xr
@@ -11,7 +11,7 @@ from pydantic import model_validator
 
 from hydroflows._typing import FileDirPath, ListOfInt, ListOfStr, OutputDirPath
 from hydroflows.methods.coastal.coastal_utils import plot_hydrographs
-from hydroflows.methods.events import Event, EventSet
+from hydroflows.methods.events import Event, EventSet, write_forcing_data
 from hydroflows.workflow.method import ExpandMethod
 from hydroflows.workflow.method_parameters import Parameters
 
@@ -42,7 +42,7 @@ class Output(Parameters):
     see also :py:class:`hydroflows.methods.events.Event`."""
 
     event_csv: Path
-    """Path to event timeseries csv file"""
+    """The path to the event timeseries file in the format of :py:attr:`Params.forcing_format`."""
 
     event_set_yaml: FileDirPath
     """The path to the event set yml file,
@@ -65,6 +65,10 @@ class Params(Parameters):
     wildcard: str = "event"
     """The wildcard key for expansion over the design events."""
 
+    forcing_format: Literal["csv", "parquet", "feather", "nc"] = "csv"
+    """The file format of the event timeseries: csv, parquet, feather or nc (netCDF),
+    see also :py:func:`hydroflows.methods.events.write_forcing_data`."""
+
     ndays: int = 6
     """Duration of derived events in days."""
 
@@ -161,7 +165,7 @@ class CoastalDesignEventFromRPData(ExpandMethod):
         wc = "{" + self.params.wildcard + "}"
         self.output: Output = Output(
             event_yaml=self.params.event_root / f"{wc}.yml",
-            event_csv=self.params.event_root / f"{wc}.csv",
+            event_csv=self.params.event_root / f"{wc}.{self.params.forcing_format}",
             event_set_yaml=self.params.event_root / "coastal_design_events.yml",
         )
 
@@ -251,8 +255,9 @@ class CoastalDesignEventFromRPData(ExpandMethod):
         for name, rp in zip(self.params.event_names, da_rps["rps"].values):
             output = self.get_output_for_wildcards({self.params.wildcard: name})
             # save event forcing file
-            h_hydrograph.sel(rps=rp).transpose().to_pandas().round(2).to_csv(
-                output["event_csv"]
+            metadata = write_forcing_data(
+                h_hydrograph.sel(rps=rp).transpose().to_pandas().round(2),
+                output["event_csv"],
             )
             # save event description file
             event = Event(
@@ -263,6 +268,7 @@ class CoastalDesignEventFromRPData(ExpandMethod):
                         "path": output["event_csv"],
                         "locs_path": self.input.bnd_locations,
                         "locs_id_col": locs_col_id,
+                        **metadata,
                     }
                 ],
                 probability=1 / rp,
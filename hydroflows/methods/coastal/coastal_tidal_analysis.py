@@ -62,6 +62,8 @@ class CoastalTidalAnalysis(Method):
 
     name: str = "coastal_tidal_analysis"
 
+    clone_instances = True
+
     _test_kwargs = {
         "waterlevel_nc": Path("waterlevel.nc"),
     }
@@ -35,8 +35,9 @@ class Output(Parameters):
     """The path to the offset event description file,
     see also :py:class:`hydroflows.methods.events.Event`."""
 
-    future_event_csv: Path
-    """The path to the offset event csv timeseries file."""
+    future_event_csv: Optional[Path] = None
+    """The path to the offset event csv timeseries file.
+    Not written if the forcing is scaled on read, see :py:attr:`Params.scale_on_read`."""
 
     future_event_set_yaml: FileDirPath
     """The path to the offset event set yml file,
@@ -74,6 +75,11 @@ class Params(Parameters):
     scenario_wildcard: str = "scenario"
     """The wildcard key for expansion over the scenarios."""
 
+    scale_on_read: bool = False
+    """If True, the future events refer to the original forcing files with a scale
+    factor (`scale_mult` or `scale_add`) which is applied when the data is read,
+    instead of writing a scaled copy of the forcing data per event and scenario."""
+
 
 class FutureSLR(ExpandMethod):
     """Derive future (climate) sea level (rise) events by applying a user-specified offset to an event.
@@ -159,7 +165,9 @@ class FutureSLR(ExpandMethod):
 
         self.output: Output = Output(
             future_event_yaml=self.params.event_root / swc / f"{ewc}.yml",
-            future_event_csv=self.params.event_root / swc / f"{ewc}.csv",
+            future_event_csv=None
+            if self.params.scale_on_read
+            else self.params.event_root / swc / f"{ewc}.csv",
             future_event_set_yaml=self.params.event_root
             / swc
             / f"{self.input.event_set_yaml.stem}_{swc}.yml",
@@ -196,11 +204,16 @@ class FutureSLR(ExpandMethod):
                 forcings = []
                 slr_m = convert_to_meters(slr_value, self.params.slr_unit)
                 for forcing in event.forcings:
-                    if forcing.type == "water_level":
+                    if forcing.type == "water_level" and self.params.scale_on_read:
+                        # refer to the original forcing data and offset on read
+                        forcing.scale_add = (forcing.scale_add or 0.0) + slr_m
+                    elif forcing.type == "water_level":
                         # update and write forcing timeseries to csv
                         future_event_df = forcing.data.copy() + slr_m
                         future_event_df.to_csv(output["future_event_csv"], index=True)
                         forcing.path = output["future_event_csv"]
+                        # the scale factors are applied to the written data
+                        forcing.scale_mult = forcing.scale_add = None
                     forcings.append(forcing)
 
                 # write event to yaml
@@ -208,9 +221,15 @@ class FutureSLR(ExpandMethod):
                     name=name,
                     forcings=forcings,
                     return_period=event.return_period,
+                    tstart=event.tstart,
+                    tstop=event.tstop,
                 )
                 future_event.set_time_range_from_forcings()
-                future_event.to_yaml(output["future_event_yaml"])
+                # write forcing paths relative to the event file, such that the
+                # (scaled on read) original forcing data is found if moved together
+                future_event_yaml = Path(output["future_event_yaml"]).resolve()
+                future_event.root = future_event_yaml.parent
+                future_event.to_yaml(future_event_yaml)
 
                 # append event to list
                 future_events_list.append(
@@ -66,6 +66,8 @@ class GetCoastRP(Method):
 
     name: str = "get_coast_rp"
 
+    clone_instances = True
+
     _test_kwargs = {
         "region": "region.geojson",
         "coastrp_catalog": "data_catalog.yml",
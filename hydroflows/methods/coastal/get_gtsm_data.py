@@ -80,6 +80,8 @@ class GetGTSMData(Method):
 
     name: str = "get_gtsm_data"
 
+    clone_instances = True
+
     _test_kwargs = {
         "region": "region.geojson",
         "gtsm_catalog": "data_catalog.yml",
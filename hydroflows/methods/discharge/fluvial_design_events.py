@@ -1,6 +1,5 @@
 """Derive fluvial design events from a discharge time series."""
 
-
 import os
 from pathlib import Path
 from typing import Literal
@@ -13,7 +12,7 @@ from hydromt.stats import design_events, extremes, get_peaks
 from pydantic import PositiveInt, model_validator
 
 from hydroflows._typing import FileDirPath, ListOfInt, ListOfStr, OutputDirPath
-from hydroflows.methods.events import Event, EventSet
+from hydroflows.methods.events import Event, EventSet, write_forcing_data
 from hydroflows.workflow.method import ExpandMethod
 from hydroflows.workflow.method_parameters import Parameters
 
@@ -48,7 +47,7 @@ class Output(Parameters):
     see also :py:class:`hydroflows.methods.events.Event`."""
 
     event_csv: Path
-    """The path to the event csv timeseries file."""
+    """The path to the event timeseries file in the format of :py:attr:`Params.forcing_format`."""
 
     event_set_yaml: FileDirPath
     """The path to the event set yml file that contains the derived
@@ -76,6 +75,10 @@ class Params(Parameters):
     wildcard: str = "event"
     """The wildcard key for expansion over the design events."""
 
+    forcing_format: Literal["csv", "parquet", "feather", "nc"] = "csv"
+    """The file format of the event timeseries: csv, parquet, feather or nc (netCDF),
+    see also :py:func:`hydroflows.methods.events.write_forcing_data`."""
+
     # Note: set by model_validator based on rps if not provided
     event_names: ListOfStr | None = None
     """List of event names derived from the design events."""
@@ -165,6 +168,9 @@ class FluvialDesignEvents(ExpandMethod):
 
     name: str = "fluvial_design_events"
 
+    executor = "processes"
+    clone_instances = True
+
     _test_kwargs = {
         "discharge_nc": Path("discharge.nc"),
     }
@@ -191,7 +197,7 @@ class FluvialDesignEvents(ExpandMethod):
         wc = "{" + self.params.wildcard + "}"
         self.output: Output = Output(
             event_yaml=self.params.event_root / f"{wc}.yml",
-            event_csv=self.params.event_root / f"{wc}.csv",
+            event_csv=self.params.event_root / f"{wc}.{self.params.forcing_format}",
             event_set_yaml=self.params.event_root / "fluvial_design_events.yml",
         )
         # set wildcard
@@ -312,11 +318,13 @@ class FluvialDesignEvents(ExpandMethod):
             q_df = q_df.rename(
                 dict(zip(q_df.columns, ("time", *da[index_dim].values))), axis=1
             )
-            q_df.to_csv(output["event_csv"], index=False)
+            metadata = write_forcing_data(q_df.set_index("time"), output["event_csv"])
             # save event yaml file
             event = Event(
                 name=name,
-                forcings=[{"type": "discharge", "path": output["event_csv"]}],
+                forcings=[
+                    {"type": "discharge", "path": output["event_csv"], **metadata}
+                ],
                 return_period=rp,
             )
             event.set_time_range_from_forcings()
@@ -47,6 +47,8 @@ class CombineDummyEvents(ReduceMethod):
     params: CombineDummyEventsParams
     name = "combine_dummy_events"
 
+    clone_instances = True
+
     _test_kwargs = {"model_out_ncs": ["out1.nc", "out2.nc"], "output_dir": "output"}
 
     def __init__(
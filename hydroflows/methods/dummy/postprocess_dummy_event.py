@@ -47,6 +47,8 @@ class PostprocessDummyEvent(Method):
     params: PostprocessDummyEventParams
     name = "postprocess_dummy_event"
 
+    clone_instances = True
+
     _test_kwargs = {
         "model_nc": "model.nc",
         "output_dir": "output",
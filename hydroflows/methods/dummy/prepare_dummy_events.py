@@ -61,6 +61,8 @@ class PrepareDummyEvents(ExpandMethod):
     params: PrepareDummyEventsParams
     name = "prepare_dummy_events"
 
+    clone_instances = True
+
     _test_kwargs = {
         "timeseries_csv": "data.csv",
         "output_dir": "output",
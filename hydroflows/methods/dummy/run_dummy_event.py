@@ -63,6 +63,8 @@ class RunDummyEvent(Method):
     params: RunDummyEventParams
     name = "run_dummy_event"
 
+    clone_instances = True
+
     _test_kwargs = {
         "event_csv": "event.csv",
         "settings_toml": "settings.toml",
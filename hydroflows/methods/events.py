@@ -1,28 +1,113 @@
 """Defines the Event class which is a breakpoint between workflows."""
 
-from datetime import datetime
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Literal, Optional
+from typing import Any, Dict, List, Literal, Optional, Tuple, Union
 
 import geopandas as gpd
+import numpy as np
 import pandas as pd
 import yaml
 from pydantic import (
     BaseModel,
     ConfigDict,
+    DirectoryPath,
     FilePath,
     SerializerFunctionWrapHandler,
     model_serializer,
     model_validator,
 )
-from typing_extensions import TypedDict
+from typing_extensions import NotRequired, TypedDict
 
 from hydroflows.utils.path_utils import abs_to_rel_path, rel_to_abs_path
 
-__all__ = ["EventSet", "Event", "Forcing"]
+__all__ = ["EventSet", "Event", "Forcing", "write_event_store", "write_forcing_data"]
 
 SERIALIZATION_KWARGS = {"mode": "json", "round_trip": True, "exclude_none": True}
 
+FORCING_FORMATS = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".feather": "feather",
+    ".nc": "netcdf",
+    ".zarr": "zarr",
+}
+"""Supported forcing file formats by file suffix."""
+
+
+def _xarray_engine(path: Path) -> Optional[str]:
+    """Return the xarray engine to read a netCDF or Zarr file."""
+    return "zarr" if FORCING_FORMATS.get(Path(path).suffix) == "zarr" else None
+
+
+def _forcing_metadata(index: pd.Index, columns: List[str]) -> Dict[str, Any]:
+    """Return the time range, time step and columns of forcing data."""
+    index = pd.DatetimeIndex(index).dropna()
+    if index.empty:
+        return {"columns": list(columns)}
+    timestep = None
+    if len(index) > 1:
+        timestep = pd.Timedelta(np.median(np.diff(index.values))).to_pytimedelta()
+    return {
+        "tstart": index[0].to_pydatetime(),
+        "tstop": index[-1].to_pydatetime(),
+        "timestep": timestep,
+        "columns": [str(c) for c in columns],
+    }
+
+
+def write_forcing_data(
+    data: Union[pd.DataFrame, pd.Series], path: Path
+) -> Dict[str, Any]:
+    """Write forcing data to a file in the format given by its suffix.
+
+    The data should have a datetime index and one column per location (e.g. station).
+    Supported formats are CSV (.csv), Parquet (.parquet), Feather (.feather),
+    netCDF (.nc) and Zarr (.zarr). Parquet and Feather require pyarrow;
+    netCDF and Zarr require xarray.
+
+    Parameters
+    ----------
+    data : pd.DataFrame | pd.Series
+        The forcing data.
+    path : Path
+        The path to the forcing file.
+
+    Returns
+    -------
+    Dict[str, Any]
+        The metadata of the forcing data (tstart, tstop, timestep and columns),
+        to set in :py:class:`Forcing` so it can be used without reading the data.
+    """
+    path = Path(path)
+    if path.suffix not in FORCING_FORMATS:
+        raise NotImplementedError(f"File type {path.suffix} not supported.")
+    df = data.to_frame() if isinstance(data, pd.Series) else data.copy()
+    # column names are strings in all formats, as when read from CSV
+    df.columns = df.columns.astype(str)
+    match FORCING_FORMATS[path.suffix]:
+        case "csv":
+            df.to_csv(path)
+        case "parquet":
+            df.to_parquet(path)
+        case "feather":
+            # feather does not store the index
+            df.rename_axis(index=df.index.name or "time").reset_index().to_feather(path)
+        case "netcdf" | "zarr":
+            import xarray as xr
+
+            df = df.rename_axis(index=df.index.name or "time", columns="columns")
+            ds = xr.DataArray(df, name="forcing").to_dataset()
+            if path.suffix == ".zarr":
+                ds.to_zarr(path, mode="w")
+            else:
+                ds.to_netcdf(path)
+    return _forcing_metadata(df.index, df.columns)
+
 
 class Forcing(BaseModel):
     """A forcing for the event."""
@@ -32,7 +117,7 @@ class Forcing(BaseModel):
     type: Literal["water_level", "discharge", "rainfall"]
     """The type of the forcing."""
 
-    path: FilePath  # file must exist
+    path: Union[FilePath, DirectoryPath]  # file (or zarr directory) must exist
     """The path to the forcing data."""
 
     tstart: Optional[datetime] = None
@@ -41,6 +126,9 @@ class Forcing(BaseModel):
     tstop: Optional[datetime] = None
     """The end date of the forcing data"""
 
+    timestep: Optional[timedelta] = None
+    """The time step of the forcing data."""
+
     scale_mult: Optional[float] = None
     """A multiplicative scale factor for the forcing."""
 
@@ -53,6 +141,17 @@ class Forcing(BaseModel):
     locs_id_col: Optional[str] = None
     """The column in the locations file with the location ID."""
 
+    columns: Optional[List[str]] = None
+    """The columns (e.g. stations) of the forcing data. If set, only these columns
+    are read; all by default."""
+
+    variable: Optional[str] = None
+    """The variable of the forcing in a netCDF or Zarr file; the first by default."""
+
+    selection: Optional[Dict[str, str]] = None
+    """The selection of the forcing in an event store, e.g. the event and scenario,
+    see :py:func:`write_event_store`."""
+
     # Excl from serialization
     _data_df: Optional[pd.DataFrame] = None
     """The forcing data. This is excluded from serialization."""
@@ -83,13 +182,25 @@ class Forcing(BaseModel):
         return data
 
     def read_data(self) -> Any:
-        """Read the data."""
+        """Read the data.
+
+        The file format is based on the suffix of the path, see :py:func:`write_forcing_data`.
+        Only the :py:attr:`columns` are read and for Parquet, Feather and netCDF files
+        only the data between :py:attr:`tstart` and :py:attr:`tstop`.
+        """
         # read forcing data
-        if self.path.suffix == ".csv":
-            self._read_csv()
-        else:
-            # placeholder for other file types
-            raise NotImplementedError(f"File type {self.path.suffix} not supported.")
+        match FORCING_FORMATS.get(self.path.suffix):
+            case "csv":
+                df = self._read_csv()
+            case "parquet" | "feather":
+                df = self._read_arrow()
+            case "netcdf" | "zarr":
+                df = self._read_netcdf()
+            case _:
+                raise NotImplementedError(
+                    f"File type {self.path.suffix} not supported."
+                )
+        self._set_data(df)
 
         # read locations
         if self.locs_path is None:
@@ -99,6 +210,50 @@ class Forcing(BaseModel):
         # should be readable by geopandas
         self._read_locs_geopandas()
 
+    def read_metadata(self) -> None:
+        """Set the time range, time step and columns from the forcing file.
+
+        Only the time index and column names are read, not the data.
+        Metadata which is already set, e.g. in the event file, is kept.
+        """
+        if None not in (self.tstart, self.tstop, self.timestep, self.columns):
+            return
+        match FORCING_FORMATS.get(self.path.suffix):
+            case "csv":
+                columns = pd.read_csv(self.path, nrows=0).columns[1:]
+                index = pd.read_csv(
+                    self.path, usecols=[0], index_col=0, parse_dates=True
+                ).index
+            case "parquet" | "feather":
+                import pyarrow.dataset as ds
+
+                dataset = ds.dataset(
+                    self.path, format=FORCING_FORMATS[self.path.suffix]
+                )
+                index_col = self._arrow_index_col(dataset)
+                columns = [c for c in dataset.schema.names if c != index_col]
+                index = dataset.to_table(columns=[index_col]).column(0).to_pandas()
+            case "netcdf" | "zarr":
+                import xarray as xr
+
+                engine = _xarray_engine(self.path)
+                with xr.open_dataset(self.path, engine=engine, chunks=None) as ds:
+                    da = ds[self.variable or next(iter(ds.data_vars))]
+                    if self.selection:
+                        da = da.sel(self.selection)
+                    time_coord = f"{da.name}_time"
+                    if time_coord not in da.coords:
+                        time_coord = da.dims[0]
+                    index = da[time_coord].values
+                    columns = da[da.dims[1]].values if da.ndim > 1 else [da.name]
+            case _:
+                raise NotImplementedError(
+                    f"File type {self.path.suffix} not supported."
+                )
+        for key, value in _forcing_metadata(index, columns).items():
+            if getattr(self, key) is None:
+                setattr(self, key, value)
+
     def _read_locs_geopandas(self) -> None:
         """Read the locations file using geopandas."""
         gdf = gpd.read_file(self.locs_path)
@@ -106,13 +261,92 @@ class Forcing(BaseModel):
             gdf = gdf.set_index(self.locs_id_col)
         self._locs_gdf = gdf
 
-    def _read_csv(self) -> None:
+    def _read_csv(self) -> pd.DataFrame:
         """Read the CSV file."""
-        # read csv; check for datetime index
-        df: pd.DataFrame = pd.read_csv(self.path, index_col=0, parse_dates=True)
-        if not df.index.dtype == "datetime64[ns]":
+        usecols = None
+        if self.columns is not None:
+            index_col = pd.read_csv(self.path, nrows=0).columns[0]
+            usecols = [index_col, *self.columns]
+        return pd.read_csv(self.path, index_col=0, parse_dates=True, usecols=usecols)
+
+    def _read_arrow(self) -> pd.DataFrame:
+        """Read the Parquet or Feather file; filters are applied while reading."""
+        import pyarrow.dataset as ds
+
+        dataset = ds.dataset(self.path, format=FORCING_FORMATS[self.path.suffix])
+        index_col = self._arrow_index_col(dataset)
+        columns = None
+        if self.columns is not None:
+            columns = [index_col, *self.columns]
+        time_filter = None
+        if self.tstart is not None:
+            time_filter = ds.field(index_col) >= pd.Timestamp(self.tstart)
+        if self.tstop is not None:
+            stop_filter = ds.field(index_col) <= pd.Timestamp(self.tstop)
+            time_filter = (
+                stop_filter if time_filter is None else time_filter & stop_filter
+            )
+        df = dataset.to_table(columns=columns, filter=time_filter).to_pandas()
+        if index_col in df.columns:
+            df = df.set_index(index_col)
+        return df
+
+    @staticmethod
+    def _arrow_index_col(dataset: Any) -> str:
+        """Return the index column of a Parquet or Feather dataset.
+
+        The index is stored by pandas (parquet) or as first column (feather).
+        """
+        index_cols = (dataset.schema.pandas_metadata or {}).get("index_columns", [])
+        if index_cols and isinstance(index_cols[0], str):
+            return index_cols[0]
+        return dataset.schema.names[0]
+
+    def _read_netcdf(self) -> pd.DataFrame:
+        """Read the netCDF or Zarr file; only the selected data is loaded.
+
+        The data has dimensions (time, columns) or, in an event store,
+        (step, columns) with a ``<variable>_time`` coordinate.
+        """
+        import xarray as xr
+
+        engine = _xarray_engine(self.path)
+        with xr.open_dataset(self.path, engine=engine, chunks=None) as ds:
+            da = ds[self.variable or next(iter(ds.data_vars))]
+            if self.selection:
+                da = da.sel(self.selection)
+            index_dim = da.dims[0]
+            is_store = f"{da.name}_time" in da.coords
+            time_coord = f"{da.name}_time" if is_store else index_dim
+            times = pd.DatetimeIndex(da[time_coord].values)
+            # select time range; times are sorted and padded with NaT in a store
+            valid = times.notna()
+            if self.tstart is not None:
+                valid &= times >= pd.Timestamp(self.tstart)
+            if self.tstop is not None:
+                valid &= times <= pd.Timestamp(self.tstop)
+            steps = np.flatnonzero(valid)
+            steps = slice(steps[0], steps[-1] + 1) if steps.size else slice(0, 0)
+            da = da.isel({index_dim: steps})
+            if self.columns is not None and da.ndim > 1:
+                da = da.sel({da.dims[1]: self.columns})
+            values = da.values
+            columns = da[da.dims[1]].values if da.ndim > 1 else [da.name]
+        index = times[steps].rename("time" if is_store else index_dim)
+        df = pd.DataFrame(values.reshape(len(values), -1), index, columns)
+        if is_store:
+            # remove columns of other events
+            df = df.dropna(axis=1, how="all")
+        return df
+
+    def _set_data(self, df: pd.DataFrame) -> None:
+        """Check, scale and clip the forcing data."""
+        # check for datetime index
+        if not pd.api.types.is_datetime64_any_dtype(df.index):
             raise ValueError(f"Index of {self.path} is not datetime.")
         df = df.sort_index()  # make sure it is sorted
+        df.columns = df.columns.astype(str)
+        df.columns.name = None
         # apply scale factor
         if self.scale_mult is not None:
             df = df * self.scale_mult
@@ -123,8 +357,7 @@ class Forcing(BaseModel):
             self.tstart = df.index[0]
         if self.tstop is None:
             self.tstop = df.index[-1]
-        if self.tstart > df.index[-1] or self.tstop < df.index[0]:
-            df = df.loc[slice(self.tstart, self.tstop)]
+        df = df.loc[slice(self.tstart, self.tstop)]
         # set data
         self._data_df = df
 
@@ -228,9 +461,76 @@ class Event(BaseModel):
             yml_dict["root"] = Path(path).parent
         return cls(**yml_dict)
 
+    @classmethod
+    def from_store(
+        cls, path: Path, name: str, scenario: Optional[str] = None
+    ) -> "Event":
+        """Create an Event from a netCDF or Zarr event store.
+
+        Only the metadata is read; the forcing data is read lazily per event.
+
+        Parameters
+        ----------
+        path : Path
+            The path to the event store, see :py:func:`write_event_store`.
+        name : str
+            The name of the event.
+        scenario : str, optional
+            The scenario of the event, required if the store has scenarios.
+        """
+        import xarray as xr
+
+        path = Path(path)
+        selection = {"event": name}
+        forcings = []
+        with xr.open_dataset(path, engine=_xarray_engine(path), chunks=None) as ds:
+            if "scenario" in ds.dims:
+                if scenario not in ds.indexes["scenario"]:
+                    raise ValueError(
+                        f"Scenario {scenario} not found in {path}, "
+                        f"select one of {ds.indexes['scenario'].tolist()}."
+                    )
+                selection["scenario"] = scenario
+            if name not in ds.indexes["event"]:
+                raise ValueError(f"Event {name} not found in {path}.")
+            return_period = float(ds["return_period"].sel(selection))
+            for var in ds.data_vars:
+                attrs = ds[var].attrs
+                if "forcing_type" not in attrs:
+                    continue
+                times = pd.DatetimeIndex(ds[f"{var}_time"].sel(selection).values)
+                times = times.dropna()
+                if times.empty:  # no forcing of this type for the event
+                    continue
+                forcing = {
+                    "type": attrs["forcing_type"],
+                    "path": path,
+                    "variable": var,
+                    "selection": selection,
+                    **_forcing_metadata(times, []),
+                }
+                forcing.pop("columns")  # the columns of all events
+                if "locs_path" in attrs:
+                    forcing["locs_path"] = path.parent / attrs["locs_path"]
+                    forcing["locs_id_col"] = attrs.get("locs_id_col")
+                forcings.append(forcing)
+        event = cls(
+            name=name,
+            forcings=forcings,
+            return_period=None if np.isnan(return_period) else return_period,
+        )
+        event.set_time_range_from_forcings()
+        return event
+
     def set_time_range_from_forcings(self) -> None:
-        """Set the time range from the data."""
+        """Set the time range from the forcings.
+
+        The time range of forcings without `tstart` and `tstop` is read from the
+        time index of the forcing file, see :py:meth:`Forcing.read_metadata`.
+        """
         for forcing in self.forcings:
+            if forcing.tstart is None or forcing.tstop is None:
+                forcing.read_metadata()
             if forcing.tstart is None or forcing.tstop is None:
                 continue
             if self.tstart is None or self.tstop is None:
@@ -249,7 +549,100 @@ class Event(BaseModel):
             self.set_time_range_from_forcings()
 
 
-EventDict = TypedDict("EventDict", {"name": str, "path": FilePath})
+class _EventCache:
+    """LRU cache of parsed events, shared by all event sets.
+
+    A cached event is invalidated when the modification time of its event file,
+    or of its forcing files if the forcing data is cached, changes.
+    Copies of the cached events are returned, so these can be modified safely.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self._events: OrderedDict[Tuple, Tuple[Tuple[int, ...], Event, bool]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _mtimes(path: Path, event: Optional[Event] = None) -> Optional[Tuple[int, ...]]:
+        """Return the modification times of the event file and its forcing files.
+
+        Returns None if any of the files does not exist.
+        """
+        paths = [path]
+        if event is not None:
+            for forcing in event.forcings:
+                paths.extend(p for p in (forcing.path, forcing.locs_path) if p)
+        try:
+            return tuple(Path(p).stat().st_mtime_ns for p in dict.fromkeys(paths))
+        except OSError:
+            return None
+
+    def get(
+        self,
+        path: Path,
+        read_data: bool = False,
+        name: Optional[str] = None,
+        scenario: Optional[str] = None,
+    ) -> Event:
+        """Return a copy of the parsed event, optionally with its forcing data.
+
+        The event is read from a YAML file, or by name and scenario from an event store.
+        """
+        path = Path(path).resolve()
+        is_store = path.suffix in (".nc", ".zarr")
+        key = (path, name, scenario) if is_store else (path, None, None)
+        with self._lock:
+            cached = self._events.get(key)
+            if cached is not None:
+                self._events.move_to_end(key)
+        if cached is not None:
+            mtimes, event, data_read = cached
+            if mtimes is not None and mtimes == self._mtimes(
+                path, event if data_read else None
+            ):
+                event = event.model_copy(deep=True)
+                if not read_data or data_read:
+                    return event
+            else:
+                cached = None
+        if cached is None:
+            mtimes = self._mtimes(path)
+            if is_store:
+                event = Event.from_store(path, name, scenario)
+            else:
+                event = Event.from_yaml(path)
+            data_read = False
+        if read_data and not data_read:
+            event.read_forcing_data()
+            mtimes, data_read = self._mtimes(path, event), True
+        if self.maxsize > 0:
+            with self._lock:
+                self._events[key] = (mtimes, event, data_read)
+                while len(self._events) > self.maxsize:
+                    self._events.popitem(last=False)
+            event = event.model_copy(deep=True)
+        return event
+
+    def clear(self) -> None:
+        """Remove all events from the cache."""
+        with self._lock:
+            self._events.clear()
+
+
+EVENT_CACHE = _EventCache()
+"""Cache of parsed events used by :py:meth:`EventSet.get_event`; set
+``EVENT_CACHE.maxsize = 0`` to disable it."""
+
+EventDict = TypedDict(
+    "EventDict",
+    {
+        "name": str,
+        "path": Union[FilePath, DirectoryPath],
+        "scenario": NotRequired[str],
+    },
+)
 
 
 class EventSet(BaseModel):
@@ -279,6 +672,9 @@ class EventSet(BaseModel):
     events: List[EventDict]
     """The list of events. Each event is a dictionary with an event name and reference to an event file. """
 
+    _index: Optional[Dict[str, int]] = None
+    """Index of the events by name. This is excluded from serialization."""
+
     @model_validator(mode="before")
     @classmethod
     def _set_abs_paths(cls, data: Dict) -> Dict:
@@ -314,6 +710,30 @@ class EventSet(BaseModel):
             yaml_dict["root"] = Path(path).parent
         return cls(**yaml_dict)
 
+    @classmethod
+    def from_store(cls, path: Path, scenario: Optional[str] = None) -> "EventSet":
+        """Create an EventSet of the events in a netCDF or Zarr event store.
+
+        Parameters
+        ----------
+        path : Path
+            The path to the event store, see :py:func:`write_event_store`.
+        scenario : str, optional
+            The scenario of the events, required if the store has scenarios.
+        """
+        import xarray as xr
+
+        path = Path(path)
+        with xr.open_dataset(path, engine=_xarray_engine(path), chunks=None) as ds:
+            names = ds.indexes["event"].tolist()
+            scenarios = ds.indexes["scenario"].tolist() if "scenario" in ds.dims else []
+        if scenarios and scenario not in scenarios:
+            raise ValueError(
+                f"Scenario {scenario} not found in {path}, select one of {scenarios}."
+            )
+        extra = {"scenario": scenario} if scenarios else {}
+        return cls(events=[{"name": name, "path": path, **extra} for name in names])
+
     def to_dict(self, root: Optional[Path] = None, **kwargs) -> dict:
         """Return the EventSet as a dictionary."""
         # new root
@@ -346,9 +766,24 @@ class EventSet(BaseModel):
         with open(path, "w") as file:
             yaml.safe_dump(yaml_dict, file, sort_keys=False)
 
-    def get_event(self, name: str, raise_error=False) -> Optional[Event]:
+    def _get_index(self, name: str) -> Optional[int]:
+        """Return the index of an event by name, or None if not found."""
+        i = None if self._index is None else self._index.get(name)
+        # rebuild the index if the events list was modified
+        if i is None or i >= len(self.events) or self.events[i]["name"] != name:
+            self._index = {}
+            for j, event in enumerate(self.events):
+                self._index.setdefault(event["name"], j)
+            i = self._index.get(name)
+        return i
+
+    def get_event(
+        self, name: str, raise_error=False, read_data: bool = False
+    ) -> Optional[Event]:
         """Get an event by name.
 
+        Parsed events are cached and only read again if their file changed.
+
         Parameters
         ----------
         name : str
@@ -356,15 +791,53 @@ class EventSet(BaseModel):
         raise_error : bool, optional
             Raise an error if the event is not found, by default False
             and returns None.
+        read_data : bool, optional
+            Read (and cache) the forcing data of the event, by default False.
         """
-        for event in self.events:
-            if event["name"] == name:
-                return Event.from_yaml(path=event["path"])
+        i = self._get_index(name)
+        if i is not None:
+            event = self.events[i]
+            return EVENT_CACHE.get(
+                event["path"],
+                read_data=read_data,
+                name=event["name"],
+                scenario=event.get("scenario"),
+            )
 
         if raise_error:
             raise ValueError(f"Event {name} not found.")
         return None
 
+    def load_all(
+        self,
+        read_data: bool = False,
+        parallel: bool = True,
+        max_workers: Optional[int] = None,
+    ) -> Dict[str, Event]:
+        """Get all events.
+
+        Parameters
+        ----------
+        read_data : bool, optional
+            Read the forcing data of the events, by default False.
+        parallel : bool, optional
+            Read the events with a thread pool, by default True.
+        max_workers : int, optional
+            The maximum number of threads, by default the number of events up to 8.
+
+        Returns
+        -------
+        Dict[str, Event]
+            The events by name, in the order of the event set.
+        """
+        names = [event["name"] for event in self.events]
+        if not parallel or len(names) <= 1:
+            return {name: self.get_event(name, read_data=read_data) for name in names}
+        max_workers = max_workers or min(len(names), 8)
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            events = pool.map(lambda n: self.get_event(n, read_data=read_data), names)
+            return dict(zip(names, events))
+
     def add_event(self, name: str, path: Path) -> None:
         """Add an event.
 
@@ -376,3 +849,109 @@ class EventSet(BaseModel):
         """
         event = {"name": name, "path": path}
         self.events.append(event)
+        if self._index is not None:
+            self._index.setdefault(name, len(self.events) - 1)
+
+
+def write_event_store(
+    path: Path, event_sets: Union[EventSet, Dict[str, EventSet]]
+) -> None:
+    """Write the events and forcing data of event sets to a netCDF or Zarr store.
+
+    The store has one variable per forcing type (e.g. "rainfall") with dimensions
+    (scenario, event, <type>_step, <type>_columns) and a ``<type>_time`` coordinate,
+    and a "return_period" variable. The scenario dimension is only added if the
+    event sets are given by scenario. Each event and scenario is stored in a separate
+    chunk, so it can be read lazily with :py:meth:`EventSet.from_store`.
+
+    Parameters
+    ----------
+    path : Path
+        The path to the event store (.nc or .zarr).
+    event_sets : EventSet | Dict[str, EventSet]
+        The event set or event sets by scenario. All event sets should contain the
+        same event names.
+    """
+    import xarray as xr
+
+    path = Path(path)
+    if FORCING_FORMATS.get(path.suffix) not in ("netcdf", "zarr"):
+        raise NotImplementedError(f"File type {path.suffix} not supported.")
+    scenarios = None if isinstance(event_sets, EventSet) else list(event_sets)
+    event_sets = [event_sets] if scenarios is None else list(event_sets.values())
+    names = [event["name"] for event in event_sets[0].events]
+    for event_set in event_sets[1:]:
+        if sorted(event["name"] for event in event_set.events) != sorted(names):
+            raise ValueError("All event sets should contain the same events.")
+
+    # read the forcing data per type and (scenario, event) index
+    dims = ["event"] if scenarios is None else ["scenario", "event"]
+    shape = (len(names),) if scenarios is None else (len(scenarios), len(names))
+    return_periods = np.full(shape, np.nan)
+    data: Dict[str, Dict[Tuple[int, ...], pd.DataFrame]] = {}
+    locs: Dict[str, Tuple[Optional[Path], Optional[str]]] = {}
+    for i, event_set in enumerate(event_sets):
+        for j, name in enumerate(names):
+            idx = (j,) if scenarios is None else (i, j)
+            event = event_set.get_event(name, raise_error=True, read_data=True)
+            if event.return_period is not None:
+                return_periods[idx] = event.return_period
+            for forcing in event.forcings:
+                type_data = data.setdefault(forcing.type, {})
+                if idx in type_data:
+                    raise ValueError(
+                        f"Event {name} has multiple {forcing.type} forcings."
+                    )
+                type_data[idx] = forcing.data
+                type_locs = (forcing.locs_path, forcing.locs_id_col)
+                if locs.setdefault(forcing.type, type_locs) != type_locs:
+                    raise ValueError(
+                        f"All {forcing.type} forcings should have the same locations."
+                    )
+
+    coords = {"event": names}
+    if scenarios is not None:
+        coords["scenario"] = scenarios
+    ds = xr.Dataset({"return_period": (dims, return_periods)}, coords=coords)
+    encoding = {}
+    for ftype, type_data in data.items():
+        nsteps = max(len(df) for df in type_data.values())
+        columns = list(
+            dict.fromkeys(c for df in type_data.values() for c in df.columns)
+        )
+        values = np.full((*shape, nsteps, len(columns)), np.nan)
+        times = np.full((*shape, nsteps), np.datetime64("NaT"), dtype="datetime64[ns]")
+        for idx, df in type_data.items():
+            values[idx][: len(df)] = df.reindex(columns=columns).values
+            times[idx][: len(df)] = df.index.values
+        step_dim, columns_dim = f"{ftype}_step", f"{ftype}_columns"
+        attrs = {"forcing_type": ftype}
+        locs_path, locs_id_col = locs[ftype]
+        if locs_path is not None:
+            try:
+                attrs["locs_path"] = Path(os.path.relpath(locs_path, path.parent))
+            except ValueError:  # different drives
+                attrs["locs_path"] = Path(locs_path).absolute()
+            attrs["locs_path"] = attrs["locs_path"].as_posix()
+            if locs_id_col is not None:
+                attrs["locs_id_col"] = locs_id_col
+        ds[ftype] = xr.DataArray(
+            values,
+            dims=(*dims, step_dim, columns_dim),
+            coords={
+                columns_dim: columns,
+                f"{ftype}_time": ((*dims, step_dim), times),
+            },
+            attrs=attrs,
+        )
+        # one chunk per event
+        chunks = (*[1] * len(dims), nsteps, len(columns))
+        if path.suffix == ".zarr":
+            encoding[ftype] = {"chunks": chunks}
+        else:
+            encoding[ftype] = {"chunksizes": chunks, "zlib": True}
+
+    if path.suffix == ".zarr":
+        ds.to_zarr(path, mode="w", encoding=encoding)
+    else:
+        ds.to_netcdf(path, encoding=encoding)
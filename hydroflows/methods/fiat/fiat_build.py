@@ -121,6 +121,8 @@ class FIATBuild(Method):
 
     name: str = "fiat_build"
 
+    clone_instances = True
+
     _test_kwargs = {
         "region": Path("region.geojson"),
         "config": Path("hydroflows/cfg/fiat_build.yml"),
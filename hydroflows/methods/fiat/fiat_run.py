@@ -9,6 +9,7 @@ from pydantic import model_validator
 from hydroflows._typing import FileDirPath
 from hydroflows.workflow.method import Method
 from hydroflows.workflow.method_parameters import Parameters
+from hydroflows.workflow.resources import Resources
 
 
 class Input(Parameters):
@@ -90,6 +91,8 @@ class FIATRun(Method):
 
     name: str = "fiat_run"
 
+    clone_instances = True
+
     _test_kwargs = {
         "fiat_cfg": Path("fiat.toml"),
         "fiat_exe": Path("fiat.exe"),
@@ -111,6 +114,11 @@ class FIATRun(Method):
 
         # TODO check if cfg matches output
 
+    @property
+    def resources(self) -> Resources:
+        """Return the resources required to run FIAT with `threads` threads."""
+        return Resources(cores=self.params.threads)
+
     def _run(self):
         """Run the FIATRun method."""
         # Get basic info
@@ -133,4 +141,4 @@ class FIATRun(Method):
         ]
 
         # Execute the rule
-        subprocess.run(command, check=True, cwd=cwd)
+        subprocess.run(command, check=True, cwd=cwd, timeout=self._timeout)
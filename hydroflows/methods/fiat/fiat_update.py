@@ -102,6 +102,8 @@ class FIATUpdateHazard(ReduceMethod):
 
     name: str = "fiat_update_hazard"
 
+    clone_instances = True
+
     _test_kwargs = {
         "fiat_cfg": Path("fiat.toml"),
         "event_set_yaml": Path("event_set.yaml"),
@@ -119,6 +119,8 @@ class FIATVisualize(Method):
 
     name: str = "fiat_visualize"
 
+    clone_instances = True
+
     _test_kwargs = {
         "fiat_output_csv": Path("models/fiat/output/output.csv"),
         "fiat_cfg": Path("models/fiat/settings.toml"),
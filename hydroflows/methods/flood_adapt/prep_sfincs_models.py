@@ -57,6 +57,8 @@ class PrepSfincsModels(Method):
 
     name: str = "prep_sfincs_models"
 
+    clone_instances = True
+
     _test_kwargs = dict(sfincs_inp=Path("models", "sfincs", "sfincs.inp").as_posix())
 
     def __init__(
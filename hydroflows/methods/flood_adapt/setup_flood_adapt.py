@@ -97,6 +97,8 @@ class SetupFloodAdapt(Method):
 
     name: str = "setup_flood_adapt"
 
+    clone_instances = True
+
     _test_kwargs = dict(
         sfincs_inp=Path("models", "sfincs", "sfincs.inp").as_posix(),
         fiat_cfg=Path("models", "fiat", "settings.toml").as_posix(),
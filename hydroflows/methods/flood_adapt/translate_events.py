@@ -194,7 +194,8 @@ def translate_events(
         name = event_dict["name"]
         file_name = event_dict["path"].stem
         event = events.get_event(name)
-        event.read_forcing_data()
+        if event.tstart is None or event.tstop is None:
+            event.set_time_range_from_forcings()
         tstart = event.tstart
         tstop = event.tstop
         forcings = event.forcings
@@ -141,6 +141,8 @@ class FloodmarksValidation(Method):
 
     name: str = "floodmarks_validation"
 
+    clone_instances = True
+
     _test_kwargs = {
         "floodmarks_geom": Path("floodmarks.geojson"),
         "flood_hazard_map": Path("hazard_map_output.tif"),
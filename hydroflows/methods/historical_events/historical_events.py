@@ -9,7 +9,7 @@ import xarray as xr
 from pydantic import model_validator
 
 from hydroflows._typing import EventDatesDict, FileDirPath, OutputDirPath
-from hydroflows.methods.events import Event, EventSet
+from hydroflows.methods.events import Event, EventSet, write_forcing_data
 from hydroflows.workflow.method import ExpandMethod
 from hydroflows.workflow.method_parameters import Parameters
 
@@ -136,6 +136,8 @@ class HistoricalEvents(ExpandMethod):
 
     name: str = "historical_events"
 
+    clone_instances = True
+
     _test_kwargs = {
         "discharge_nc": Path("discharge.nc"),
         "precip_nc": Path("precip.nc"),
@@ -253,8 +255,12 @@ class HistoricalEvents(ExpandMethod):
                 forcing_file = Path(
                     event_file.parent, f"{event_file.stem}_{event_type}.csv"
                 )
-                event_data.to_pandas().round(2).to_csv(forcing_file)
-                forcings_list.append({"type": event_type, "path": forcing_file})
+                metadata = write_forcing_data(
+                    event_data.to_pandas().round(2), forcing_file
+                )
+                forcings_list.append(
+                    {"type": event_type, "path": forcing_file, **metadata}
+                )
 
             # save event description yaml file
             event = Event(
@@ -34,8 +34,9 @@ class Output(Parameters):
     """The path to the scaled event description file,
     see also :py:class:`hydroflows.methods.events.Event`."""
 
-    future_event_csv: Path
-    """The path to the scaled event csv timeseries file."""
+    future_event_csv: Optional[Path] = None
+    """The path to the scaled event csv timeseries file.
+    Not written if the forcing is scaled on read, see :py:attr:`Params.scale_on_read`."""
 
     future_event_set_yaml: FileDirPath
     """The path to the scaled event set yml file,
@@ -74,6 +75,11 @@ class Params(Parameters):
     scenario_wildcard: str = "scenario"
     """The wildcard key for expansion over the scenarios."""
 
+    scale_on_read: bool = False
+    """If True, the future events refer to the original forcing files with a scale
+    factor (`scale_mult` or `scale_add`) which is applied when the data is read,
+    instead of writing a scaled copy of the forcing data per event and scenario."""
+
 
 class FutureClimateRainfall(ExpandMethod):
     """Method to derive future climate rainfall by scaling an historical event using Clausius-Clapeyron (CC).
@@ -154,7 +160,9 @@ class FutureClimateRainfall(ExpandMethod):
 
         self.output: Output = Output(
             future_event_yaml=self.params.event_root / swc / f"{ewc}.yml",
-            future_event_csv=self.params.event_root / swc / f"{ewc}.csv",
+            future_event_csv=None
+            if self.params.scale_on_read
+            else self.params.event_root / swc / f"{ewc}.csv",
             future_event_set_yaml=self.params.event_root
             / swc
             / f"{self.input.event_set_yaml.stem}_{swc}.yml",
@@ -189,11 +197,21 @@ class FutureClimateRainfall(ExpandMethod):
                 forcings = []
                 delta_precip = (1 + self.params.alpha) ** (dT)
                 for forcing in event.forcings:
-                    if forcing.type == "rainfall":
+                    if forcing.type == "rainfall" and self.params.scale_on_read:
+                        # refer to the original forcing data and scale on read
+                        scale_mult = (
+                            1.0 if forcing.scale_mult is None else forcing.scale_mult
+                        )
+                        forcing.scale_mult = scale_mult * delta_precip
+                        if forcing.scale_add is not None:
+                            forcing.scale_add *= delta_precip
+                    elif forcing.type == "rainfall":
                         # update and write forcing timeseries to csv
                         future_event_df = forcing.data.copy() * delta_precip
                         future_event_df.to_csv(output["future_event_csv"], index=True)
                         forcing.path = output["future_event_csv"]
+                        # the scale factors are applied to the written data
+                        forcing.scale_mult = forcing.scale_add = None
                     forcings.append(forcing)
 
                 # write event to yaml
@@ -201,9 +219,15 @@ class FutureClimateRainfall(ExpandMethod):
                     name=name,
                     forcings=forcings,
                     return_period=event.return_period,
+                    tstart=event.tstart,
+                    tstop=event.tstop,
                 )
                 future_event.set_time_range_from_forcings()
-                future_event.to_yaml(output["future_event_yaml"])
+                # write forcing paths relative to the event file, such that the
+                # (scaled on read) original forcing data is found if moved together
+                future_event_yaml = Path(output["future_event_yaml"]).resolve()
+                future_event.root = future_event_yaml.parent
+                future_event.to_yaml(future_event_yaml)
 
                 # append event to list
                 future_events_list.append(
@@ -74,6 +74,8 @@ class GetERA5Rainfall(Method):
 
     name: str = "get_ERA5_rainfall"
 
+    clone_instances = True
+
     _test_kwargs = {
         "region": Path("region.geojson"),
     }
@@ -16,7 +16,7 @@ from hydroflows._typing import (
     ListOfStr,
     OutputDirPath,
 )
-from hydroflows.methods.events import Event, EventSet
+from hydroflows.methods.events import Event, EventSet, write_forcing_data
 from hydroflows.workflow.method import ExpandMethod
 from hydroflows.workflow.method_parameters import Parameters
 
@@ -44,7 +44,7 @@ class Output(Parameters):
     see also :py:class:`hydroflows.methods.events.Event`."""
 
     event_csv: Path
-    """The path to the event csv timeseries file"""
+    """The path to the event timeseries file in the format of :py:attr:`Params.forcing_format`."""
 
     event_set_yaml: FileDirPath
     """The path to the event set yml file,
@@ -64,6 +64,10 @@ class Params(Parameters):
     wildcard: str = "event"
     """The wildcard key for expansion over the design events."""
 
+    forcing_format: Literal["csv", "parquet", "feather", "nc"] = "csv"
+    """The file format of the event timeseries: csv, parquet, feather or nc (netCDF),
+    see also :py:func:`hydroflows.methods.events.write_forcing_data`."""
+
     # Note: set by model_validator based on rps if not provided
     event_names: Optional[ListOfStr] = None
     """List of event names associated with return periods."""
@@ -182,6 +186,9 @@ class PluvialDesignEvents(ExpandMethod):
 
     name: str = "pluvial_design_events"
 
+    executor = "processes"
+    clone_instances = True
+
     _test_kwargs = {
         "precip_nc": Path("precip.nc"),
     }
@@ -214,7 +221,7 @@ class PluvialDesignEvents(ExpandMethod):
         wc = "{" + self.params.wildcard + "}"
         self.output: Output = Output(
             event_yaml=self.params.event_root / f"{wc}.yml",
-            event_csv=self.params.event_root / f"{wc}.csv",
+            event_csv=self.params.event_root / f"{wc}.{self.params.forcing_format}",
             event_set_yaml=self.params.event_root / "pluvial_design_events.yml",
         )
         # set wildcards and its expand values
@@ -301,11 +308,15 @@ class PluvialDesignEvents(ExpandMethod):
         events_list = []
         for name, rp in zip(self.params.event_names, p_hyetograph["rps"].values):
             output = self.get_output_for_wildcards({self.params.wildcard: name})
-            p_hyetograph.sel(rps=rp).to_pandas().round(2).to_csv(output["event_csv"])
+            metadata = write_forcing_data(
+                p_hyetograph.sel(rps=rp).to_pandas().round(2), output["event_csv"]
+            )
             # save event description yaml file
             event = Event(
                 name=name,
-                forcings=[{"type": "rainfall", "path": output["event_csv"]}],
+                forcings=[
+                    {"type": "rainfall", "path": output["event_csv"], **metadata}
+                ],
                 return_period=rp,
             )
             event.set_time_range_from_forcings()
@@ -11,7 +11,7 @@ import xarray as xr
 from pydantic import model_validator
 
 from hydroflows._typing import FileDirPath, ListOfInt, ListOfStr, OutputDirPath
-from hydroflows.methods.events import Event, EventSet
+from hydroflows.methods.events import Event, EventSet, write_forcing_data
 from hydroflows.methods.rainfall.pluvial_design_events import (
     _plot_hyetograph,
     _plot_idf_curves,
@@ -49,7 +49,7 @@ class Output(Parameters):
     see also :py:class:`hydroflows.methods.events.Event`."""
 
     event_csv: Path
-    """The path to the event csv timeseries file"""
+    """The path to the event timeseries file in the format of :py:attr:`Params.forcing_format`."""
 
     event_set_yaml: FileDirPath
     """The path to the event set yml file,
@@ -78,6 +78,10 @@ class Params(Parameters):
     wildcard: str = "event"
     """The wildcard key for expansion over the design events."""
 
+    forcing_format: Literal["csv", "parquet", "feather", "nc"] = "csv"
+    """The file format of the event timeseries: csv, parquet, feather or nc (netCDF),
+    see also :py:func:`hydroflows.methods.events.write_forcing_data`."""
+
     # Note: set by model_validator based on rps if not provided
     event_names: ListOfStr | None = None
     """List of event names associated with return periods."""
@@ -152,6 +156,8 @@ class PluvialDesignEventsGPEX(ExpandMethod):
 
     name: str = "pluvial_design_events_GPEX"
 
+    clone_instances = True
+
     _test_kwargs = {
         "region": Path("region.geojson"),
         "gpex_nc": Path("gpex.nc"),
@@ -182,7 +188,7 @@ class PluvialDesignEventsGPEX(ExpandMethod):
         wc = "{" + self.params.wildcard + "}"
         self.output: Output = Output(
             event_yaml=self.params.event_root / f"{wc}.yml",
-            event_csv=self.params.event_root / f"{wc}.csv",
+            event_csv=self.params.event_root / f"{wc}.{self.params.forcing_format}",
             event_set_yaml=self.params.event_root / "pluvial_design_events_GPEX.yml",
         )
         # set wildcards and its expand values
@@ -268,11 +274,15 @@ class PluvialDesignEventsGPEX(ExpandMethod):
         for name, rp in zip(self.params.event_names, p_hyetograph["tr"].values):
             output = self.get_output_for_wildcards({self.params.wildcard: name})
             # save p_rp as csv files
-            p_hyetograph.sel(tr=rp).to_pandas().round(2).to_csv(output["event_csv"])
+            metadata = write_forcing_data(
+                p_hyetograph.sel(tr=rp).to_pandas().round(2), output["event_csv"]
+            )
             # save event description yaml file
             event = Event(
                 name=name,
-                forcings=[{"type": "rainfall", "path": output["event_csv"]}],
+                forcings=[
+                    {"type": "rainfall", "path": output["event_csv"], **metadata}
+                ],
                 return_period=rp,
             )
             event.set_time_range_from_forcings()
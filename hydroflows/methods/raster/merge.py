@@ -9,6 +9,7 @@ from hydroflows.methods.raster.merge_utils import merge_raster_datasets
 from hydroflows.methods.utils.io import to_netcdf
 from hydroflows.workflow.method import ReduceMethod
 from hydroflows.workflow.method_parameters import Parameters
+from hydroflows.workflow.resources import Resources
 
 __all__ = ["MergeGriddedDatasets", "Input", "Output", "Params"]
 
@@ -69,7 +70,7 @@ class Params(Parameters):
         """Check if the output name is set."""
         # get common part of the input file names
         if self.output_name is None:
-            self.output_name = f"merged_q{int(self.quantile*100)}.nc"
+            self.output_name = f"merged_q{int(self.quantile * 100)}.nc"
         return self
 
 
@@ -102,6 +103,10 @@ class MergeGriddedDatasets(ReduceMethod):
 
     name: str = "merge_gridded_datasets"
 
+    executor = "processes"
+    resources = Resources(heavy_io=True)
+    clone_instances = True
+
     _test_kwargs = {
         "datasets": [Path("change1.nc"), Path("change2.nc")],
         "output_dir": Path("data"),
@@ -110,7 +110,7 @@ class ScriptMethod(Method):
         # add input, params and output as json argument
         cmd = ["python", self.input.script.as_posix(), self.json_kwargs]
         # run with subprocess
-        subprocess.run(cmd, check=True)
+        subprocess.run(cmd, check=True, timeout=self._timeout)
 
     @property
     def json_kwargs(self):
@@ -120,6 +120,8 @@ class SfincsBuild(Method):
 
     name: str = "sfincs_build"
 
+    clone_instances = True
+
     _test_kwargs = {
         "region": Path("region.geojson"),
         "config": CFG_DIR / "sfincs_build.yml",
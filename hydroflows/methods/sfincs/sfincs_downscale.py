@@ -8,6 +8,7 @@ from hydromt_sfincs import SfincsModel, utils
 from hydroflows._typing import FileDirPath, JsonDict, OutputDirPath
 from hydroflows.workflow.method import Method
 from hydroflows.workflow.method_parameters import Parameters
+from hydroflows.workflow.resources import Resources
 
 __all__ = ["SfincsDownscale", "Input", "Output", "Params"]
 
@@ -74,6 +75,10 @@ class SfincsDownscale(Method):
 
     name: str = "sfincs_downscale"
 
+    executor = "processes"
+    resources = Resources(heavy_io=True)
+    clone_instances = True
+
     _test_kwargs = {
         "sfincs_map": Path("test_event/sfincs_map.nc"),
         "sfincs_subgrid_dep": Path("subgrid/dep_subgrid.tif"),
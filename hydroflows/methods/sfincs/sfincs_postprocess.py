@@ -60,6 +60,8 @@ class SfincsPostprocess(Method):
 
     name: str = "sfincs_postprocess"
 
+    clone_instances = True
+
     _test_kwargs = {
         "sfincs_map": Path("tests_event/sfincs_map.nc"),
     }
@@ -59,6 +59,8 @@ class SfincsRegion(Method):
 
     name: str = "sfincs_region"
 
+    clone_instances = True
+
     _test_kwargs = {
         "subbasins": Path("subbasins.geojson"),
         "aoi": Path("aoi.geojson"),
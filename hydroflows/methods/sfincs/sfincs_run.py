@@ -1,7 +1,7 @@
 """Method for running a SFINCS model."""
 import logging
+import os
 import platform
-import subprocess
 from pathlib import Path
 from typing import Literal, Optional
 
@@ -9,9 +9,10 @@ from pydantic import model_validator
 
 from hydroflows._typing import FileDirPath
 from hydroflows.methods.sfincs.sfincs_utils import get_sfincs_basemodel_root
-from hydroflows.utils.docker_utils import fetch_docker_uid
+from hydroflows.utils.docker_utils import fetch_docker_uid, run_container
 from hydroflows.workflow.method import Method
 from hydroflows.workflow.method_parameters import Parameters
+from hydroflows.workflow.resources import Resources
 
 __all__ = ["SfincsRun", "Input", "Output", "Params"]
 
@@ -58,6 +59,10 @@ class Params(Parameters):
     docker_tag: str = "sfincs-v2.2.0-col-dEze-Release"
     """The Docker tag to specify the version of the Docker image to use."""
 
+    threads: Optional[int] = None
+    """The number of OpenMP threads used by SFINCS (OMP_NUM_THREADS).
+    By default None, i.e. the default of the executable or container."""
+
     @model_validator(mode="after")
     def check_run_method(self) -> None:
         """Check if sfincs_exe is specified if run_method == 'exe'."""
@@ -91,6 +96,8 @@ class SfincsRun(Method):
 
     name: str = "sfincs_run"
 
+    clone_instances = True
+
     _test_kwargs = {
         "sfincs_inp": Path("sfincs.inp"),
         "sfincs_exe": Path("sfincs.exe"),
@@ -112,6 +119,11 @@ class SfincsRun(Method):
             sfincs_map=self.input.sfincs_inp.parent / "sfincs_map.nc"
         )
 
+    @property
+    def resources(self) -> Resources:
+        """Return the resources required to run SFINCS with `threads` threads."""
+        return Resources(cores=self.params.threads or 1)
+
     def _run(self) -> None:
         """Run the SfincsRun method."""
         # make sure model_root is an absolute path
@@ -151,14 +163,27 @@ class SfincsRun(Method):
                 f"docker://deltares/sfincs-cpu:{self.params.docker_tag}",
             ]
 
+        # set the number of OpenMP threads; for containers before the image name
+        env = None
+        if self.params.threads is not None:
+            omp_threads = f"OMP_NUM_THREADS={self.params.threads}"
+            if self.params.run_method == "exe":
+                env = {**os.environ, "OMP_NUM_THREADS": str(self.params.threads)}
+            elif self.params.run_method == "docker":
+                cmd[-1:-1] = ["-e", omp_threads]
+            elif self.params.run_method == "apptainer":
+                cmd[-1:-1] = ["--env", omp_threads]
+
         # run & write log file
         log_file = model_root / "sfincs_log.txt"
         with open(log_file, "w") as f:
-            proc = subprocess.run(
+            proc = run_container(
                 cmd,
                 cwd=model_root,
+                env=env,
                 stdout=f,
                 stderr=f,
+                timeout=self._timeout,
             )
             return_code = proc.returncode
 
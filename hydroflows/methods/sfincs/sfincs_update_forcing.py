@@ -78,6 +78,8 @@ class SfincsUpdateForcing(Method):
 
     name: str = "sfincs_update_forcing"
 
+    clone_instances = True
+
     _test_kwargs = {
         "sfincs_inp": Path("sfincs.inp"),
         "event_yaml": Path("event1.yaml"),
@@ -64,8 +64,9 @@ def parse_event_sfincs(
     # Init sfincs and update root, config
     sf = SfincsModel(root=root, mode="r", write_gis=False)
 
-    # get event time range
-    event.read_forcing_data()
+    # get event time range from the forcing metadata; the data is read when used
+    if event.tstart is None or event.tstop is None:
+        event.set_time_range_from_forcings()
 
     # update model simulation time range
     fmt = "%Y%m%d %H%M%S"  # sfincs inp time format
@@ -109,6 +109,8 @@ class WflowBuild(Method):
 
     name: str = "wflow_build"
 
+    clone_instances = True
+
     _test_kwargs = {
         "region": Path("region.geojson"),
         "config": CFG_DIR / "wflow_build.yml",
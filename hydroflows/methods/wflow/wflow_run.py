@@ -1,5 +1,5 @@
 """Wflow run method."""
-import subprocess
+
 from pathlib import Path
 from typing import Literal, Optional
 
@@ -8,9 +8,10 @@ from pydantic import model_validator
 from hydroflows._typing import FileDirPath
 from hydroflows.methods.wflow.scripts import SCRIPTS_DIR
 from hydroflows.methods.wflow.wflow_utils import get_wflow_basemodel_root
-from hydroflows.utils.docker_utils import fetch_docker_uid
+from hydroflows.utils.docker_utils import fetch_docker_uid, run_container
 from hydroflows.workflow.method import Method
 from hydroflows.workflow.method_parameters import Parameters
+from hydroflows.workflow.resources import Resources
 
 __all__ = ["WflowRun", "Input", "Output", "Params"]
 
@@ -110,6 +111,8 @@ class WflowRun(Method):
 
     name: str = "wflow_run"
 
+    clone_instances = True
+
     _test_kwargs = {
         "wflow_toml": Path("wflow.toml"),
         "wflow_bin": Path("wflow_cli.exe"),
@@ -132,6 +135,11 @@ class WflowRun(Method):
             / "output_scalar.nc"
         )
 
+    @property
+    def resources(self) -> Resources:
+        """Return the resources of a Wflow run, which uses `julia_num_threads` cores."""
+        return Resources(cores=self.params.julia_num_threads)
+
     def _run(self):
         """Run the WflowRun method."""
         # Set environment variable JULIA_NUM_THREADS
@@ -189,5 +197,7 @@ class WflowRun(Method):
                 f"//data/{wflow_toml}",
             ]
 
-        # Call the executable using subprocess
-        subprocess.run(command, env=env, check=True, cwd=base_folder)
+        # Call the executable; containers are stopped on a timeout
+        run_container(
+            command, env=env, check=True, cwd=base_folder, timeout=self._timeout
+        )
@@ -91,6 +91,8 @@ class WflowUpdateChangeFactors(Method):
 
     name: str = "wflow_update_factors"
 
+    clone_instances = True
+
     _test_kwargs = {
         "change_factor_dataset": Path("dataset.nc"),
         "wflow_toml": Path("wflow_sbm.toml"),
@@ -122,6 +122,8 @@ class WflowUpdateForcing(Method):
 
     name: str = "wflow_update_forcing"
 
+    clone_instances = True
+
     _test_kwargs = {
         "wflow_toml": Path("wflow.toml"),
         "catalog_path": Path("data_catalog.yml"),
@@ -1,21 +1,54 @@
 from copy import deepcopy
 from itertools import product
 from pathlib import Path
-from typing import TYPE_CHECKING, Dict, List, Union
+from typing import TYPE_CHECKING, Dict, List, Optional, Union
 
 from hydroflows._typing import filedirpath, outputdirpath
 from hydroflows.utils.cwl_utils import map_cwl_types, wildcard_inputs_nested
 from hydroflows.utils.parsers import get_wildcards
+from hydroflows.workflow.reference import Ref
 
 if TYPE_CHECKING:
+    from hydroflows.workflow.method import Method
     from hydroflows.workflow.rule import Rule
+    from hydroflows.workflow.workflow import Workflow
+
+
+class CWLWorkflowView:
+    """View of a workflow for exporting to CWL.
+
+    The CWL export adds rule inputs and method parameters to the workflow config.
+    These are added to a copy of the config, such that the workflow is not changed.
+    """
+
+    def __init__(self, workflow: "Workflow"):
+        self.root = workflow.root
+        self.rules = workflow.rules
+        self.wildcards = workflow.wildcards
+        self.config = workflow.config.model_copy()
+
+    def get_ref(self, ref: str) -> Ref:
+        """Get a cross-reference, with config references resolved from the copied config."""
+        return Ref(ref, self)
+
+
+def _copy_method(method: "Method") -> "Method":
+    """Return a copy of the method with copies of its parameters and references."""
+    method_copy = method.clone()
+    for name in ("input", "output", "params"):
+        if f"_{name}" in method.__dict__:
+            getattr(method_copy, name)._refs = dict(getattr(method, name)._refs)
+    return method_copy
 
 
 class JinjaCWLRule:
     """Class for exporting to CWL"""
 
-    def __init__(self, rule: "Rule"):
+    def __init__(self, rule: "Rule", workflow: Optional[CWLWorkflowView] = None):
         self.rule = rule
+        # the references and config are updated on copies of the method and config
+        self.workflow = workflow or CWLWorkflowView(rule.workflow)
+        self.method = _copy_method(rule.method)
         self.id = rule.rule_id
         self.method_name = rule.method.name
         self.loop_depth = rule._loop_depth
@@ -40,6 +73,18 @@ class JinjaCWLRule:
         """Return nested dict of output keys and CWL info."""
         return self._output
 
+    @property
+    def resources(self) -> Dict[str, int]:
+        """Return the CWL ResourceRequirement of the rule, empty if single-core."""
+        resources = self.rule.resources
+        result = {}
+        if resources.cores > 1:
+            result["coresMin"] = resources.cores
+        if resources.mem_mb:
+            # ramMin is in mebibytes
+            result["ramMin"] = resources.mem_mb
+        return result
+
     @property
     def input_wildcards(self) -> List[str]:
         """Return list of repeat wildcards occuring in inputs."""
@@ -47,7 +92,7 @@ class JinjaCWLRule:
 
     def _set_input(self) -> Dict[str, str]:
         """Get input dict for CWL step."""
-        refs = self.rule.method.input.to_dict(filter_types=Path, return_refs=True)
+        refs = self.method.input.to_dict(filter_types=Path, return_refs=True)
         inputs = {}
         # Reduce wildcards determines type File[] vs type File
         reduce_wc = None
@@ -57,7 +102,7 @@ class JinjaCWLRule:
         for key, val in refs.items():
             if isinstance(val, Path):
                 val = val.as_posix()
-            ref = self.rule.workflow.get_ref(val)
+            ref = self.workflow.get_ref(val)
             inputs[key] = map_cwl_types(ref.value)
             # Set the source of the input (from prev rule, config)
             if "$config" in ref.ref:
@@ -79,7 +124,7 @@ class JinjaCWLRule:
                 # This is to ensure the proxy file and the dir it represents have the correct parentage
                 inputs[key]["valueFrom"] = f"$(inputs.{key}_dir.path)/$(self.basename)"
             # ref to config does not maintain folderpath typing (reverts it instead to Path)
-            elif isinstance(getattr(self.rule.method.input, key), filedirpath):
+            elif isinstance(getattr(self.method.input, key), filedirpath):
                 inputs[key + "_dir"] = {
                     "type": "Directory",
                     "source": inputs[key]["source"] + "_dir",
@@ -90,19 +135,19 @@ class JinjaCWLRule:
                 # Add new folder input to config
                 config_key = f"{key}_dir"
                 # config_ref = "$config." + config_key
-                self.rule.workflow.config = self.rule.workflow.config.model_copy(
+                self.workflow.config = self.workflow.config.model_copy(
                     update={config_key: ref.value.parent}
                 )
 
         # Add params to inputs
-        params = self.rule.method.params.to_dict(return_refs=True)
+        params = self.method.params.to_dict(return_refs=True)
         for key, val in params.items():
-            default_value = self.rule.method.params.model_fields.get(key).default
+            default_value = self.method.params.model_fields.get(key).default
             if val == default_value:
                 continue
             # Set source for input to correct reference
             if isinstance(val, str) and "$" in val:
-                inputs[key] = map_cwl_types(self.rule.method.params.to_dict()[key])
+                inputs[key] = map_cwl_types(self.method.params.to_dict()[key])
                 inputs[key]["source"] = val.split(".")[-1]
                 # wildcards have _wc added when turned into workflow inputs
                 if "wildcards" in val:
@@ -122,15 +167,15 @@ class JinjaCWLRule:
 
     def _set_output(self) -> Dict[str, str]:
         """Get outputs of CWL step."""
-        results = self.rule.method.output.to_dict(mode="python", filter_types=Path)
+        results = self.method.output.to_dict(mode="python", filter_types=Path)
         out_root = ""
         outputs = {}
         wc_expand = self.rule.wildcards["expand"]
         for key, val in results.items():
             if not any(
-                [isinstance(par[1], outputdirpath) for par in self.rule.method.params]
+                [isinstance(par[1], outputdirpath) for par in self.method.params]
             ):
-                for _, in_value in self.rule.method.input.to_dict().items():
+                for _, in_value in self.method.input.to_dict().items():
                     if val.is_relative_to(in_value.parent):
                         out_root = in_value.parents[1]
 
@@ -155,7 +200,7 @@ class JinjaCWLRule:
             if wc_expand and any(get_wildcards(val, wc_expand)):
                 # This is for expand (1-to-n) methods
                 # Here we want every possible value for the expand wildcards
-                wc_dict = self.rule.method.expand_wildcards
+                wc_dict = self.method.expand_wildcards
                 wc_values = list(product(*wc_dict.values()))
                 out_value = [
                     out_value.format(**dict(zip(wc_expand, wc))) for wc in wc_values
@@ -197,11 +242,11 @@ class JinjaCWLRule:
         conf_updates = {}
 
         # unpack existing config
-        conf_keys = self.rule.workflow.config.keys
-        conf_values = self.rule.workflow.config.values
+        conf_keys = self.workflow.config.keys
+        conf_values = self.workflow.config.values
 
-        for key, value in self.rule.method.input:
-            if key in self.rule.method.input._refs or value is None:
+        for key, value in self.method.input:
+            if key in self.method.input._refs or value is None:
                 continue
             if isinstance(value, Path):
                 value = value.as_posix()
@@ -217,26 +262,24 @@ class JinjaCWLRule:
                 # update refs
                 ref_updates.update({key: conf_ref})
 
-        self.rule.method.input._refs.update(ref_updates)
-        self.rule.workflow.config = self.rule.workflow.config.model_copy(
-            update=conf_updates
-        )
+        self.method.input._refs.update(ref_updates)
+        self.workflow.config = self.workflow.config.model_copy(update=conf_updates)
 
     def _add_method_params_to_config(self) -> None:
         """Add method params to the config and update the method params refs."""
         ref_updates = {}
         conf_updates = {}
 
-        for p in self.rule.method.params:
+        for p in self.method.params:
             key, value = p
             # Check if key can be found in method Params class
-            if key in self.rule.method.params.model_fields:
-                default_value = self.rule.method.params.model_fields.get(key).default
+            if key in self.method.params.model_fields:
+                default_value = self.method.params.model_fields.get(key).default
             else:
                 default_value = None
 
             # Skip if key is already a ref
-            if key in self.rule.method.params._refs:
+            if key in self.method.params._refs:
                 continue
 
             elif value != default_value:
@@ -246,10 +289,8 @@ class JinjaCWLRule:
                 config_ref = "$config." + config_key
                 ref_updates.update({key: config_ref})
 
-        self.rule.method.params._refs.update(ref_updates)
-        self.rule.workflow.config = self.rule.workflow.config.model_copy(
-            update=conf_updates
-        )
+        self.method.params._refs.update(ref_updates)
+        self.workflow.config = self.workflow.config.model_copy(update=conf_updates)
 
 
 class JinjaCWLWorkflow:
@@ -259,7 +300,7 @@ class JinjaCWLWorkflow:
         self, rules: List[JinjaCWLRule], dryrun: bool = False, start_loop_depth: int = 0
     ):
         self.rules = rules
-        self.workflow = self.rules[0].rule.workflow
+        self.workflow = self.rules[0].workflow
         self.config = self.workflow.config
         self.start_loop = start_loop_depth
         self.dryrun = dryrun
@@ -306,7 +347,7 @@ class JinjaCWLWorkflow:
 
     def _set_steps(self):
         """Set list of steps and subworkflows."""
-        step_list = deepcopy(self.rules)
+        step_list = list(self.rules)
 
         sub_wf = [rule for rule in step_list if rule.loop_depth > self.start_loop]
         indices = [i for i, x in enumerate(step_list) if x in sub_wf]
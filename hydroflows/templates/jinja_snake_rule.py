@@ -12,8 +12,20 @@ if TYPE_CHECKING:
 class JinjaSnakeRule:
     """ViewModel for a Rule to print in a Jinja Snakemake template."""
 
-    def __init__(self, rule: "Rule"):
+    def __init__(
+        self,
+        rule: "Rule",
+        batch_manifests: Optional[Dict[str, str]] = None,
+        benchmark: bool = False,
+        batch_jobs: int = 1,
+    ):
         self.rule = rule
+        self.batch_manifests = batch_manifests or {}
+        """Manifest paths of rules which run all method instances with one batch job."""
+        self.batch_jobs = batch_jobs
+        """Number of method instances which run in parallel within a batch job."""
+        self.add_benchmark = benchmark
+        """Whether to record the run time and memory usage of each job."""
 
     @property
     def method(self) -> "Method":
@@ -30,10 +42,18 @@ class JinjaSnakeRule:
         """Get the name of the method."""
         return self.method.name
 
+    @property
+    def batch_manifest(self) -> Optional[str]:
+        """Get the batch manifest path, or None if each method instance is a job."""
+        return self.batch_manifests.get(self.rule_id)
+
     @property
     def input(self) -> Dict[str, str]:
         """Get the rule input path parameters."""
         wildcards = self.rule.wildcards["reduce"]
+        if self.batch_manifest:
+            # the batch job has the input of all method instances
+            wildcards = wildcards + self.rule.wildcards["repeat"]
         wildcard_fields = []
         for wc in wildcards:
             wildcard_fields.extend(self.rule.wildcard_fields.get(wc))
@@ -62,6 +82,9 @@ class JinjaSnakeRule:
             quote_str=True,
         )
         wildcards = self.rule.wildcards["expand"]
+        if self.batch_manifest:
+            # the batch job has the output of all method instances
+            wildcards = wildcards + self.rule.wildcards["repeat"]
         for key, val in result.items():
             if wildcards and any(get_wildcards(val, wildcards)):
                 result[key] = self._expand_variable(val, wildcards)
@@ -71,7 +94,13 @@ class JinjaSnakeRule:
 
     @property
     def params(self) -> Dict[str, str]:
-        """Get the rule parameters."""
+        """Get the rule parameters.
+
+        A batch job gets these from its manifest and only has the hash of the config,
+        which is checked against the hash in the manifest.
+        """
+        if self.batch_manifest:
+            return {"config_hash": "CONFIG_HASH"}
         result = self.method.params.to_dict(
             mode="json",
             exclude_defaults=True,
@@ -81,6 +110,55 @@ class JinjaSnakeRule:
         )
         return {key: self._parse_variable(val) for key, val in result.items()}
 
+    @property
+    def threads(self) -> Optional[int]:
+        """Get the number of threads of the rule, or None if single-threaded.
+
+        A batch job runs `batch_jobs` method instances in parallel.
+        """
+        cores = self.rule.resources.cores * self._n_parallel
+        return cores if cores > 1 else None
+
+    @property
+    def _n_parallel(self) -> int:
+        """Get the number of method instances which run in parallel in a job."""
+        return self.batch_jobs if self.batch_manifest else 1
+
+    @property
+    def resources(self) -> Dict[str, int]:
+        """Get the rule resources.
+
+        Heavy I/O is exported as a custom resource which can be limited with
+        `snakemake --resources heavy_io=1`.
+        """
+        resources = self.rule.resources
+        result = {}
+        if resources.mem_mb:
+            result["mem_mb"] = resources.mem_mb * self._n_parallel
+        if resources.heavy_io:
+            result["heavy_io"] = 1
+        return result
+
+    @property
+    def group(self) -> Optional[str]:
+        """Get the group of the rule, or None if not grouped."""
+        return self.rule.group
+
+    @property
+    def benchmark(self) -> Optional[str]:
+        """Get the benchmark file of each job, or None if not benchmarked.
+
+        The file path contains the wildcards of the job, e.g.
+        ``benchmarks/<rule_id>/{region}/{event}.tsv``.
+        """
+        if not self.add_benchmark:
+            return None
+        wildcards = [] if self.batch_manifest else self.rule.wildcards["repeat"]
+        if not wildcards:
+            return f"benchmarks/{self.rule_id}.tsv"
+        wildcards_path = "/".join("{" + wc + "}" for wc in wildcards)
+        return f"benchmarks/{self.rule_id}/{wildcards_path}.tsv"
+
     @property
     def rule_all_input(self) -> str | None:
         """Get single output path for result rule, or None if not result rule."""
@@ -132,8 +210,8 @@ class JinjaSnakeRule:
             val = 'config["' + '"]["'.join(dict_keys) + '"]'
         elif isinstance(val, str) and val.startswith("$rules."):
             ref = self.rule.workflow.get_ref(val)
-            # exclude reference to snake expand(..) fields
-            if ref.is_expand_field:
+            # exclude reference to snake expand(..) fields, incl. fields of batch jobs
+            if ref.is_expand_field or val.split(".")[1] in self.batch_manifests:
                 val = ref.get_str_value()
             else:
                 val = val[1:]
@@ -1,14 +1,17 @@
 """Some utils for running containers."""
 import os
+import signal
+import subprocess
 import sys
-from typing import Tuple, Union
+import uuid
+from typing import List, Optional, Tuple, Union
 
 try:
     import pwd
 except ImportError:
     pass
 
-__all__ = ["fetch_docker_uid"]
+__all__ = ["fetch_docker_uid", "run_container"]
 
 
 def fetch_docker_uid() -> Tuple[Union[str, None], Union[str, None]]:
@@ -26,3 +29,63 @@ def fetch_docker_uid() -> Tuple[Union[str, None], Union[str, None]]:
         user = pwd.getpwuid(uid)
         gid = user.pw_gid
         return (uid, gid)
+
+
+def run_container(
+    cmd: List[str],
+    timeout: Optional[float] = None,
+    check: bool = False,
+    **kwargs,
+) -> subprocess.CompletedProcess:
+    """Run a docker or apptainer command and stop the container on a timeout.
+
+    With a timeout, :py:func:`subprocess.run` only kills the client process, while a
+    docker container keeps running in the docker daemon. With a timeout, docker
+    containers are therefore run with a unique name and removed when finished
+    (``--rm``) and killed with ``docker kill`` if the run is stopped. Other commands,
+    e.g. apptainer, are then run in a new process group which is killed if the run is
+    stopped (on Windows only the process is killed). Without a timeout the command
+    runs in the process group of the caller, such that it receives a Ctrl+C from
+    the terminal.
+
+    The run is stopped on a timeout or any other exception, e.g. a KeyboardInterrupt.
+
+    Parameters
+    ----------
+    cmd : List[str]
+        The command, starting with "docker run" for docker containers.
+    timeout : float, optional
+        The maximum wall-clock time in seconds, by default None (no timeout).
+    check : bool, optional
+        Raise a :py:class:`subprocess.CalledProcessError` if the return code
+        is not zero, by default False.
+    **kwargs
+        Keyword-arguments passed to :py:class:`subprocess.Popen`, e.g. cwd, env or stdout.
+
+    Raises
+    ------
+    subprocess.TimeoutExpired
+        If the command did not finish within the timeout.
+    """
+    name = None
+    if timeout is not None and cmd[:2] == ["docker", "run"]:
+        name = f"hydroflows-{uuid.uuid4().hex[:12]}"
+        cmd = [*cmd[:2], "--rm", "--name", name, *cmd[2:]]
+    group = timeout is not None and name is None and os.name == "posix"
+    with subprocess.Popen(cmd, start_new_session=group, **kwargs) as proc:
+        try:
+            proc.wait(timeout=timeout)
+        except BaseException:
+            if name is not None:
+                subprocess.run(
+                    ["docker", "kill", name],
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                )
+            elif group:
+                os.killpg(proc.pid, signal.SIGKILL)
+            proc.kill()
+            raise
+    if check and proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, cmd)
+    return subprocess.CompletedProcess(cmd, proc.returncode)
@@ -1,6 +1,7 @@
 """Some parser utils to be used with pydantic validators."""
 
 import re
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional
 
@@ -69,17 +70,24 @@ def get_wildcards(
     if isinstance(s, Path):
         s = s.as_posix()
     if known_wildcards is not None:
-        # Define the regex pattern to match known wildcards
-        pattern = r"\{" + "|".join(known_wildcards) + r"\}"
-    else:
-        # Define the regex pattern to match any wildcard "{*}"
-        pattern = r"\{.*?\}"
+        known_wildcards = tuple(known_wildcards)
+    return list(_find_wildcards(str(s), known_wildcards))
+
+
+# any wildcard "{*}"
+_WILDCARD_PATTERN = re.compile(r"\{.*?\}")
 
-    # Find all matches of the pattern in the string
-    matches = re.findall(pattern, str(s))
 
-    # Return list of unique matches with curly braces stripped
-    return list(set([str(wc).strip("{}") for wc in matches]))
+@lru_cache(maxsize=2**14)
+def _find_wildcards(s: str, known_wildcards: Optional[tuple]) -> tuple:
+    """Return the unique wildcards in a string in order of appearance; cached."""
+    if known_wildcards is not None:
+        # Define the regex pattern to match known wildcards
+        pattern = re.compile(r"\{" + "|".join(known_wildcards) + r"\}")
+    else:
+        pattern = _WILDCARD_PATTERN
+    # Find all matches of the pattern in the string with curly braces stripped
+    return tuple(dict.fromkeys(str(wc).strip("{}") for wc in pattern.findall(s)))
 
 
 def has_wildcards(s: str | Path) -> bool:
@@ -0,0 +1,52 @@
+"""HydroFlows DryrunReport class.
+
+This class is responsible for:
+- collecting the missing input files per rule.
+- collecting the output files which are not used by any other rule.
+- summarizing the number of method instances per rule.
+"""
+
+from pathlib import Path
+from typing import Dict, List
+
+__all__ = ["DryrunReport"]
+
+
+class DryrunReport:
+    """Report of a workflow dryrun, see :py:meth:`Workflow.dryrun`."""
+
+    def __init__(self) -> None:
+        self.n_runs: Dict[str, int] = {}
+        """Number of method instances per rule."""
+        self.n_up_to_date: Dict[str, int] = {}
+        """Number of method instances per rule with up-to-date outputs from a previous run."""
+        self.missing_inputs: Dict[str, List[Path]] = {}
+        """Missing input files per rule, i.e. files that do not exist and are not created by previous rules."""
+        self.orphan_outputs: Dict[str, List[Path]] = {}
+        """Output files per rule that are not used by any other rule, except for the result rules."""
+
+    def __repr__(self) -> str:
+        return self.summary()
+
+    @property
+    def ok(self) -> bool:
+        """Return True if no input files are missing."""
+        return not any(self.missing_inputs.values())
+
+    def summary(self) -> str:
+        """Return a summary table of the dryrun."""
+        header = ("rule", "runs", "up to date", "missing inputs", "orphan outputs")
+        rows = [header]
+        for rule_id, n_runs in self.n_runs.items():
+            rows.append(
+                (
+                    rule_id,
+                    str(n_runs),
+                    str(self.n_up_to_date.get(rule_id, 0)),
+                    str(len(self.missing_inputs.get(rule_id, []))),
+                    str(len(self.orphan_outputs.get(rule_id, []))),
+                )
+            )
+        widths = [max(len(row[i]) for row in rows) for i in range(len(header))]
+        lines = ["  ".join(v.ljust(w) for v, w in zip(row, widths)) for row in rows]
+        return "\n".join(line.rstrip() for line in lines)
@@ -0,0 +1,324 @@
+"""Executor backends to run method instances.
+
+Method instances can be run with one of the following executors:
+
+- "threads": in a thread pool of the current process. This works best for methods
+  that call external programs (e.g. model executables) or release the GIL.
+- "processes": in a process pool. The method instance is serialized with
+  :py:meth:`Method.to_kwargs` and recreated in the worker process with
+  :py:meth:`Method.from_kwargs`. This works best for CPU-bound Python methods.
+- "serial": one by one in the current process.
+
+Failed method instances can be retried, see :py:func:`run_method`.
+"""
+
+import logging
+import sys
+import threading
+import time
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from contextlib import contextmanager
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    List,
+    Literal,
+    Optional,
+    get_args,
+)
+
+from hydroflows.utils.path_utils import cwd
+from hydroflows.workflow.tracing import Tracer, get_tracer, trace_context
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+if TYPE_CHECKING:
+    from hydroflows.workflow.method import Method
+
+__all__ = [
+    "ConcurrentRuns",
+    "ExecutorType",
+    "check_executor",
+    "collect_result",
+    "create_executor",
+    "peak_memory",
+    "reset_peak_memory",
+    "run_method",
+    "run_method_from_kwargs",
+    "submit_method",
+]
+
+logger = logging.getLogger(__name__)
+
+ExecutorType = Literal["threads", "processes", "serial"]
+"""Available executor types."""
+
+
+def check_executor(executor: Optional[str]) -> Optional[str]:
+    """Check if the executor type is valid."""
+    if executor is not None and executor not in get_args(ExecutorType):
+        options = ", ".join(get_args(ExecutorType))
+        raise ValueError(f"Unknown executor '{executor}', choose from {options}.")
+    return executor
+
+
+def create_executor(executor: ExecutorType, max_workers: int = 1) -> Executor:
+    """Create a concurrent.futures executor for the executor type.
+
+    Parameters
+    ----------
+    executor : {"threads", "processes", "serial"}
+        The executor type.
+    max_workers : int, optional
+        The maximum number of workers, by default 1.
+        Ignored for the "serial" executor which always uses a single worker.
+    """
+    check_executor(executor)
+    if executor == "processes":
+        return ProcessPoolExecutor(max_workers=max_workers)
+    elif executor == "serial":
+        return ThreadPoolExecutor(max_workers=1)
+    return ThreadPoolExecutor(max_workers=max_workers)
+
+
+class ConcurrentRuns:
+    """Track method instances which run concurrently in the current process.
+
+    Process-wide measurements, such as the peak memory usage, are only attributed to a
+    method instance if no other method instance ran in the same process at the same
+    time, e.g. with the "threads" executor and more than one worker.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._active: List[Dict[str, bool]] = []
+
+    @contextmanager
+    def track(
+        self,
+        on_first: Optional[Callable[[], None]] = None,
+        on_last: Optional[Callable[[], None]] = None,
+    ) -> Generator[Dict[str, bool], None, None]:
+        """Track a run within the context.
+
+        Parameters
+        ----------
+        on_first : Callable, optional
+            Called if no other run is active when the run starts.
+        on_last : Callable, optional
+            Called if no other run is active when the run ends.
+
+        Yields
+        ------
+        Dict[str, bool]
+            The run with a "shared" key which is set to True as soon as another run
+            is active at the same time.
+        """
+        run = {"shared": False}
+        with self._lock:
+            if self._active:
+                run["shared"] = True
+                for other in self._active:
+                    other["shared"] = True
+            elif on_first is not None:
+                on_first()
+            self._active.append(run)
+        try:
+            yield run
+        finally:
+            with self._lock:
+                self._active.remove(run)
+                if not self._active and on_last is not None:
+                    on_last()
+
+
+_runs = ConcurrentRuns()
+"""Method instances run with :py:func:`run_method` in the current process."""
+
+
+def reset_peak_memory() -> bool:
+    """Reset the peak memory usage of the current process.
+
+    Returns True if the peak was reset, which is only supported on Linux.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def peak_memory(reset: bool = False) -> Optional[int]:
+    """Return the peak memory usage of the current process in bytes.
+
+    Parameters
+    ----------
+    reset : bool, optional
+        Return the peak since the last :py:func:`reset_peak_memory`, by default False
+        (the peak over the lifetime of the process).
+
+    Returns None if the :py:mod:`resource` module is not available.
+    """
+    if reset:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    if resource is None:
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # maxrss is in bytes on macOS and in kilobytes on Linux
+    return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+def run_method(
+    method: "Method",
+    retries: int = 0,
+    backoff: float = 1.0,
+    timeout: Optional[float] = None,
+    trace: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Run a method instance and return its start time, end time and peak memory usage.
+
+    The peak memory usage is the peak resident set size of the process while the method
+    instance ran, see :py:func:`peak_memory`. It is None if other method instances ran
+    in the same process at the same time (the "threads" executor with more than one
+    worker), as the peak of the process can not be attributed to one of them. If the
+    peak can not be reset (on other platforms than Linux), it is the peak over the
+    lifetime of the process.
+
+    Parameters
+    ----------
+    method : Method
+        The method instance.
+    retries : int, optional
+        The number of times a failed method instance is retried, by default 0.
+    backoff : float, optional
+        The delay in seconds before the first retry, by default 1.0.
+        The delay is doubled for each next retry.
+    timeout : float, optional
+        The maximum wall-clock time in seconds of external programs called by the method,
+        by default None (no timeout), see :py:meth:`Method.run`.
+    trace : Dict[str, Any], optional
+        Arguments (e.g. the rule and wildcard values) added to the spans of the method
+        instance if tracing is active, see :py:mod:`hydroflows.workflow.tracing`.
+    """
+    start = time.time()
+    # the peak is only reset if no other method instance runs in this process
+    with _runs.track() as run:
+        reset = not run["shared"] and reset_peak_memory()
+        for attempt in range(retries + 1):
+            try:
+                with trace_context(trace):
+                    method.run(timeout=timeout)
+                break
+            except Exception as e:
+                if attempt == retries:
+                    raise
+                delay = backoff * 2**attempt
+                logger.warning(
+                    f"{method.name} failed ({type(e).__name__}: {e}); "
+                    f"retry {attempt + 1}/{retries} in {delay:g}s"
+                )
+                time.sleep(delay)
+        peak = None if run["shared"] else peak_memory(reset)
+    return {"start": start, "end": time.time(), "peak_memory": peak}
+
+
+def run_method_from_kwargs(
+    method_cls: type["Method"],
+    kwargs: Dict[str, Any],
+    root: Optional[Path] = None,
+    **run_kwargs,
+) -> Dict[str, Any]:
+    """Recreate a method instance from its keyword-arguments and run it.
+
+    This function is used to run method instances in a worker process.
+
+    Parameters
+    ----------
+    method_cls : type[Method]
+        The method class.
+    kwargs : Dict[str, Any]
+        The keyword-arguments of the method instance, see :py:meth:`Method.to_kwargs`.
+    root : Path, optional
+        The working directory to run the method in, by default the current directory.
+    **run_kwargs
+        The retries, backoff, timeout and trace arguments of the run, see :py:func:`run_method`.
+
+    Returns
+    -------
+    Dict[str, Any]
+        The start time, end time and peak memory usage of the worker process,
+        see :py:func:`run_method`. If `trace` is set, the spans recorded in the worker
+        process are returned as "trace_events", see :py:func:`collect_result`.
+    """
+    root = Path.cwd() if root is None else root
+    with cwd(root):
+        method = method_cls.from_kwargs(**kwargs)
+        if run_kwargs.get("trace") is None:
+            return run_method(method, **run_kwargs)
+        # trace the method instance with a tracer of the worker process;
+        # a tracer inherited from the parent process is not shared
+        with Tracer() as tracer:
+            result = run_method(method, **run_kwargs)
+        return {**result, "trace_events": tracer.events}
+
+
+def collect_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the result of a run without spans recorded in a worker process.
+
+    The spans are added to the active tracer.
+    """
+    result = dict(result)
+    events = result.pop("trace_events", None)
+    if events and get_tracer() is not None:
+        get_tracer().extend(events)
+    return result
+
+
+def submit_method(
+    pool: Executor, executor: ExecutorType, method: "Method", **run_kwargs
+) -> Future:
+    """Submit a method instance to a pool created with :py:func:`create_executor`.
+
+    Parameters
+    ----------
+    pool : Executor
+        The pool to submit the method instance to.
+    executor : {"threads", "processes", "serial"}
+        The executor type of the pool.
+    method : Method
+        The method instance.
+    **run_kwargs
+        The retries, backoff, timeout and trace arguments of the run,
+        see :py:func:`run_method`.
+
+    Returns
+    -------
+    Future
+        The future returns the start time, end time and peak memory usage of the run.
+    """
+    if executor == "processes":
+        # methods are serialized to kwargs and recreated in the worker process
+        return pool.submit(
+            run_method_from_kwargs,
+            type(method),
+            method.to_kwargs(),
+            Path.cwd(),
+            **run_kwargs,
+        )
+    return pool.submit(run_method, method, **run_kwargs)
@@ -0,0 +1,78 @@
+"""Failures of method instances when running a rule or workflow.
+
+If a rule or workflow is run with `keep_going=True`, method instances which do not
+depend on a failed method instance are still run. The failures are collected and
+raised at the end of the run as a :py:class:`RunError` with a summary per failed
+method instance.
+"""
+
+from typing import Dict, List, Optional
+
+__all__ = ["Failure", "RunError"]
+
+
+class Failure:
+    """A failed method instance."""
+
+    def __init__(
+        self,
+        rule_id: str,
+        index: int,
+        error: BaseException,
+        wildcards: Optional[Dict[str, str]] = None,
+    ) -> None:
+        self.rule_id = rule_id
+        """The rule ID of the method instance."""
+        self.index = index
+        """The index of the method instance in the rule."""
+        self.error = error
+        """The exception raised by the method instance."""
+        self.wildcards: Dict[str, str] = wildcards or {}
+        """The repeat wildcard values of the method instance."""
+
+    def __repr__(self) -> str:
+        return f"Failure({self.rule_id} {self.index + 1}, {self.message})"
+
+    @property
+    def message(self) -> str:
+        """Return the error type and message."""
+        return f"{type(self.error).__name__}: {self.error}"
+
+
+class RunError(RuntimeError):
+    """Error raised at the end of a run if one or more method instances failed.
+
+    Parameters
+    ----------
+    failures : List[Failure]
+        The failed method instances.
+    skipped : Dict[str, int], optional
+        The number of method instances per rule which were not run
+        because an upstream method instance failed.
+    """
+
+    def __init__(
+        self, failures: List[Failure], skipped: Optional[Dict[str, int]] = None
+    ) -> None:
+        self.failures = failures
+        self.skipped: Dict[str, int] = {k: v for k, v in (skipped or {}).items() if v}
+        super().__init__(self.summary())
+
+    def summary(self) -> str:
+        """Return a summary table of the failed method instances."""
+        header = ("rule", "run", "wildcards", "error")
+        rows = [header]
+        for failure in self.failures:
+            wildcards = ", ".join(f"{k}={v}" for k, v in failure.wildcards.items())
+            rows.append(
+                (failure.rule_id, str(failure.index + 1), wildcards, failure.message)
+            )
+        widths = [max(len(row[i]) for row in rows) for i in range(len(header) - 1)]
+        lines = [f"{len(self.failures)} method instance(s) failed:"]
+        for row in rows:
+            cells = [v.ljust(w) for v, w in zip(row[:-1], widths)] + [row[-1]]
+            lines.append("  ".join(cells).rstrip())
+        if self.skipped:
+            skipped = ", ".join(f"{k} ({v})" for k, v in self.skipped.items())
+            lines.append(f"Not run because of upstream failures: {skipped}")
+        return "\n".join(lines)
@@ -8,21 +8,54 @@ validators and a run method.
 """
 
 import inspect
+import json
 import logging
 from abc import ABC, abstractmethod
+from copy import deepcopy
 from pathlib import Path
-from typing import Any, ClassVar, Dict, Generator, List, Optional, Tuple
+from typing import (
+    Any,
+    ClassVar,
+    Dict,
+    Generator,
+    List,
+    MutableMapping,
+    Optional,
+    Set,
+    Tuple,
+)
+from weakref import WeakValueDictionary
 
 from hydroflows.utils.parsers import has_wildcards
+from hydroflows.workflow.executors import ExecutorType
 from hydroflows.workflow.method_entrypoints import METHODS
 from hydroflows.workflow.method_parameters import Parameters
-from hydroflows.workflow.wildcards import resolve_wildcards
+from hydroflows.workflow.profiling import profile_method
+from hydroflows.workflow.resources import Resources
+from hydroflows.workflow.tracing import get_tracer, span
+from hydroflows.workflow.wildcards import WildcardTemplate
 
 __all__ = ["Method"]
 
 logger = logging.getLogger(__name__)
 
 
+def _size(paths: List[Tuple[str, Path]]) -> int:
+    """Return the total size of existing files in bytes."""
+    return sum(path.stat().st_size for _, path in paths if path.is_file())
+
+
+def _copy_containers(value: Any) -> Any:
+    """Return a copy of nested lists, dicts and sets; other values are not copied."""
+    if isinstance(value, list):
+        return [_copy_containers(v) for v in value]
+    elif isinstance(value, dict):
+        return {k: _copy_containers(v) for k, v in value.items()}
+    elif isinstance(value, set):
+        return set(value)
+    return value
+
+
 class Method(ABC):
     """Base method for all methods.
 
@@ -33,9 +66,32 @@ class Method(ABC):
     # name of the method, should be replaced in subclass
     name: ClassVar[str] = "abstract_method"
 
+    # default executor to run method instances in parallel, see hydroflows.workflow.executors
+    # CPU-bound Python methods should use "processes"
+    executor: ClassVar[ExecutorType] = "threads"
+
+    # whether method instances of a rule can be cloned from the method instead of
+    # initializing the method for each instance, see Rule._create_method_instance;
+    # only set this if the method __init__ derives fields from the (wildcard) paths and
+    # parameters it gets, but not from the content of input files or their values
+    clone_instances: ClassVar[bool] = False
+
+    # resources required to run a single method instance, see hydroflows.workflow.resources
+    # methods with resources that depend on the parameters should overwrite this with a property
+    resources: ClassVar[Resources] = Resources()
+
     # Define the method kwargs for testing
     _test_kwargs = {}
 
+    # maximum wall-clock time in seconds of external programs, set by run(timeout=...)
+    _timeout: Optional[float] = None
+
+    # cache of the dict property with the versions of the input, output and params
+    _dict_cache: Optional[List] = None
+
+    # imported subclasses by (lower case) name and class name, see _get_subclass
+    _registry: ClassVar[MutableMapping[str, type["Method"]]] = WeakValueDictionary()
+
     @abstractmethod
     def __init__(self) -> None:
         # NOTE: the parameter fields are specific to each method and should
@@ -45,6 +101,12 @@ class Method(ABC):
         self.output: Parameters = Parameters()
         self.params: Parameters = Parameters()
 
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        # register imported subclasses by name and class name; the first one is kept
+        for key in {cls.name.lower(), cls.__name__.lower()} - {"abstract_method"}:
+            Method._registry.setdefault(key, cls)
+
     ## ABSTRACT METHODS
 
     @abstractmethod
@@ -73,6 +135,7 @@ class Method(ABC):
         if not isinstance(value, Parameters):
             raise ValueError("Input should be a Parameters instance")
         self._input = value
+        self._dict_cache = None
 
     @property
     def output(self) -> Parameters:
@@ -87,6 +150,7 @@ class Method(ABC):
         if not isinstance(value, Parameters):
             raise ValueError("Output should be a Parameters instance")
         self._output = value
+        self._dict_cache = None
 
     @property
     def params(self) -> Parameters:
@@ -101,6 +165,7 @@ class Method(ABC):
         if not isinstance(value, Parameters):
             raise ValueError("Params should be a Parameters instance")
         self._params = value
+        self._dict_cache = None
 
     ## MAGIC METHODS
     def __repr__(self) -> str:
@@ -116,7 +181,8 @@ class Method(ABC):
         return (
             self.__class__ == other.__class__
             and self.name == other.name
-            and self.to_dict() == other.to_dict()
+            and self._dict_hash == other._dict_hash
+            and self.dict == other.dict
         )
 
     ## SERIALIZATION METHODS
@@ -160,10 +226,44 @@ class Method(ABC):
 
     @property
     def dict(self) -> Dict[str, Dict]:
-        """Return a dictionary representation of the method input, output and params."""
-        if not hasattr(self, "._dict") or not self._dict:
-            self._dict = self.to_dict()
-        return self._dict
+        """Return a dictionary representation of the method input, output and params.
+
+        The dictionary is cached and recomputed if the input, output or params are
+        reassigned, their fields are set or list, dict or set fields are modified
+        in place. Do not modify the returned dictionary.
+        """
+        return self._get_dict_cache()[1]
+
+    @property
+    def _dict_hash(self) -> int:
+        """Return a (cached) hash of :py:attr:`dict`."""
+        cache = self._get_dict_cache()
+        if cache[2] is None:
+            cache[2] = hash(json.dumps(cache[1], sort_keys=True, default=str))
+        return cache[2]
+
+    def _get_dict_cache(self) -> List:
+        """Return the [version, dict, hash, containers] cache of :py:attr:`dict`.
+
+        Fields which are modified in place are not detected by the version of the
+        parameters; a copy of the list, dict and set fields is therefore compared as well.
+        """
+        parameters = [
+            self.__dict__.get(key) for key in ("_input", "_output", "_params")
+        ]
+        version = tuple(p._version if p is not None else None for p in parameters)
+        containers = [
+            value
+            for p in parameters
+            if p is not None
+            for value in p.__dict__.values()
+            if isinstance(value, (list, dict, set))
+        ]
+        cache = self._dict_cache
+        if cache is None or cache[0] != version or cache[3] != containers:
+            cache = [version, self.to_dict(), None, _copy_containers(containers)]
+            self._dict_cache = cache
+        return cache
 
     def to_dict(self, **kwargs) -> Dict:
         """Return a serialized dictionary representation of the method input, output and params."""
@@ -178,6 +278,48 @@ class Method(ABC):
             out_dict["params"] = self.params.to_dict(**dump_kwargs)
         return out_dict
 
+    def clone(
+        self,
+        input: Optional[Dict[str, Any]] = None,
+        output: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> "Method":
+        """Return a copy of the method with updated input, output and params fields.
+
+        Unlike :py:meth:`from_kwargs`, the method is not re-initialized: the validated
+        parameters are copied and only the updated fields are validated. Fields which are
+        derived from other fields in the method `__init__` are therefore not updated.
+
+        Parameters
+        ----------
+        input, output, params : Dict[str, Any], optional
+            The updated input, output and params fields.
+        """
+        method = object.__new__(self.__class__)
+        method.__dict__.update(self.__dict__)
+        # drop cached values
+        for attr in ("_dict_cache", "_output_expanded"):
+            method.__dict__.pop(attr, None)
+        if "_expand_wildcards" in method.__dict__:
+            method._expand_wildcards = dict(self._expand_wildcards)
+        for name, updates in (("input", input), ("output", output), ("params", params)):
+            if f"_{name}" not in self.__dict__:
+                continue
+            parameters = getattr(self, name).model_copy()
+            parameters._refs = {}
+            # mutable fields are not shared with the method
+            for key, value in parameters.__dict__.items():
+                if isinstance(value, (list, dict, set)):
+                    parameters.__dict__[key] = deepcopy(value)
+            validator = parameters.__pydantic_validator__
+            for key, value in (updates or {}).items():
+                validator.validate_assignment(parameters, key, value)
+            if updates:
+                # validate_assignment bypasses Parameters.__setattr__
+                parameters._version += 1
+            setattr(method, name, parameters)
+        return method
+
     ## SERIALIZATION METHODS
 
     @classmethod
@@ -201,10 +343,9 @@ class Method(ABC):
     @classmethod
     def _get_subclass(cls, name: str) -> type["Method"]:
         """Get a subclass by name."""
-        name = name.lower()
-        for subclass in cls._get_subclasses():
-            if subclass.name.lower() == name or subclass.__name__.lower() == name:
-                return subclass
+        subclass = Method._registry.get(name.lower())
+        if subclass is not None and issubclass(subclass, cls):
+            return subclass
         # if not found, try to import the module using entry points
         return METHODS.load(name)
 
@@ -251,7 +392,7 @@ class Method(ABC):
 
     def dryrun(
         self,
-        input_files: List[Path],
+        input_files: Set[Path] | List[Path],
         missing_file_error: bool = False,
         touch_output: bool = False,
     ) -> List[Path]:
@@ -259,8 +400,8 @@ class Method(ABC):
 
         Parameters
         ----------
-        input_files : List[Path]
-            List of input paths to check, by default None.
+        input_files : Set[Path] | List[Path]
+            Input paths which are not checked for existence, e.g. outputs of previous methods.
         missing_file_error : bool, optional
             Raise an error if a missing file is encountered, by default False.
 
@@ -269,7 +410,10 @@ class Method(ABC):
         List[Path]
             List of output paths.
         """
-        for key, value in self.input.model_dump().items():
+        if not isinstance(input_files, (set, frozenset)):
+            input_files = set(input_files)
+        for key in self.input.all_fields:
+            value = getattr(self.input, key)
             if isinstance(value, Path):
                 if value not in input_files and not value.is_file():
                     msg = f"Input file {self.name}.input.{key} not found: {value}"
@@ -288,19 +432,36 @@ class Method(ABC):
 
         return out_paths
 
-    def run(self, check_output: bool = True) -> None:
+    def run(self, check_output: bool = True, timeout: Optional[float] = None) -> None:
         """Run the method with input/output checks.
 
         Parameters
         ----------
         check_output : bool, optional
             Check if output files are created, by default True.
+        timeout : float, optional
+            The maximum wall-clock time in seconds of external programs called by the method,
+            e.g. model executables, by default None (no timeout). External programs are
+            killed and a :py:class:`subprocess.TimeoutExpired` error is raised if it is exceeded.
+            Containers are stopped as well, see :py:func:`~hydroflows.utils.docker_utils.run_container`.
+            Methods which do not call external programs ignore the timeout.
         """
         # TODO warning if wildcards on input / params
-        self.check_input_output_paths()
-        self._run()
-        if check_output:
-            self.check_output_exists()
+        # spans are only recorded if tracing is active, see hydroflows.workflow.tracing
+        # and profiles are only saved if profiling is enabled, see hydroflows.workflow.profiling
+        with profile_method(self), span("run", method=self.name) as args:
+            with span("check_input_output_paths"):
+                self.check_input_output_paths()
+            if get_tracer() is not None:
+                args.update(bytes_read=_size(self._input_paths))
+            self._timeout = timeout
+            with span("_run"):
+                self._run()
+            if check_output:
+                with span("check_output_exists"):
+                    self.check_output_exists()
+            if get_tracer() is not None:
+                args.update(bytes_written=_size(self._output_paths))
 
     def check_input_output_paths(
         self,
@@ -331,6 +492,18 @@ class Method(ABC):
         for folder in folders:
             folder.mkdir(parents=True, exist_ok=True)
 
+    @property
+    def _input_paths(self) -> List[Tuple[str, Path]]:
+        """Return a list of input key-path tuples, with list values flattened."""
+        paths = []
+        for key in self.input.all_fields:
+            value = getattr(self.input, key)
+            if isinstance(value, Path):
+                paths.append((key, value))
+            elif isinstance(value, list):
+                paths.extend([(key, val) for val in value if isinstance(val, Path)])
+        return paths
+
     @property
     def _output_paths(self) -> List[Tuple[str, Path]]:
         """Return a list of output key-path tuples."""
@@ -389,7 +562,9 @@ class ExpandMethod(Method, ABC):
         """Evaluate wildcards in output paths."""
         self._output_expanded = {}
         for key, value in self.output.to_dict(filter_types=(Path)).items():
-            value = resolve_wildcards(value, self.expand_wildcards)
+            template = WildcardTemplate.parse(value)
+            if template.names:
+                value = template.expand(self.expand_wildcards)
             self._output_expanded[key] = value
 
     @property
@@ -423,7 +598,7 @@ class ExpandMethod(Method, ABC):
             raise ValueError("All wildcard values should be strings.")
         output = {}
         for key, path in self.output.to_dict(filter_types=(Path)).items():
-            output[key] = resolve_wildcards(path, wildcards)
+            output[key] = WildcardTemplate.parse(path).fill(wildcards)
         return output
 
 
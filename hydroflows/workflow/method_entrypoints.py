@@ -2,9 +2,9 @@
 
 from typing import TYPE_CHECKING, ClassVar, Dict, Optional, Union
 
-from importlib_metadata import EntryPoint, entry_points
-
 if TYPE_CHECKING:
+    from importlib_metadata import EntryPoint
+
     from hydroflows.workflow import Method
 
 __all__ = ["METHODS"]
@@ -56,55 +56,86 @@ class MethodEPS:
 
     The class is used to allow users to contribute methods and
     load local methods lazily. Methods are loaded by name or class name.
+    The entry points of installed packages are only discovered when needed.
     """
 
     group: ClassVar[str] = "hydroflows.methods"
 
-    def __init__(self, eps: Optional[Dict[str, Union[str, EntryPoint]]] = None) -> None:
+    def __init__(
+        self, eps: Optional[Dict[str, Union[str, "EntryPoint"]]] = None
+    ) -> None:
         """Initialize."""
-        # cache entry points by name property and class.__name__
-        self._entry_points: Dict[str, EntryPoint] = {}
+        # cache entry points (or entry point values) by name property
+        self._entry_points: Dict[str, Union[str, "EntryPoint"]] = {}
+        # cache of class.__name__ -> name index
+        self._class_names: Optional[Dict[str, str]] = None
+        self._discovered = False
         # local eps
-        eps = eps or {}
-        # load other eps
-        for ep in entry_points(group=self.group):
-            ep_dict = ep.load()
-            if isinstance(ep_dict, dict):
-                eps.update(ep_dict)
-            else:
-                raise ValueError(f"Invalid entry point {ep} in group {self.group}")
-        # add eps
-        for name, ep in eps.items():
+        for name, ep in (eps or {}).items():
             self.set_ep(name, ep)
 
     @property
-    def entry_points(self) -> Dict[str, EntryPoint]:
+    def entry_points(self) -> Dict[str, "EntryPoint"]:
         """List of method entry points."""
+        self._discover()
+        for name, ep in self._entry_points.items():
+            if isinstance(ep, str):
+                self._entry_points[name] = self._entry_point(name, ep)
         return self._entry_points
 
-    def set_ep(self, name: str, ep: Union[str, EntryPoint]) -> None:
+    def _entry_point(self, name: str, value: str) -> "EntryPoint":
+        from importlib_metadata import EntryPoint
+
+        return EntryPoint(name, value, self.group)
+
+    def _discover(self) -> None:
+        """Add the entry points of installed packages, once."""
+        if self._discovered:
+            return
+        self._discovered = True
+        from importlib_metadata import entry_points
+
+        for ep in entry_points(group=self.group):
+            ep_dict = ep.load()
+            if not isinstance(ep_dict, dict):
+                raise ValueError(f"Invalid entry point {ep} in group {self.group}")
+            # installed entry points overwrite local entry points
+            for name, value in ep_dict.items():
+                self._entry_points.pop(name.lower(), None)
+                self.set_ep(name, value)
+
+    def set_ep(self, name: str, ep: Union[str, "EntryPoint"]) -> None:
         name = name.lower()
         if name in self._entry_points:
             raise ValueError(f"Duplicate entry point {name}")
-        if isinstance(ep, str):
-            ep = EntryPoint(name, ep, self.group)
-        elif not isinstance(ep, EntryPoint):
+        if not isinstance(ep, str) and not hasattr(ep, "load"):
             raise ValueError(f"Invalid entry point {ep}")
         self._entry_points[name] = ep
+        self._class_names = None
 
-    def get_ep(self, name: str) -> EntryPoint:
+    def get_ep(self, name: str) -> "EntryPoint":
         """Get entry point by name."""
         name = name.lower()
-        ep = self.entry_points.get(name)
-        if ep is None:  # try by class name
-            for ep0 in self.entry_points.values():
-                if ep0.value.split(":")[-1].split(".")[-1].lower() == name:
-                    ep = ep0
-                    break
+        if name not in self._entry_points:
+            self._discover()
+        if name not in self._entry_points:  # try by class name
+            if self._class_names is None:
+                self._class_names = {
+                    self._value(ep).split(":")[-1].split(".")[-1].lower(): key
+                    for key, ep in reversed(self._entry_points.items())
+                }
+            name = self._class_names.get(name, name)
+        ep = self._entry_points.get(name)
         if ep is None:
             raise ValueError(f"Method {name} not found")
+        if isinstance(ep, str):
+            ep = self._entry_points[name] = self._entry_point(name, ep)
         return ep
 
+    @staticmethod
+    def _value(ep: Union[str, "EntryPoint"]) -> str:
+        return ep if isinstance(ep, str) else ep.value
+
     def load(self, name: str) -> "Method":
         """Load method by name."""
         from hydroflows.workflow import Method
@@ -2,7 +2,7 @@
 
 import json
 from pathlib import Path
-from typing import Dict, List, Literal, Tuple, Type
+from typing import Any, Dict, List, Literal, Tuple, Type
 
 from pydantic import (
     BaseModel,
@@ -24,6 +24,9 @@ class Parameters(BaseModel):
     _refs: Dict[str, str] = {}
     """Dictionary of references to parameters of other rules or config items."""
 
+    _version: int = 0
+    """Number of times a field is set after initialization, used to invalidate caches."""
+
     def __init__(self, **data) -> None:
         super().__init__(**data)
 
@@ -32,6 +35,11 @@ class Parameters(BaseModel):
             if isinstance(value, Ref):
                 self._refs[key] = value.ref
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if not name.startswith("_"):
+            self._version += 1
+
     @model_validator(mode="before")
     @classmethod
     def _resolve_refs(cls, data: Dict) -> Dict:
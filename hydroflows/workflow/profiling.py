@@ -0,0 +1,224 @@
+"""Memory and CPU profiling of method instances.
+
+Profiling is opt-in and enabled with the `HYDROFLOWS_PROFILE` environment variable or
+with ``Workflow.run(profile=True)``. The environment variable can be set to "1" or
+to the number of Python allocation hotspots to report (by default 10).
+
+For each method instance run with :py:meth:`Method.run`, a profile is saved next to
+its first output file as ``<output file>.profile.json`` with:
+
+- the wall-clock and CPU time of the method and of the external programs it called,
+- the peak resident set size (RSS) of the process and the maximum peak RSS of the
+  external programs run by the process,
+- the peak memory allocated by Python and the top-N allocation hotspots (tracemalloc),
+- the number of dask tasks and their compute time per task prefix.
+
+CPU time, RSS and Python allocations are measured for the whole process. If other
+method instances are profiled in the same process at the same time (the "threads"
+executor with more than one worker), the profile is marked as "shared" and the peak
+RSS and peak Python memory are not reported. Run method instances with the "processes"
+or "serial" executor to profile them separately.
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Dict, Generator
+
+from hydroflows.workflow.executors import (
+    ConcurrentRuns,
+    peak_memory,
+    reset_peak_memory,
+)
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+if TYPE_CHECKING:
+    from hydroflows.workflow.method import Method
+
+__all__ = ["PROFILE_ENV", "profile_method", "profiling", "profiling_top_n"]
+
+logger = logging.getLogger(__name__)
+
+PROFILE_ENV = "HYDROFLOWS_PROFILE"
+"""Environment variable to enable profiling."""
+
+_profiled = ConcurrentRuns()
+"""Method instances which are profiled in the current process."""
+
+_tracemalloc = {"started": False}
+"""Whether tracemalloc was started by :py:func:`profile_method`."""
+
+
+def _start_tracemalloc() -> None:
+    """Start tracing Python allocations for the first profiled method instance."""
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _tracemalloc["started"] = True
+
+
+def _stop_tracemalloc() -> None:
+    """Stop tracing Python allocations after the last profiled method instance."""
+    if _tracemalloc["started"]:
+        tracemalloc.stop()
+        _tracemalloc["started"] = False
+
+
+def profiling_top_n() -> int:
+    """Return the number of allocation hotspots to profile, 0 if profiling is disabled."""
+    value = os.environ.get(PROFILE_ENV, "").strip().lower()
+    if value in ("", "0", "false", "no"):
+        return 0
+    if value in ("true", "yes"):
+        return 10
+    try:
+        return int(value) if int(value) > 1 else 10
+    except ValueError:
+        return 10
+
+
+@contextmanager
+def profiling(profile: bool | int = True) -> Generator[None, None, None]:
+    """Enable profiling within the context, also for worker processes.
+
+    Parameters
+    ----------
+    profile : bool | int, optional
+        Enable profiling if True, or the number of allocation hotspots to profile,
+        by default True.
+    """
+    previous = os.environ.get(PROFILE_ENV)
+    if profile:
+        os.environ[PROFILE_ENV] = str(10 if profile is True else int(profile))
+    try:
+        yield
+    finally:
+        if previous is None:
+            os.environ.pop(PROFILE_ENV, None)
+        else:
+            os.environ[PROFILE_ENV] = previous
+
+
+def _dask_stats() -> Any:
+    """Return a dask callback which counts dask tasks and their compute time per task prefix.
+
+    dask is only imported when profiling.
+    """
+    from dask.callbacks import Callback
+    from dask.utils import key_split
+
+    class _DaskStats(Callback):
+        def __init__(self) -> None:
+            super().__init__()
+            self.tasks: Dict[str, Dict[str, float]] = {}
+            self._task_start: Dict[Any, float] = {}
+            self._lock = threading.Lock()
+
+        def _pretask(self, key, dsk, state) -> None:
+            self._task_start[key] = time.perf_counter()
+
+        def _posttask(self, key, result, dsk, state, worker_id) -> None:
+            start = self._task_start.pop(key, time.perf_counter())
+            duration = time.perf_counter() - start
+            with self._lock:
+                stats = self.tasks.setdefault(key_split(key), {"count": 0, "time": 0.0})
+                stats["count"] += 1
+                stats["time"] += duration
+
+    return _DaskStats()
+
+
+def _maxrss(who: int) -> int:
+    """Return the maximum RSS in bytes; ru_maxrss is in bytes on macOS and in kilobytes on Linux."""
+    maxrss = resource.getrusage(who).ru_maxrss
+    return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+@contextmanager
+def profile_method(method: "Method") -> Generator[None, None, None]:
+    """Profile a method instance if profiling is enabled, see :py:mod:`hydroflows.workflow.profiling`."""
+    top_n = profiling_top_n()
+    if top_n == 0:
+        yield
+        return
+    start, times = time.time(), os.times()
+    # tracemalloc is started by the first and stopped by the last profiled instance;
+    # the process-wide peaks are only reset if no other instance is profiled
+    with _profiled.track(on_first=_start_tracemalloc, on_last=_stop_tracemalloc) as run:
+        reset = False
+        if not run["shared"]:
+            reset = reset_peak_memory()
+            tracemalloc.reset_peak()
+        status, dask_stats = "failed", _dask_stats()
+        try:
+            with dask_stats:
+                yield
+            status = "success"
+        finally:
+            end, times_end = time.time(), os.times()
+            snapshot = tracemalloc.take_snapshot()
+            shared = run["shared"]
+            traced_peak = None if shared else tracemalloc.get_traced_memory()[1]
+            peak_rss = None if shared else peak_memory(reset)
+            top = snapshot.filter_traces(
+                [tracemalloc.Filter(False, tracemalloc.__file__)]
+            ).statistics("lineno")[:top_n]
+            tasks = dask_stats.tasks
+            profile = {
+                "method": method.name,
+                "status": status,
+                "shared": shared,
+                "start": start,
+                "end": end,
+                "wall_time": end - start,
+                "cpu_time": {
+                    "user": times_end.user - times.user,
+                    "system": times_end.system - times.system,
+                    "children_user": times_end.children_user - times.children_user,
+                    "children_system": times_end.children_system
+                    - times.children_system,
+                },
+                "peak_rss": peak_rss,
+                "peak_rss_children": None
+                if resource is None
+                else _maxrss(resource.RUSAGE_CHILDREN),
+                "tracemalloc": {
+                    "peak": traced_peak,
+                    "top": [
+                        {
+                            "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                            "size": stat.size,
+                            "count": stat.count,
+                        }
+                        for stat in top
+                    ],
+                },
+                "dask": {
+                    "n_tasks": sum(int(v["count"]) for v in tasks.values()),
+                    "tasks": tasks,
+                },
+            }
+            _write_profile(method, profile)
+
+
+def _write_profile(method: "Method", profile: Dict[str, Any]) -> None:
+    """Write the profile next to the first output file of the method."""
+    outputs = method._output_paths
+    if not outputs:
+        return
+    path = outputs[0][1]
+    file = path.with_name(f"{path.name}.profile.json")
+    try:
+        file.parent.mkdir(parents=True, exist_ok=True)
+        with open(file, "w") as f:
+            json.dump(profile, f, indent=2)
+    except OSError as e:
+        logger.warning(f"Could not write profile of {method.name}: {e}")
@@ -0,0 +1,75 @@
+"""Resources required to run method instances.
+
+A method declares the resources required to run a single method instance
+with :py:attr:`Method.resources`, which can be overwritten per rule.
+The scheduler only starts a method instance if the required resources are available
+within the resources of the machine, see :py:class:`Scheduler`.
+"""
+
+import os
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+__all__ = ["Resources", "machine_cores", "machine_memory"]
+
+
+class Resources(BaseModel):
+    """Resources required to run a single method instance."""
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+    cores: int = Field(1, ge=1)
+    """The number of CPU cores (threads) used by the method."""
+
+    mem_mb: int = Field(0, ge=0)
+    """The peak memory usage of the method in MB, 0 if unknown."""
+
+    heavy_io: bool = False
+    """Whether the method reads or writes large amounts of data.
+    Method instances with heavy I/O are not run concurrently."""
+
+    def update(self, **kwargs) -> "Resources":
+        """Return a copy of the resources with updated values."""
+        return Resources(**{**self.model_dump(), **kwargs})
+
+    def max_instances(self, cores: int, mem_mb: Optional[int] = None) -> int:
+        """Return the maximum number of method instances to run concurrently.
+
+        Parameters
+        ----------
+        cores : int
+            The number of available CPU cores.
+        mem_mb : int, optional
+            The available memory in MB, by default None (unlimited).
+
+        Returns
+        -------
+        int
+            The maximum number of method instances within the available resources,
+            at least one.
+        """
+        n = cores // self.cores
+        if mem_mb and self.mem_mb:
+            n = min(n, mem_mb // self.mem_mb)
+        if self.heavy_io:
+            n = min(n, 1)
+        return max(n, 1)
+
+
+def machine_cores() -> int:
+    """Return the number of CPU cores available to the current process."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def machine_memory() -> Optional[int]:
+    """Return the total physical memory of the machine in MB.
+
+    Returns None if the memory size cannot be determined, e.g. on Windows.
+    """
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") // 2**20
+    except (AttributeError, ValueError, OSError):
+        return None
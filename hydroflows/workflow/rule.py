@@ -9,17 +9,29 @@ This class is responsible for:
 
 import logging
 import weakref
-from itertools import product
+from collections.abc import Iterator, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from itertools import chain, product
+from math import prod
 from pathlib import Path
-from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Set, Tuple
 
-from tqdm.contrib.concurrent import thread_map
-
-from hydroflows.utils.parsers import get_wildcards
 from hydroflows.utils.path_utils import cwd
+from hydroflows.workflow.executors import (
+    ExecutorType,
+    check_executor,
+    collect_result,
+    create_executor,
+    run_method,
+    submit_method,
+)
+from hydroflows.workflow.failures import Failure, RunError
 from hydroflows.workflow.method import ExpandMethod, Method, ReduceMethod
 from hydroflows.workflow.method_parameters import Parameters
-from hydroflows.workflow.wildcards import resolve_wildcards
+from hydroflows.workflow.resources import Resources, machine_cores, machine_memory
+from hydroflows.workflow.run_state import RunState, hash_params, hash_template
+from hydroflows.workflow.tracing import get_tracer
+from hydroflows.workflow.wildcards import WildcardTemplate, wildcard_product
 
 if TYPE_CHECKING:
     from hydroflows.workflow.workflow import Workflow
@@ -29,6 +41,101 @@ __all__ = ["Rule"]
 logger = logging.getLogger(__name__)
 
 
+class MethodInstances(Sequence):
+    """Lazy sequence of the method instances of a rule.
+
+    Method instances are created when accessed from the product of the repeat
+    wildcard values. The wildcard values are fixed when the sequence is created.
+    """
+
+    def __init__(
+        self,
+        rule: "Rule",
+        repeat: Dict[str, List[str]],
+        reduce: Optional[Dict[str, List[str]]] = None,
+    ) -> None:
+        """Create a lazy sequence of method instances.
+
+        Parameters
+        ----------
+        rule : Rule
+            The rule to create method instances for.
+        repeat : Dict[str, List[str]]
+            The values per repeat wildcard.
+        reduce : Dict[str, List[str]], optional
+            The values per reduce wildcard, which are passed to each method instance.
+        """
+        self._rule_ref = weakref.ref(rule)
+        self._names: List[str] = list(repeat.keys())
+        self._values: List[List[str]] = [list(v) for v in repeat.values()]
+        self._reduce: Dict[str, List[str]] = reduce or {}
+
+    def __len__(self) -> int:
+        return prod(len(v) for v in self._values)
+
+    def __repr__(self) -> str:
+        return f"MethodInstances(n={len(self)})"
+
+    def __getitem__(self, index: int | slice) -> Method | List[Method]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return self._rule_ref()._create_method_instance(self.get_wildcards(index))
+
+    def __iter__(self) -> Iterator[Method]:
+        rule = self._rule_ref()
+        for wildcards in self.iter_wildcards():
+            yield rule._create_method_instance(wildcards)
+
+    @property
+    def wildcards(self) -> Dict[str, List[str]]:
+        """Return the values of the repeat and reduce wildcards."""
+        return {**dict(zip(self._names, self._values)), **self._reduce}
+
+    def get_wildcards(self, index: int) -> Dict[str, str | List[str]]:
+        """Return the wildcard values of the method instance at index."""
+        n = len(self)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("method instance index out of range")
+        # decode index in product of wildcard values; last wildcard varies fastest
+        values = []
+        for wc_values in reversed(self._values):
+            index, i = divmod(index, len(wc_values))
+            values.append(wc_values[i])
+        return {**dict(zip(self._names, reversed(values))), **self._reduce}
+
+    def iter_wildcards(self) -> Iterator[Dict[str, str | List[str]]]:
+        """Iterate over the wildcard values of all method instances."""
+        for values in product(*self._values):
+            yield {**dict(zip(self._names, values)), **self._reduce}
+
+
+def _resolve_paths(value, wildcards: Dict[str, List[str]]) -> List[Path]:
+    """Resolve all paths in value for the product of wildcard values.
+
+    Only wildcards in the value are resolved. The order of the paths is the same as
+    when resolving the value for each product of all wildcard values and removing duplicates.
+    """
+    values = value if isinstance(value, list) else [value]
+    if not values or not isinstance(values[0], Path):
+        return []
+    templates = [WildcardTemplate.parse(v) for v in values]
+    # keep the order of the wildcards
+    value_wildcards = set(chain(*[t.names for t in templates]))
+    names = [wc for wc in wildcards if wc in value_wildcards]
+    if len(names) != len(value_wildcards):
+        missing = ", ".join(value_wildcards - set(names))
+        raise KeyError(f"Wildcard values missing for: {missing}")
+    # dict as ordered set
+    paths: Dict[Path, None] = {}
+    for wc_values in product(*[wildcards[wc] for wc in names]):
+        wc_dict = dict(zip(names, wc_values))
+        for template in templates:
+            paths[template.fill(wc_dict)] = None
+    return list(paths)
+
+
 class Rule:
     """Rule class.
 
@@ -46,6 +153,11 @@ class Rule:
         method: Method,
         workflow: "Workflow",
         rule_id: Optional[str] = None,
+        resources: Optional[Dict] = None,
+        retries: int = 0,
+        backoff: float = 1.0,
+        timeout: Optional[float] = None,
+        group: Optional[str] = None,
     ) -> None:
         """Create a rule instance.
 
@@ -57,6 +169,20 @@ class Rule:
             The workflow instance to which the rule belongs.
         rule_id : str, optional
             The rule id, by default None (method name).
+        resources : Dict, optional
+            Resources required to run a single method instance, e.g. {"cores": 4},
+            which overwrite the resources of the method, see :py:class:`Resources`.
+        retries : int, optional
+            The number of times a failed method instance is retried, by default 0.
+        backoff : float, optional
+            The delay in seconds before the first retry of a failed method instance,
+            which is doubled for each next retry, by default 1.0.
+        timeout : float, optional
+            The maximum wall-clock time in seconds of external programs (e.g. model executables)
+            called by a method instance, by default None (no timeout).
+        group : str, optional
+            The name of a group of rules of which the jobs are run together by workflow
+            engines, e.g. the Snakemake ``group`` directive, by default None.
         """
         # set the method
         self.method: Method = method
@@ -64,6 +190,18 @@ class Rule:
         if rule_id is None:
             rule_id = method.name
         self.rule_id: str = str(rule_id)
+        # resources which overwrite the method resources; validated here
+        self._resources: Dict = dict(resources or {})
+        method.resources.update(**self._resources)
+        # retry and timeout policy for each method instance
+        if retries < 0 or backoff < 0 or (timeout is not None and timeout <= 0):
+            raise ValueError(
+                "retries and backoff should be non-negative and timeout positive."
+            )
+        self.retries: int = int(retries)
+        self.backoff: float = backoff
+        self.timeout: Optional[float] = timeout
+        self.group: Optional[str] = group
         # add weak reference to workflow to avoid circular references
         self._workflow_ref = weakref.ref(workflow)
 
@@ -71,12 +209,19 @@ class Rule:
         self._wildcard_fields: Dict[str, List] = {}  # wildcard - fieldname dictionary
         self._wildcards: Dict[str, List] = {}  # repeat, expand, reduce wildcards
         self._loop_depth: int = 0  # loop depth of the rule (based on repeat wildcards)
-        self._method_instances: List[Method] = []  # list of method instances
+        self._method_instances: Optional[MethodInstances] = None  # lazy instances
         self._input: Dict[str, list[Path]] = {}  # input paths for all method instances
         self._output: Dict[
             str, list[Path]
         ] = {}  # output paths for all method instances
         self._output_refs: Dict[str, str] = {}  # output path references
+        # input and output key-path tuples per method instance
+        self._instance_paths: Optional[List[Tuple[List, List]]] = None
+        # whether method instances are cloned from the method, see _create_method_instance
+        self._clone_instances: bool = method.clone_instances
+        self._clone_checked: bool = False
+        self._clone_templates: Optional[List[Tuple]] = None  # fields with wildcards
+        self._params_hash: Optional[str] = None  # hash of the method, see RunState
 
         # add expand wildcards to workflow wildcards
         if isinstance(self.method, ExpandMethod):
@@ -133,8 +278,48 @@ class Rule:
         return self._wildcard_fields
 
     @property
-    def method_instances(self) -> List[Method]:
-        """Return a list of all method instances."""
+    def resources(self) -> Resources:
+        """Return the resources required to run a single method instance."""
+        return self.method.resources.update(**self._resources)
+
+    def _get_run_kwargs(self, index: int) -> Dict:
+        """Return the keyword-arguments to run the method instance at index.
+
+        These contain the retry and timeout settings of the rule and, if tracing is active,
+        the rule, run number and wildcard values to add to the spans of the method instance.
+        """
+        kwargs = {"retries": self.retries, "backoff": self.backoff}
+        kwargs.update(timeout=self.timeout)
+        if get_tracer() is not None:
+            wildcards = self._get_repeat_wildcards(index)
+            kwargs.update(
+                trace={"rule": self.rule_id, "run": index + 1, "wildcards": wildcards}
+            )
+        return kwargs
+
+    def _get_repeat_wildcards(self, index: int) -> Dict[str, str]:
+        """Return the repeat wildcard values of the method instance at index."""
+        wildcards = self._method_instances.get_wildcards(index)
+        return {wc: wildcards[wc] for wc in self.wildcards["repeat"]}
+
+    def _get_template_hash(self, index: int) -> str:
+        """Return the hash of the method and the wildcard values of the method instance at index.
+
+        The hash is recorded in the run state to check if the parameters of a method
+        instance changed without creating it, see :py:func:`hash_template`.
+        """
+        if self._params_hash is None:
+            self._params_hash = hash_params(self.method)
+        wildcards = self._method_instances.get_wildcards(index)
+        return hash_template(self._params_hash, wildcards)
+
+    @property
+    def method_instances(self) -> MethodInstances:
+        """Return a lazy sequence of all method instances.
+
+        Method instances are created when accessed; iterate once to avoid
+        creating the same instance multiple times.
+        """
         return self._method_instances
 
     @property
@@ -167,6 +352,15 @@ class Rule:
         }
         if self.rule_id != self.method.name:
             out["rule_id"] = self.rule_id
+        if self._resources:
+            out["resources"] = self._resources
+        if self.retries:
+            out["retries"] = self.retries
+            out["backoff"] = self.backoff
+        if self.timeout is not None:
+            out["timeout"] = self.timeout
+        if self.group is not None:
+            out["group"] = self.group
         return out
 
     ## WILDCARD METHODS
@@ -182,7 +376,7 @@ class Rule:
                 # skip if value is not a string or path
                 if not isinstance(value, (str, Path)):
                     continue
-                val_wildcards = get_wildcards(value)
+                val_wildcards = WildcardTemplate.parse(value).names
                 # loop over wildcards that are known and in the value
                 for wc in set(val_wildcards) & set(known_wildcards):
                     if wc not in wildcards[sec]:
@@ -249,54 +443,120 @@ class Rule:
             if wc in wildcards:
                 raise ValueError(f"Expand wildcard '{wc}' should not be in wildcards.")
 
+        if not self._clone_instances:
+            return self._init_method_instance(wildcards)
+        if __debug__ and not self._clone_checked:
+            self._clone_checked = True
+            assert self._check_clone_instances(wildcards), (
+                f"Cloned method instances of rule {self.rule_id} differ from "
+                f"initialized ones; set {type(self.method).__name__}.clone_instances "
+                "to False."
+            )
+        return self._clone_method_instance(wildcards)
+
+    def _check_clone_instances(self, wildcards: Dict[str, str | list[str]]) -> bool:
+        """Check if cloning the method gives the same method instances as initializing it.
+
+        Cloning is much faster than initializing the method, but only correct if the
+        method `__init__` does not derive fields from the wildcard values. Methods
+        therefore opt in with :py:attr:`Method.clone_instances`. As a sanity check of
+        this flag, this is checked for the method instance with `wildcards` and for the
+        middle and last method instance.
+        """
+        samples = [wildcards]
+        n = len(self._method_instances)
+        for index in sorted({n // 2, n - 1}):
+            try:
+                sample = self._method_instances.get_wildcards(index)
+            except IndexError:
+                continue
+            if sample not in samples:
+                samples.append(sample)
+        # errors for the method instance with `wildcards` are raised
+        method = self._init_method_instance(wildcards)
+        for sample in samples:
+            try:
+                if sample is not wildcards:
+                    method = self._init_method_instance(sample)
+                clone = self._clone_method_instance(sample)
+            except (KeyError, ValueError):
+                return False
+            expand_wildcards = getattr(method, "expand_wildcards", None)
+            if (
+                clone != method
+                or getattr(clone, "expand_wildcards", None) != expand_wildcards
+            ):
+                return False
+        return True
+
+    def _init_method_instance(self, wildcards: Dict[str, str | list[str]]) -> Method:
+        """Return a new method instance by initializing the method with wildcards replaced."""
         # get kwargs from method
         kwargs = self.method.to_kwargs()
         # get input fields over which the method should reduce
-        reduce_fields = []
-        for wc in self.wildcards["reduce"]:
-            reduce_fields.extend(self.wildcard_fields[wc])
-        reduce_fields = list(set(reduce_fields))  # keep unique values
+        reduce_fields = self._reduce_fields
         if reduce_fields:
-            # make sure all values are a list
-            # then take the product of the lists
-            wc_list = [
-                val if isinstance(val, list) else [val] for val in wildcards.values()
-            ]
-            wildcards_reduce: List[Dict] = [
-                dict(zip(wildcards.keys(), wc)) for wc in list(product(*wc_list))
-            ]
+            wildcards_reduce = self._wildcards_reduce(wildcards)
         for key in kwargs:
             if key in reduce_fields:
                 # reduce method -> turn values into lists
                 # wildcards = {wc: [v1, v2, ...], ...}
-                kwargs[key] = [
-                    resolve_wildcards(kwargs[key], d) for d in wildcards_reduce
-                ]
+                template = WildcardTemplate.parse(kwargs[key])
+                kwargs[key] = [template.fill(d) for d in wildcards_reduce]
             elif key in self._all_wildcard_fields:
                 # repeat method
                 # wildcards = {wc: v, ...}
-                kwargs[key] = resolve_wildcards(kwargs[key], wildcards)
+                kwargs[key] = WildcardTemplate.parse(kwargs[key]).fill(wildcards)
         method = self.method.from_kwargs(**kwargs)
         return method
 
+    def _clone_method_instance(self, wildcards: Dict[str, str | list[str]]) -> Method:
+        """Return a new method instance by cloning the method with wildcards replaced."""
+        reduce_fields = self._reduce_fields
+        if reduce_fields:
+            wildcards_reduce = self._wildcards_reduce(wildcards)
+        # keep expand wildcards in the output
+        wildcards = {
+            **wildcards,
+            **{wc: "{" + wc + "}" for wc in self.wildcards["expand"]},
+        }
+        if self._clone_templates is None:
+            # parse the fields with wildcards once
+            self._clone_templates = [
+                (sec, key, WildcardTemplate.parse(value), key in reduce_fields)
+                for sec in ["input", "output", "params"]
+                for key, value in getattr(self.method, sec)
+                if isinstance(value, (str, Path)) and key in self._all_wildcard_fields
+            ]
+        updates = {"input": {}, "output": {}, "params": {}}
+        for sec, key, template, reduce in self._clone_templates:
+            if reduce:
+                updates[sec][key] = [template.fill(d) for d in wildcards_reduce]
+            else:
+                updates[sec][key] = template.fill(wildcards)
+        return self.method.clone(**updates)
+
     @property
-    def _wildcard_product(self) -> List[Dict[str, str]]:
-        """Return the values of wildcards per method instance."""
-        # only repeat if there are wildcards on the output
-        wildcards = self.wildcards["repeat"]
-        wc_values = [self.workflow.wildcards.get(wc) for wc in wildcards]
-        # drop None from list of values; this occurs when the workflow is not fully initialized yet
-        wc_values = [v for v in wc_values if v is not None]
-        wc_tuples: List[Tuple] = list(product(*wc_values))
-        wc_product: List[Dict] = [
-            dict(zip(wildcards, list(wc_val))) for wc_val in wc_tuples
-        ]
-        # add reduce wildcards
+    def _reduce_fields(self) -> List[str]:
+        """Return the fields with reduce wildcards."""
+        reduce_fields = []
         for wc in self.wildcards["reduce"]:
-            wc_val = self.workflow.wildcards.get(wc)
-            wc_product = [{**wc_dict, wc: wc_val} for wc_dict in wc_product]
+            reduce_fields.extend(self.wildcard_fields[wc])
+        return list(set(reduce_fields))  # keep unique values
+
+    def _wildcards_reduce(self, wildcards: Dict[str, str | list[str]]) -> List[Dict]:
+        """Return the product of the (reduce) wildcard values."""
+        # make sure all values are a list
+        # then take the product of the lists
+        wc_list = [
+            val if isinstance(val, list) else [val] for val in wildcards.values()
+        ]
+        return [dict(zip(wildcards.keys(), wc)) for wc in list(product(*wc_list))]
 
-        return wc_product
+    @property
+    def _wildcard_product(self) -> List[Dict[str, str]]:
+        """Return the values of wildcards per method instance."""
+        return list(self._method_instances.iter_wildcards())
 
     @property
     def _output_path_refs(self) -> Dict[str, str]:
@@ -316,10 +576,8 @@ class Rule:
 
     def _create_references_for_method_inputs(self):
         """Create references for method inputs based on output paths of previous rules."""
-        # chain all output_path_refs of previous rules together
-        output_path_refs = {}
-        for rule in self.workflow.rules:
-            output_path_refs.update(rule._output_path_refs)
+        # output path references of all previous rules
+        output_path_refs = self.workflow.rules._output_path_refs
         # Check on duplicate output values
         for key, value in self.method.output:
             if not isinstance(value, Path):
@@ -337,18 +595,59 @@ class Rule:
                 continue
             if isinstance(value, Path):
                 value = value.as_posix()
-            if value in list(output_path_refs.keys()):
+            if isinstance(value, str) and value in output_path_refs:
                 self.method.input._refs.update({key: output_path_refs[value]})
 
     def _set_method_instances(self):
-        """Set a list with all instances of the method based on the wildcards."""
-        self._method_instances = []
-        for wildcard_dict in self._wildcard_product:
-            method = self._create_method_instance(wildcard_dict)
-            self._method_instances.append(method)
+        """Set a lazy sequence of all instances of the method based on the wildcards."""
+        # only repeat if there are wildcards on the output
+        repeat = {}
+        for wc in self.wildcards["repeat"]:
+            # skip wildcards without values; this occurs when the workflow is not fully initialized yet
+            values = self.workflow.wildcards.get(wc)
+            if values is not None:
+                repeat[wc] = values
+        reduce = {
+            wc: self.workflow.wildcards.get(wc) for wc in self.wildcards["reduce"]
+        }
+        self._method_instances = MethodInstances(self, repeat, reduce)
+        # create the first method instance to validate the method parameters
+        if len(self._method_instances) > 0:
+            self._method_instances[0]
 
     def _set_input_output(self):
-        """Set the input and output paths dicts of the rule."""
+        """Set the input and output paths dicts of the rule.
+
+        Paths are resolved from the wildcards in the method paths. If this fails,
+        paths are collected from all method instances instead.
+        """
+        try:
+            parameters = self._resolve_input_output()
+        except (KeyError, ValueError, IndexError):
+            parameters = self._collect_input_output()
+        self._input = parameters["input"]
+        self._output = parameters["output"]
+
+    def _resolve_input_output(self) -> Dict[str, Dict[str, List[Path]]]:
+        """Resolve the input and output paths of all method instances from the method paths."""
+        # wildcard values in the same order as these are resolved for method instances
+        wildcards = self._method_instances.wildcards
+        if isinstance(self.method, ExpandMethod):
+            wildcards.update(self.method.expand_wildcards)
+
+        parameters = {"input": {}, "output": {}}
+        for name in parameters:
+            if name == "output" and isinstance(self.method, ExpandMethod):
+                keys = self.method.output.to_dict(filter_types=(Path)).keys()
+            else:
+                keys = getattr(self.method, name).all_fields
+            obj: Parameters = getattr(self.method, name)
+            for key in keys:
+                parameters[name][key] = _resolve_paths(getattr(obj, key), wildcards)
+        return parameters
+
+    def _collect_input_output(self) -> Dict[str, Dict[str, List[Path]]]:
+        """Collect the input and output paths of all method instances."""
         parameters = {"input": {}, "output": {}}
         for method in self._method_instances:
             for name in parameters:
@@ -360,59 +659,170 @@ class Rule:
                 for key, value in inout_dict.items():
                     if key not in parameters[name]:
                         parameters[name][key] = []
-                    if name in ["input", "output"]:
-                        if not isinstance(value, list):
-                            value = [value]
-                        if not isinstance(value[0], Path):
-                            continue
-                        # Removes duplicates
-                        # Using set() does not preserve insertion order, this does and also filters uniques
-                        for val in value:
-                            if val not in parameters[name][key]:
-                                parameters[name][key].append(val)
-                    elif value not in parameters[name][key]:
-                        parameters[name][key].append(value)
-
-        self._input = parameters["input"]
-        self._output = parameters["output"]
+                    if not isinstance(value, list):
+                        value = [value]
+                    if not value or not isinstance(value[0], Path):
+                        continue
+                    # Removes duplicates
+                    # Using set() does not preserve insertion order, this does and also filters uniques
+                    for val in value:
+                        if val not in parameters[name][key]:
+                            parameters[name][key].append(val)
+        return parameters
 
     ## RUN METHODS
-    def run(self, max_workers=1) -> None:
+    def run(
+        self,
+        max_workers=1,
+        executor: Optional[ExecutorType] = None,
+        state: Optional[RunState] = None,
+        cores: Optional[int] = None,
+        mem_mb: Optional[int] = None,
+        keep_going: bool = False,
+    ) -> None:
         """Run the rule.
 
+        The number of concurrent method instances is limited by `max_workers` and
+        by the resources required per method instance (see :py:attr:`resources`)
+        within the available `cores` and `mem_mb`.
+        Failed method instances are retried based on the `retries` and `backoff`
+        of the rule.
+
         Parameters
         ----------
         max_workers : int, optional
             The maximum number of workers to use, by default 1
+        executor : {"threads", "processes", "serial"}, optional
+            The executor to run method instances in parallel,
+            by default None (the default executor of the method).
+            See :py:mod:`hydroflows.workflow.executors`.
+        state : RunState, optional
+            The run state to skip method instances with up-to-date outputs and
+            to record their runs, by default None (run all method instances
+            without recording them), see :py:class:`RunState`.
+        cores : int, optional
+            The number of available CPU cores, by default None (all cores of the machine).
+        mem_mb : int, optional
+            The available memory in MB, by default None (total memory of the machine).
+        keep_going : bool, optional
+            Run all method instances, even if some fail, by default False.
+            If True, a :py:class:`RunError` with a summary of all failed method instances
+            is raised at the end. If False, no new method instances are started after
+            a failure and the error is raised after the running method instances are finished.
         """
-        nruns = self.n_runs
+        executor = check_executor(executor) or self.method.executor
+        cores = cores or machine_cores()
+        mem_mb = mem_mb or machine_memory()
+        max_instances = self.resources.max_instances(cores, mem_mb)
+        max_workers = min(max_workers or max_instances, max_instances)
+        failures: List[Failure] = []
+
+        def _record(i: int, method: Method, **kwargs) -> None:
+            if state is not None:
+                template = self._get_template_hash(i)
+                state.record(self.rule_id, method, template=template, **kwargs)
+
+        def _failed(i: int, method: Method, error: BaseException) -> None:
+            _record(i, method, status="failed")
+            logger.error(f"{self.rule_id} {i + 1}/{self.n_runs} failed: {error}")
+            failures.append(self._failure(i, error))
+
         # set working directory to workflow root
         with cwd(self.workflow.root):
-            if nruns == 1 or max_workers == 1:
-                for i, method in enumerate(self._method_instances):
-                    msg = f"Running {self.rule_id} {i + 1}/{nruns}"
+            methods: List[Tuple[int, Method]] = []
+            for i, method in enumerate(self._method_instances):
+                if state is not None and state.is_up_to_date(self.rule_id, method):
+                    msg = f"Skipping {self.rule_id} {i + 1}/{self.n_runs} (up to date)"
+                    logger.info(msg)
+                    continue
+                methods.append((i, method))
+            nruns = len(methods)
+
+            if nruns == 0:
+                return
+            elif nruns == 1 or max_workers == 1 or executor == "serial":
+                for i, method in methods:
+                    msg = f"Running {self.rule_id} {i + 1}/{self.n_runs}"
                     logger.info(msg)
-                    method.run()
+                    _record(i, method, status="running")
+                    try:
+                        result = run_method(method, **self._get_run_kwargs(i))
+                    except Exception as e:
+                        _failed(i, method, e)
+                        if not keep_going:
+                            raise
+                        continue
+                    _record(i, method, **result)
             else:
-                tqdm_kwargs = {}
-                if max_workers is not None:
-                    tqdm_kwargs.update(max_workers=max_workers)
-                thread_map(
-                    lambda method: method.run(),
-                    self._method_instances,
-                    **tqdm_kwargs,
+                self._run_parallel(
+                    methods, executor, max_workers, _record, _failed, keep_going
                 )
+        if failures:
+            raise RunError(failures)
+
+    def _failure(self, index: int, error: BaseException) -> Failure:
+        """Return the failure of a method instance with its repeat wildcard values."""
+        return Failure(self.rule_id, index, error, self._get_repeat_wildcards(index))
+
+    def _run_parallel(
+        self,
+        methods: List[Tuple[int, Method]],
+        executor: ExecutorType,
+        max_workers: int,
+        record: Callable[..., None],
+        failed: Callable[[int, Method, BaseException], None],
+        keep_going: bool = False,
+    ) -> None:
+        """Run method instances in parallel.
+
+        Method instances are submitted as soon as a worker is available, such that
+        no new method instances are started after a failure, unless `keep_going` is True.
+        """
+        from tqdm import tqdm
+
+        pending = iter(methods)
+        running: Dict[Future, Tuple[int, Method]] = {}
+        error: Optional[BaseException] = None
+        with (
+            create_executor(executor, max_workers) as pool,
+            tqdm(total=len(methods)) as pbar,
+        ):
+            while True:
+                while error is None and len(running) < max_workers:
+                    item = next(pending, None)
+                    if item is None:
+                        break
+                    i, method = item
+                    record(i, method, status="running")
+                    kwargs = self._get_run_kwargs(i)
+                    running[submit_method(pool, executor, method, **kwargs)] = item
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    i, method = running.pop(future)
+                    pbar.update()
+                    if future.exception() is None:
+                        result = collect_result(future.result())
+                        record(i, method, **result)
+                        continue
+                    failed(i, method, future.exception())
+                    if not keep_going and error is None:
+                        # finish running method instances, then raise
+                        error = future.exception()
+        if error is not None:
+            raise error
 
     def dryrun(
         self,
-        input_files: Optional[List[Path]] = None,
+        input_files: Optional[Set[Path] | List[Path]] = None,
         missing_file_error: bool = False,
     ) -> List[Path]:
         """Dryrun the rule.
 
         Parameters
         ----------
-        input_files : List[Path], optional
+        input_files : Set[Path] | List[Path], optional
             The input files to use for the dryrun, by default None
         missing_file_error : bool, optional
             Whether to raise an error if a file is missing, by default False
@@ -422,16 +832,132 @@ class Rule:
         List[Path]
             The output files of the dryrun.
         """
+        output_files, _ = self._dryrun(
+            input_files=input_files, missing_file_error=missing_file_error
+        )
+        return output_files
+
+    def _dryrun(
+        self,
+        input_files: Optional[Set[Path] | List[Path]] = None,
+        missing_file_error: bool = False,
+    ) -> Tuple[List[Path], List[Path]]:
+        """Dryrun the rule and return the output files and missing input files."""
         nruns = self.n_runs
-        input_files = input_files or []
-        output_files = []
+        if not isinstance(input_files, (set, frozenset)):
+            input_files = set(input_files or [])
+        output_files, missing_files = [], []
+        # cache if files exist; the same file is often an input of many instances
+        # missing files are reported only once
+        file_exists: Dict[Path, bool] = {}
         # set working directory to workflow root
         with cwd(self.workflow.root):
-            for i, method in enumerate(self._method_instances):
-                msg = f"Running {self.rule_id} {i + 1}/{nruns}"
-                logger.debug(msg)
-                output_files_i = method.dryrun(
-                    missing_file_error=missing_file_error, input_files=input_files
+            for i, (inputs, outputs) in enumerate(self._get_instance_paths()):
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Running {self.rule_id} {i + 1}/{nruns}")
+                for key, path in inputs:
+                    if path in input_files or path in file_exists:
+                        continue
+                    file_exists[path] = path.is_file()
+                    if not file_exists[path]:
+                        # only report the first occurrence of a missing file
+                        missing_files.append(path)
+                        msg = f"Input file {self.method.name}.input.{key} not found: {path}"
+                        if missing_file_error:
+                            raise FileNotFoundError(msg)
+                        logger.warning(msg)
+                output_files.extend(path for _, path in outputs)
+        return output_files, missing_files
+
+    def _get_instance_paths(self) -> List[Tuple[List, List]]:
+        """Return the input and output key-path tuples per method instance.
+
+        Only single path inputs are returned, similar to :py:meth:`Method.dryrun`.
+        The paths are resolved from the wildcards in the method paths and cached.
+        If this fails, the paths are collected from the method instances instead.
+        """
+        if self._instance_paths is None:
+            try:
+                self._instance_paths = self._resolve_instance_paths()
+            except (KeyError, ValueError, IndexError):
+                self._instance_paths = [
+                    (
+                        [
+                            (key, getattr(method.input, key))
+                            for key in method.input.all_fields
+                            if isinstance(getattr(method.input, key), Path)
+                        ],
+                        method._output_paths,
+                    )
+                    for method in self._method_instances
+                ]
+        return self._instance_paths
+
+    def _resolve_instance_paths(self) -> List[Tuple[List, List]]:
+        """Resolve the input and output key-path tuples per method instance."""
+        reduce_fields = set(
+            chain(*[self.wildcard_fields[wc] for wc in self.wildcards["reduce"]])
+        )
+        inputs = {
+            key: value
+            for key, value in self.method.input.to_dict(filter_types=(Path)).items()
+            if key not in reduce_fields
+        }
+        outputs = self.method.output.to_dict(filter_types=(Path))
+        expand_wildcards = {}
+        if isinstance(self.method, ExpandMethod):
+            expand_wildcards = self.method.expand_wildcards
+        # repeat wildcards with values
+        repeat = [
+            wc
+            for wc in self.wildcards["repeat"]
+            if wc in self._method_instances.wildcards
+        ]
+
+        def _templates(paths: Dict[str, Path], expand: bool = False) -> List[Tuple]:
+            # parse the wildcards of each path once; expand values per path are fixed
+            templates = []
+            for key, path in paths.items():
+                template = WildcardTemplate.parse(path)
+                path_wildcards = set(template.names)
+                if (
+                    path_wildcards
+                    - set(repeat)
+                    - set(expand_wildcards if expand else [])
+                ):
+                    missing = ", ".join(path_wildcards - set(repeat))
+                    raise KeyError(f"Wildcard values missing for: {missing}")
+                expand_values = [{}]
+                if expand:
+                    expand_values = wildcard_product(
+                        {
+                            wc: v
+                            for wc, v in expand_wildcards.items()
+                            if wc in path_wildcards
+                        }
+                    )
+                templates.append((key, template, expand_values))
+            return templates
+
+        def _resolve(templates: List[Tuple], wildcards: Dict[str, str]) -> List[Tuple]:
+            paths = []
+            for key, template, expand_values in templates:
+                if not template.names:
+                    paths.append((key, template.value))
+                    continue
+                for values in expand_values:
+                    paths.append((key, template.fill({**wildcards, **values})))
+            return paths
+
+        input_templates = _templates(inputs)
+        output_templates = _templates(outputs, expand=True)
+        instance_paths = []
+        for wildcards in self._method_instances.iter_wildcards():
+            wildcards = {wc: wildcards[wc] for wc in repeat}
+            instance_paths.append(
+                (
+                    _resolve(input_templates, wildcards),
+                    _resolve(output_templates, wildcards),
                 )
-                output_files.extend(output_files_i)
-        return output_files
+            )
+        return instance_paths
@@ -27,6 +27,12 @@ class Rules:
         self.dependency_map: dict[str, list[str]] = {}
         """Dictionary mapping rule IDs to their dependencies."""
 
+        self._output_paths: dict[str, tuple[str, str]] = {}
+        """Index of output paths of all method instances to (rule ID, output field)."""
+
+        self._output_path_refs: dict[str, str] = {}
+        """Index of output paths of all rule methods to their reference."""
+
         if rules:
             for rule in rules:
                 self.set_rule(rule)
@@ -62,29 +68,28 @@ class Rules:
 
         This method updates dependency_map and returns list with rule_id of dependencies.
         """
-        # Make list of inputs, convert to set of strings for quick matching
-        inputs = rule.input
-        inputs = list(chain(*inputs.values()))
-        # order of inputs doesn't matter here so set() is fine
-        inputs = set([str(item) for item in inputs])
-
-        # Init dependency list
-        dependency_list: list[str] = []
-        for prev_rule in self.ordered_rules:
-            # Make list of outputs as strings, outputs always paths anyways
-            outputs = prev_rule.output
-            outputs = list(chain(*outputs.values()))
-            outputs = [str(item) for item in outputs]
-
-            # Find if inputs, outputs share any element
-            if not inputs.isdisjoint(outputs):
-                dependency_list.append(prev_rule.rule_id)
+        # Find rules which create any of the inputs using the output path index
+        dependencies: set[str] = set()
+        for paths in rule.input.values():
+            for path in paths:
+                output = self._output_paths.get(str(path))
+                if output is not None:
+                    dependencies.add(output[0])
+        # Keep the order of the rules
+        dependency_list = [name for name in self.names if name in dependencies]
 
         # Update dependency_map
         self.dependency_map[rule.rule_id] = dependency_list
 
         return dependency_list
 
+    def _index_rule_outputs(self, rule: Rule) -> None:
+        """Add the output paths of a rule to the output path indices."""
+        for field, paths in rule.output.items():
+            for path in paths:
+                self._output_paths.setdefault(str(path), (rule.rule_id, field))
+        self._output_path_refs.update(rule._output_path_refs)
+
     def _get_new_rule_index(self, rule: Rule) -> int:
         """Determine where the rule should be added in the ordered list of rules."""
         dependencies = self.dependency_map.get(rule.rule_id)
@@ -137,6 +142,7 @@ class Rules:
         setattr(self, key, rule)
         # Detect dependencies and insert rule in correct position
         self._detect_dependencies_rule(rule)
+        self._index_rule_outputs(rule)
         ind = self._get_new_rule_index(rule)
         self.names.insert(ind, key)
         self._sort_repeat_wildcards(ind)
@@ -0,0 +1,303 @@
+"""Run state of a workflow to skip method instances with up-to-date outputs.
+
+The run state is saved in a SQLite database in the workflow root
+(`<root>/.hydroflows/state.db`) with a record per rule and method instance.
+A record contains the hash of the method parameters and of the template method and
+wildcard values it was created from, a stamp (modification time,
+size and optionally the content hash) of its input and output files, the start and
+end time, the status of the last run and the peak memory usage of the process
+while the method instance ran, if no other method instance ran in the same process
+at the same time (see :py:func:`~hydroflows.workflow.executors.run_method`).
+
+A method instance is up to date if all its output files exist, its last run was
+successful and its parameters and input files did not change since.
+As a record is saved as soon as a method instance is finished, a workflow
+resumes where it stopped when it is run again after a crash.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+from pathlib import Path
+from threading import Lock
+from typing import Dict, List, Literal, Optional
+
+from hydroflows.workflow.method import Method
+
+__all__ = ["RunState", "hash_file", "hash_params", "hash_template"]
+
+logger = logging.getLogger(__name__)
+
+STATE_DIR = ".hydroflows"
+
+RunStatus = Literal["running", "success", "failed"]
+
+_COLUMNS = [
+    "rule_id",
+    "key",
+    "params",
+    "inputs",
+    "outputs",
+    "start",
+    "end",
+    "status",
+    "peak_memory",
+    "template",
+]
+
+
+def hash_params(method: Method) -> str:
+    """Return a hash of the method input, output and params."""
+    method_dict = {"name": method.name, **method.to_dict(posix_path=True)}
+    method_str = json.dumps(method_dict, sort_keys=True, default=str)
+    return hashlib.sha256(method_str.encode()).hexdigest()
+
+
+def hash_template(params: str, wildcards: Dict[str, str | List[str]]) -> str:
+    """Return a hash of the template method of a rule and the wildcards of a method instance.
+
+    Method instances are created from the template method of a rule and their wildcard
+    values. The parameters of a method instance did therefore not change if this hash
+    did not change, which can be checked without creating the method instance.
+
+    Parameters
+    ----------
+    params : str
+        The hash of the template method, see :py:func:`hash_params`.
+    wildcards : Dict[str, str | List[str]]
+        The wildcard values of the method instance.
+    """
+    template_str = json.dumps(
+        {"params": params, "wildcards": wildcards}, sort_keys=True
+    )
+    return hashlib.sha256(template_str.encode()).hexdigest()
+
+
+def hash_file(path: Path, chunk_size: int = 2**20) -> str:
+    """Return a hash of the file content."""
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+class RunState:
+    """Run state of the method instances of a workflow.
+
+    Parameters
+    ----------
+    root : Path
+        The workflow root. The state is saved to `<root>/.hydroflows/state.db`.
+    checksum : bool, optional
+        If True, the content hash of input and output files is saved and compared
+        in case the modification time or size of input files changed, by default False.
+    """
+
+    def __init__(self, root: Path, checksum: bool = False) -> None:
+        self.file = Path(root, STATE_DIR, "state.db").resolve()
+        self.checksum = checksum
+        self._lock = Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def __del__(self) -> None:
+        self.close()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Return the database connection; the database is created when first needed."""
+        if self._conn is None:
+            self.file.parent.mkdir(parents=True, exist_ok=True)
+            # the connection is shared by worker threads, writes are guarded by a lock
+            self._conn = sqlite3.connect(self.file, check_same_thread=False)
+            self._conn.row_factory = sqlite3.Row
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS runs ("
+                "rule_id TEXT, key TEXT, params TEXT, inputs TEXT, outputs TEXT, "
+                "start REAL, end REAL, status TEXT, peak_memory INTEGER, "
+                "template TEXT, PRIMARY KEY (rule_id, key))"
+            )
+            columns = [row[1] for row in self._conn.execute("PRAGMA table_info(runs)")]
+            if "template" not in columns:
+                # added to state databases of previous versions
+                self._conn.execute("ALTER TABLE runs ADD COLUMN template TEXT")
+            self._conn.commit()
+        return self._conn
+
+    def close(self) -> None:
+        """Close the database connection."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    @staticmethod
+    def _key(outputs: List[Path]) -> str:
+        """Return a unique key of a method instance based on its output paths."""
+        return "|".join(sorted(path.as_posix() for path in outputs))
+
+    def _stamp(self, path: Path) -> Optional[Dict]:
+        """Return the stamp of a file or None if it does not exist."""
+        if not path.exists():
+            return None
+        stat = path.stat()
+        stamp = {"mtime": stat.st_mtime_ns, "size": stat.st_size}
+        if self.checksum and path.is_file():
+            stamp["sha256"] = hash_file(path)
+        return stamp
+
+    def _input_changed(self, path: Path | str, stamp: Optional[Dict]) -> bool:
+        """Check if an input file changed compared to its recorded stamp."""
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return stamp is not None
+        if stamp is None:
+            return True
+        if stat.st_mtime_ns == stamp["mtime"] and stat.st_size == stamp["size"]:
+            return False
+        # modified, but the content might be the same
+        if self.checksum and "sha256" in stamp and os.path.isfile(path):
+            return hash_file(path) != stamp["sha256"]
+        return True
+
+    def get(self, rule_id: str, method: Method) -> Optional[Dict]:
+        """Get the record of the last run of a method instance."""
+        if not self.file.is_file():
+            return None
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT * FROM runs WHERE rule_id = ? AND key = ?",
+                (rule_id, self._key([path for _, path in method._output_paths])),
+            ).fetchone()
+        return None if row is None else self._to_dict(row)
+
+    def runs(self, rule_id: Optional[str] = None) -> List[Dict]:
+        """Get the records of all method instances, optionally for a single rule."""
+        if not self.file.is_file():
+            return []
+        query, args = "SELECT * FROM runs", ()
+        if rule_id is not None:
+            query, args = query + " WHERE rule_id = ?", (rule_id,)
+        with self._lock:
+            rows = self.conn.execute(query + " ORDER BY start", args).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def records(self, rule_id: str) -> Dict[str, Dict]:
+        """Get the records of all method instances of a rule by key."""
+        return {record["key"]: record for record in self.runs(rule_id)}
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict:
+        record = dict(row)
+        record["inputs"] = json.loads(record["inputs"])
+        record["outputs"] = json.loads(record["outputs"])
+        return record
+
+    def is_up_to_date(self, rule_id: str, method: Method) -> bool:
+        """Check if the outputs of a method instance are up to date.
+
+        Parameters
+        ----------
+        rule_id : str
+            The rule ID of the method instance.
+        method : Method
+            The method instance.
+
+        Returns
+        -------
+        bool
+            True if all outputs exist, the last run was successful and
+            the parameters and inputs did not change since.
+        """
+        outputs = [path for _, path in method._output_paths]
+        if not outputs or not all(path.is_file() for path in outputs):
+            return False
+        record = self.get(rule_id, method)
+        if not self.is_current(record):
+            return False
+        if record["params"] != hash_params(method):
+            return False
+        inputs = {path.as_posix() for _, path in method._input_paths}
+        return inputs == set(record["inputs"])
+
+    def is_current(self, record: Optional[Dict]) -> bool:
+        """Check if a record is of a successful run of which the inputs did not change.
+
+        This check does not require the method instance; whether its outputs exist and
+        its parameters did not change, e.g. based on the recorded template hash
+        (see :py:func:`hash_template`), should be checked separately.
+        """
+        if record is None or record["status"] != "success":
+            return False
+        for key, stamp in record["inputs"].items():
+            if self._input_changed(key, stamp):
+                return False
+        return True
+
+    def record(
+        self,
+        rule_id: str,
+        method: Method,
+        status: RunStatus = "success",
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        peak_memory: Optional[int] = None,
+        template: Optional[str] = None,
+    ) -> None:
+        """Record the run of a method instance.
+
+        Successful runs are only recorded if all output files exist,
+        e.g. not if the method is mocked.
+
+        Parameters
+        ----------
+        rule_id : str
+            The rule ID of the method instance.
+        method : Method
+            The method instance.
+        status : {"running", "success", "failed"}, optional
+            The status of the run, by default "success".
+        start, end : float, optional
+            The start and end time of the run in seconds since the epoch.
+        peak_memory : int, optional
+            The peak memory usage of the process which ran the method instance in bytes.
+        template : str, optional
+            The hash of the template method and wildcards of the method instance,
+            see :py:func:`hash_template`.
+        """
+        outputs = method._output_paths
+        if status == "success" and not all(path.is_file() for _, path in outputs):
+            return
+        key = self._key([path for _, path in outputs])
+        if status == "running":
+            start = time.time() if start is None else start
+            inputs, outputs = {}, {}
+        else:
+            end = time.time() if end is None else end
+            inputs = {
+                path.as_posix(): self._stamp(path) for _, path in method._input_paths
+            }
+            outputs = {path.as_posix(): self._stamp(path) for _, path in outputs}
+        values = (
+            rule_id,
+            key,
+            hash_params(method),
+            json.dumps(inputs),
+            json.dumps(outputs),
+            start,
+            end,
+            status,
+            peak_memory,
+            template,
+        )
+        columns = ", ".join(_COLUMNS)
+        placeholders = ", ".join(["?"] * len(_COLUMNS))
+        with self._lock:
+            self.conn.execute(
+                f"INSERT OR REPLACE INTO runs ({columns}) VALUES ({placeholders})",
+                values,
+            )
+            self.conn.commit()
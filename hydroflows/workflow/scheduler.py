@@ -0,0 +1,356 @@
+"""HydroFlows Scheduler class.
+
+This class is responsible for:
+- mapping dependencies between individual method instances of a workflow.
+- dispatching method instances as soon as their upstream instances are finished.
+- limiting the number of concurrent method instances over all rules.
+- packing method instances within the CPU cores and memory of the machine.
+- skipping method instances with up-to-date outputs.
+- collecting failed method instances to continue with independent method instances.
+"""
+
+import heapq
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from contextlib import ExitStack
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
+
+from hydroflows.workflow.executors import (
+    ExecutorType,
+    check_executor,
+    collect_result,
+    create_executor,
+    submit_method,
+)
+from hydroflows.workflow.failures import Failure, RunError
+from hydroflows.workflow.method import Method
+from hydroflows.workflow.resources import Resources, machine_cores, machine_memory
+from hydroflows.workflow.run_state import RunState
+from hydroflows.workflow.tracing import get_tracer
+
+if TYPE_CHECKING:
+    from hydroflows.workflow.rule import Rule
+    from hydroflows.workflow.rules import Rules
+
+__all__ = ["Scheduler"]
+
+logger = logging.getLogger(__name__)
+
+
+class Job:
+    """A single method instance of a rule to be run by the scheduler."""
+
+    def __init__(
+        self,
+        rule: "Rule",
+        index: int,
+        method: Method,
+        executor: ExecutorType,
+        resources: Optional[Resources] = None,
+    ) -> None:
+        self.rule = rule
+        self.index = index
+        self.method = method
+        self.executor = executor
+        self.resources = resources or Resources()
+        """Resources required to run the job."""
+        self.ready: Optional[float] = None
+        """Time at which all upstream jobs of the job are finished."""
+        self.start: Optional[float] = None
+        """Time at which the job is submitted."""
+        self.upstream: Set["Job"] = set()
+        """Jobs which should be finished before this job can start."""
+        self.downstream: List["Job"] = []
+        """Jobs which depend on this job."""
+
+    def __repr__(self) -> str:
+        return f"Job({self.name})"
+
+    @property
+    def name(self) -> str:
+        """Return the name of the job."""
+        return f"{self.rule.rule_id} {self.index + 1}/{self.rule.n_runs}"
+
+    def submit(self, executor: Executor) -> Future:
+        """Submit the method instance to the executor.
+
+        The future returns the start time, end time and peak memory usage of the run,
+        see :py:func:`run_method`.
+        """
+        logger.info(f"Running {self.name}")
+        self.start = time.time()
+        kwargs = self.rule._get_run_kwargs(self.index)
+        tracer = get_tracer()
+        if tracer is not None and self.ready is not None:
+            # time waiting for a worker or resources
+            args = kwargs["trace"]
+            tracer.add("queued", self.ready, self.start, category="scheduler", **args)
+        return submit_method(executor, self.executor, self.method, **kwargs)
+
+
+class Scheduler:
+    """Dependency-aware scheduler for the method instances of a workflow.
+
+    Dependencies between method instances are derived from the rule dependencies
+    (see :py:attr:`Rules.dependency_map`) and the input and output paths of each
+    method instance. A method instance is dispatched as soon as all method instances
+    that produce its input files are finished. If none of its input paths matches an
+    output path of an upstream rule, it waits for all method instances of that rule.
+    The number of concurrently running
+    method instances over all rules is limited by `max_workers`.
+
+    Method instances are packed within the available CPU cores and memory based on the
+    resources required per method instance, see :py:attr:`Rule.resources`.
+    Method instances with heavy I/O are not run concurrently. A method instance which
+    requires more resources than available is only started if no other method instances
+    are running.
+
+    Each method instance is run with the executor of its method (see :py:attr:`Method.executor`),
+    unless an executor is set for all method instances.
+
+    If a run state is provided, method instances with up-to-date outputs are skipped,
+    see :py:class:`RunState`. Whether a method instance is up to date is checked
+    after its upstream method instances are finished.
+    """
+
+    def __init__(
+        self,
+        rules: "Rules",
+        max_workers: int = 1,
+        executor: Optional[ExecutorType] = None,
+        state: Optional[RunState] = None,
+        force_rules: Optional[List[str]] = None,
+        cores: Optional[int] = None,
+        mem_mb: Optional[int] = None,
+        keep_going: bool = False,
+    ) -> None:
+        """Create a scheduler instance.
+
+        Parameters
+        ----------
+        rules : Rules
+            The rules of the workflow.
+        max_workers : int, optional
+            The maximum number of method instances to run concurrently, by default 1.
+        executor : {"threads", "processes", "serial"}, optional
+            The executor for all method instances, by default None
+            (the default executor of each method).
+        state : RunState, optional
+            The run state to skip method instances with up-to-date outputs and
+            to record successful runs, by default None (run all method instances).
+        force_rules : List[str], optional
+            Rule IDs of which all method instances are run, even if up to date.
+        cores : int, optional
+            The number of CPU cores available to all method instances,
+            by default None (all cores of the machine).
+        mem_mb : int, optional
+            The memory in MB available to all method instances,
+            by default None (total memory of the machine or unlimited if unknown).
+        keep_going : bool, optional
+            Continue with method instances which do not depend on failed method instances,
+            by default False.
+        """
+        if max_workers is not None and max_workers < 1:
+            raise ValueError("max_workers should be a positive integer.")
+        self.rules = rules
+        self.max_workers: int = max_workers or 1
+        self.executor: Optional[ExecutorType] = check_executor(executor)
+        self.state = state
+        self.force_rules: List[str] = force_rules or []
+        if (cores is not None and cores < 1) or (mem_mb is not None and mem_mb < 1):
+            raise ValueError("cores and mem_mb should be positive integers.")
+        self.cores: int = cores or machine_cores()
+        self.mem_mb: Optional[int] = mem_mb or machine_memory()
+        self.keep_going = keep_going
+        for rule_id in self.force_rules:
+            if rule_id not in rules.names:
+                raise ValueError(f"Rule {rule_id} not found.")
+        self._jobs: List[Job] = []
+        self._set_jobs()
+
+    @property
+    def jobs(self) -> List[Job]:
+        """Return a list of all jobs in rule order."""
+        return self._jobs
+
+    def _set_jobs(self) -> None:
+        """Create jobs for all method instances and map their dependencies."""
+        # map output paths to the jobs that create them, per rule
+        output_jobs: Dict[str, Dict[Path, Job]] = {}
+        rule_jobs: Dict[str, List[Job]] = {}
+        for rule in self.rules:
+            output_jobs[rule.rule_id] = {}
+            rule_jobs[rule.rule_id] = []
+            executor = self.executor or rule.method.executor
+            resources = rule.resources
+            for i, method in enumerate(rule.method_instances):
+                job = Job(rule, i, method, executor, resources)
+                for _, path in method._output_paths:
+                    output_jobs[rule.rule_id][path] = job
+                rule_jobs[rule.rule_id].append(job)
+                # only jobs of rules this rule depends on can be upstream jobs
+                for dep in self.rules.dependency_map[rule.rule_id]:
+                    upstream_jobs = set()
+                    for _, path in method._input_paths:
+                        upstream_job = output_jobs[dep].get(path)
+                        if upstream_job is not None:
+                            upstream_jobs.add(upstream_job)
+                    # if no input path matches an output path exactly (e.g. paths
+                    # with a different spelling), wait for all jobs of the rule
+                    job.upstream.update(upstream_jobs or rule_jobs[dep])
+                for upstream_job in job.upstream:
+                    upstream_job.downstream.append(job)
+                self._jobs.append(job)
+
+    def run(self) -> None:
+        """Run all jobs.
+
+        Jobs are started in rule order as soon as all upstream jobs are finished
+        and the resources they require are available.
+        Jobs with up-to-date outputs are skipped.
+        Failed jobs are retried based on the `retries` and `backoff` of their rule.
+        If a job fails, no new jobs are started and the exception is raised
+        after the running jobs are finished. With `keep_going`, all jobs which do not
+        depend on failed jobs are run and a :py:class:`RunError` with a summary of
+        the failed jobs is raised at the end.
+        """
+        # keep track of the number of unfinished upstream jobs per job
+        n_upstream = {job: len(job.upstream) for job in self._jobs}
+        order = {job: i for i, job in enumerate(self._jobs)}
+        ready: List[Tuple[int, Job]] = [
+            (order[job], job) for job in self._jobs if n_upstream[job] == 0
+        ]
+        heapq.heapify(ready)
+        # jobs which are not up to date wait per rule for a worker and resources;
+        # all jobs of a rule require the same resources
+        queued: Dict[str, List[Tuple[int, Job]]] = {
+            name: [] for name in self.rules.names
+        }
+        running: Dict[Future, Job] = {}
+        finished: Set[Job] = set()
+        failures: List[Failure] = []
+        used = {"cores": 0, "mem_mb": 0, "heavy_io": 0}
+        njobs, ndone = len(self._jobs), 0
+        with ExitStack() as stack:
+            # executors are created when first needed and shut down at exit
+            executors: Dict[str, Executor] = {}
+            while ready or running or any(queued.values()):
+                # skip up-to-date jobs, queue the others
+                while ready:
+                    item = heapq.heappop(ready)
+                    job = item[1]
+                    if self._is_up_to_date(job):
+                        logger.info(f"Skipping {job.name} (up to date)")
+                        ndone += 1
+                        finished.add(job)
+                        for downstream_job in self._finish(job, n_upstream):
+                            heapq.heappush(
+                                ready, (order[downstream_job], downstream_job)
+                            )
+                        continue
+                    job.ready = time.time()
+                    heapq.heappush(queued[job.rule.rule_id], item)
+                # dispatch queued jobs in rule order until all workers are busy
+                # or the resources required by the next job of each rule are in use
+                for rule_queue in queued.values():
+                    while rule_queue and len(running) < self.max_workers:
+                        job = rule_queue[0][1]
+                        if running and not self._fits(job.resources, used):
+                            break
+                        heapq.heappop(rule_queue)
+                        if job.executor not in executors:
+                            executors[job.executor] = stack.enter_context(
+                                create_executor(job.executor, self.max_workers)
+                            )
+                        self._record(job, status="running")
+                        running[job.submit(executors[job.executor])] = job
+                        self._claim(job.resources, used)
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job = running.pop(future)
+                    self._claim(job.resources, used, release=True)
+                    finished.add(job)
+                    if future.exception() is not None and self.keep_going:
+                        # downstream jobs are never ready
+                        self._record(job, status="failed")
+                        logger.error(f"{job.name} failed: {future.exception()}")
+                        failures.append(
+                            job.rule._failure(job.index, future.exception())
+                        )
+                        continue
+                    elif future.exception() is not None:
+                        # wait for running jobs, then raise
+                        self._record(job, status="failed")
+                        for other_future in wait(running).done:
+                            self._record(running[other_future], other_future)
+                        logger.error(f"{job.name} failed.")
+                        raise future.exception()
+                    ndone += 1
+                    logger.debug(f"Finished {job.name} ({ndone}/{njobs} jobs)")
+                    self._record(job, future)
+                    for downstream_job in self._finish(job, n_upstream):
+                        heapq.heappush(ready, (order[downstream_job], downstream_job))
+        if failures:
+            skipped: Dict[str, int] = {}
+            for job in self._jobs:
+                if job not in finished:
+                    skipped[job.rule.rule_id] = skipped.get(job.rule.rule_id, 0) + 1
+            raise RunError(failures, skipped)
+
+    def _fits(self, resources: Resources, used: Dict[str, int]) -> bool:
+        """Check if the resources of a job are available next to the resources in use."""
+        if resources.heavy_io and used["heavy_io"]:
+            return False
+        if used["cores"] + resources.cores > self.cores:
+            return False
+        if self.mem_mb and used["mem_mb"] + resources.mem_mb > self.mem_mb:
+            return False
+        return True
+
+    @staticmethod
+    def _claim(
+        resources: Resources, used: Dict[str, int], release: bool = False
+    ) -> None:
+        """Add the resources of a job to the resources in use, or remove them if released."""
+        sign = -1 if release else 1
+        used["cores"] += sign * resources.cores
+        used["mem_mb"] += sign * resources.mem_mb
+        used["heavy_io"] += sign * int(resources.heavy_io)
+
+    def _is_up_to_date(self, job: Job) -> bool:
+        """Check if the outputs of a job are up to date."""
+        if self.state is None or job.rule.rule_id in self.force_rules:
+            return False
+        return self.state.is_up_to_date(job.rule.rule_id, job.method)
+
+    def _record(
+        self, job: Job, future: Optional[Future] = None, status: str = "success"
+    ) -> None:
+        """Record the status of a job in the run state."""
+        kwargs = {"start": job.start}
+        if future is not None:
+            if future.exception() is not None:
+                status = "failed"
+            else:
+                # spans of worker processes are added to the tracer
+                kwargs.update(collect_result(future.result()))
+        if self.state is None:
+            return
+        template = job.rule._get_template_hash(job.index)
+        self.state.record(
+            job.rule.rule_id, job.method, status=status, template=template, **kwargs
+        )
+
+    @staticmethod
+    def _finish(job: Job, n_upstream: Dict[Job, int]) -> List[Job]:
+        """Update the number of unfinished upstream jobs and return the ready downstream jobs."""
+        ready = []
+        for downstream_job in job.downstream:
+            n_upstream[downstream_job] -= 1
+            if n_upstream[downstream_job] == 0:
+                ready.append(downstream_job)
+        return ready
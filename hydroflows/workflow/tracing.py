@@ -0,0 +1,221 @@
+"""Tracing of the method instances of a workflow run.
+
+A :py:class:`Tracer` records spans with the start time and duration of the phases of
+:py:meth:`Method.run` (checking the input and output paths, running the method and
+checking the output) per method instance, together with the rule, wildcard values,
+worker and the size of the input and output files. The scheduler adds the time a method
+instance waited for a worker or resources. The spans can be saved as Chrome trace-event
+JSON, which can be loaded in a trace viewer (e.g. https://ui.perfetto.dev or
+chrome://tracing), and summarized per rule.
+
+Spans are only recorded while a tracer is active, e.g.
+
+.. code-block:: python
+
+    with Tracer() as tracer:
+        workflow.run(max_workers=4)
+    tracer.to_json("trace.json")
+    print(tracer.summary())
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, Generator, List, Optional
+
+__all__ = ["Tracer", "get_tracer", "span", "trace_context"]
+
+# the active tracer is shared by all threads of the process
+_tracer: Optional["Tracer"] = None
+# span arguments (rule, run, wildcards) of the method instance run in the current thread
+_context: ContextVar[Optional[Dict[str, Any]]] = ContextVar(
+    "trace_context", default=None
+)
+
+
+def get_tracer() -> Optional["Tracer"]:
+    """Return the active tracer or None if tracing is not active."""
+    return _tracer
+
+
+@contextmanager
+def trace_context(args: Optional[Dict[str, Any]]) -> Generator[None, None, None]:
+    """Add arguments, e.g. the rule and wildcard values, to all spans within the context."""
+    if not args:
+        yield
+        return
+    token = _context.set({**(_context.get() or {}), **args})
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+@contextmanager
+def span(name: str, **args) -> Generator[Dict[str, Any], None, None]:
+    """Record a span with the active tracer; does nothing if tracing is not active.
+
+    Yields a dictionary to which arguments can be added within the span.
+    """
+    tracer = get_tracer()
+    args = {**(_context.get() or {}), **args}
+    if tracer is None:
+        yield args
+        return
+    start = time.time()
+    try:
+        yield args
+    finally:
+        tracer.add(name, start, time.time(), **args)
+
+
+class Tracer:
+    """Recorder of spans, see :py:mod:`hydroflows.workflow.tracing`."""
+
+    def __init__(self) -> None:
+        self.events: List[Dict[str, Any]] = []
+        """Recorded spans as Chrome trace complete events."""
+        self._threads: Dict[tuple, str] = {}
+        self._lock = threading.Lock()
+        self._previous: Optional["Tracer"] = None
+
+    def __enter__(self) -> "Tracer":
+        global _tracer
+        self._previous, _tracer = _tracer, self
+        return self
+
+    def __exit__(self, *args) -> None:
+        global _tracer
+        _tracer = self._previous
+
+    def add(
+        self,
+        name: str,
+        start: float,
+        end: float,
+        category: str = "method",
+        **args,
+    ) -> None:
+        """Add a span.
+
+        Parameters
+        ----------
+        name : str
+            The name of the span.
+        start, end : float
+            The start and end time of the span in seconds since the epoch.
+        category : str, optional
+            The category of the span, by default "method".
+        **args
+            Arguments of the span, e.g. the rule and wildcard values.
+        """
+        thread = threading.current_thread()
+        pid, tid = os.getpid(), threading.get_native_id()
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": round(start * 1e6),
+            "dur": round((end - start) * 1e6),
+            "pid": pid,
+            "tid": tid,
+            "args": args,
+        }
+        with self._lock:
+            self._threads.setdefault((pid, tid), thread.name)
+            self.events.append(event)
+
+    def extend(self, events: List[Dict[str, Any]]) -> None:
+        """Add spans recorded by a tracer in another (worker) process."""
+        with self._lock:
+            for event in events:
+                self._threads.setdefault((event["pid"], event["tid"]), "worker")
+            self.events.extend(events)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the spans in Chrome trace-event format."""
+        with self._lock:
+            events = sorted(self.events, key=lambda e: e["ts"])
+            threads = dict(self._threads)
+        # name the worker threads
+        for (pid, tid), name in threads.items():
+            events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": pid,
+                    "tid": tid,
+                    "args": {"name": name},
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def to_json(self, file: Path | str) -> None:
+        """Save the spans as Chrome trace-event JSON file."""
+        file = Path(file)
+        file.parent.mkdir(parents=True, exist_ok=True)
+        with open(file, "w") as f:
+            json.dump(self.to_dict(), f, default=str)
+
+    def summary(self) -> str:
+        """Return a summary table with the run time of method instances per rule.
+
+        The table contains the number of traced runs, the total, mean and maximum run time,
+        the mean time waiting for a worker or resources, the size of the input and output
+        files and the wildcard values of the slowest run (straggler) per rule.
+        """
+        rules: Dict[str, Dict[str, Any]] = {}
+        for event in self.events:
+            args = event["args"]
+            if "rule" not in args:
+                continue
+            stats = rules.setdefault(
+                args["rule"],
+                {"runs": [], "queued": [], "read": 0, "written": 0, "slowest": None},
+            )
+            dur = event["dur"] / 1e6
+            if event["name"] == "queued":
+                stats["queued"].append(dur)
+            elif event["name"] == "run":
+                stats["runs"].append(dur)
+                stats["read"] += args.get("bytes_read", 0)
+                stats["written"] += args.get("bytes_written", 0)
+                if dur >= max(stats["runs"]):
+                    stats["slowest"] = args.get("wildcards") or args.get("run")
+        header = (
+            "rule",
+            "runs",
+            "total [s]",
+            "mean [s]",
+            "max [s]",
+            "queued [s]",
+            "read [MB]",
+            "written [MB]",
+            "slowest",
+        )
+        rows = [header]
+        for rule_id, stats in rules.items():
+            runs, queued = stats["runs"], stats["queued"]
+            slowest = stats["slowest"]
+            if isinstance(slowest, dict):
+                slowest = ", ".join(f"{k}={v}" for k, v in slowest.items())
+            rows.append(
+                (
+                    rule_id,
+                    str(len(runs)),
+                    f"{sum(runs):.2f}",
+                    f"{sum(runs) / len(runs):.2f}" if runs else "-",
+                    f"{max(runs):.2f}" if runs else "-",
+                    f"{sum(queued) / len(queued):.2f}" if queued else "-",
+                    f"{stats['read'] / 2**20:.1f}",
+                    f"{stats['written'] / 2**20:.1f}",
+                    str(slowest or ""),
+                )
+            )
+        widths = [max(len(row[i]) for row in rows) for i in range(len(header))]
+        lines = ["  ".join(v.ljust(w) for v, w in zip(row, widths)) for row in rows]
+        return "\n".join(line.rstrip() for line in lines)
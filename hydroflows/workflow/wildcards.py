@@ -1,13 +1,14 @@
 """Workflow wildcards module."""
 
 import itertools
+import re
+from functools import lru_cache
 from logging import getLogger
 from pathlib import Path
+from typing import Dict, List, Tuple
 
 from pydantic import BaseModel
 
-from hydroflows.utils.parsers import get_wildcards
-
 logger = getLogger(__name__)
 
 
@@ -73,6 +74,87 @@ def wildcard_product(wildcards: dict[str, list[str]]) -> list[dict[str, str]]:
     ]
 
 
+# split a string in literal segments and wildcard names
+_SPLIT_PATTERN = re.compile(r"\{(.*?)\}")
+
+
+class WildcardTemplate:
+    """A string or path with wildcards, parsed once into literal and wildcard segments.
+
+    Templates are cached per string or path, use :py:meth:`parse` to create one.
+    """
+
+    __slots__ = ("value", "is_path", "names", "_parts", "_slots")
+
+    def __init__(self, value: str | Path) -> None:
+        self.value = value
+        """The string or path with wildcards."""
+        self.is_path = isinstance(value, Path)
+        """Whether the filled template should be a path."""
+        s = value.as_posix() if self.is_path else str(value)
+        # odd items are wildcard names, even items are literal segments
+        parts = _SPLIT_PATTERN.split(s)
+        slots = [(i, parts[i].strip("{}")) for i in range(1, len(parts), 2)]
+        self._parts: List[str] = parts
+        self._slots: Tuple[Tuple[int, str], ...] = tuple(slots)
+        self.names: Tuple[str, ...] = tuple(dict.fromkeys(name for _, name in slots))
+        """The unique wildcard names in order of appearance."""
+
+    def __repr__(self) -> str:
+        return f"WildcardTemplate({self.value!r})"
+
+    @staticmethod
+    @lru_cache(maxsize=2**14)
+    def parse(value: str | Path) -> "WildcardTemplate":
+        """Return the (cached) template of a string or path."""
+        return WildcardTemplate(value)
+
+    def _check(self, wildcards: Dict) -> None:
+        missing = [name for name in self.names if name not in wildcards]
+        if missing:
+            raise KeyError(f"Wildcard values missing for: {', '.join(missing)}")
+
+    def _fill(self, wildcards: Dict[str, str]) -> str | Path:
+        parts = self._parts.copy()
+        for i, name in self._slots:
+            parts[i] = str(wildcards[name])
+        s = "".join(parts)
+        return Path(s) if self.is_path else s
+
+    def fill(self, wildcards: Dict[str, str]) -> str | Path:
+        """Fill the wildcards with a single value per wildcard.
+
+        Parameters
+        ----------
+        wildcards : Dict[str, str]
+            The wildcard values, wildcards which are not in the template are ignored.
+        """
+        if not self._slots:
+            return self.value
+        self._check(wildcards)
+        return self._fill(wildcards)
+
+    def expand(self, wildcards: Dict[str, List[str]]) -> List[str | Path]:
+        """Fill the wildcards for the product of the wildcard values.
+
+        The product is taken in the order of the wildcards dictionary, the same as
+        :py:func:`wildcard_product`; wildcards which are not in the template are ignored.
+
+        Parameters
+        ----------
+        wildcards : Dict[str, List[str]]
+            The wildcard values.
+        """
+        if not self._slots:
+            return [self.value]
+        self._check(wildcards)
+        names = [wc for wc in wildcards if wc in self.names]
+        return [
+            self._fill(dict(zip(names, values)))
+            for values in itertools.product(*[wildcards[wc] for wc in names])
+        ]
+
+
 def resolve_wildcards(
     s: str | Path, wildcards: dict[str, list[str] | str]
 ) -> list[str | Path] | str | Path:
@@ -87,36 +169,14 @@ def resolve_wildcards(
     wildcards : dict[str, list[str]]
         The dictionary of wildcards and values.
     """
-    # keep only wildcards in the string
-    wildcards_in_string = get_wildcards(s)
-
-    if not wildcards_in_string:
+    template = WildcardTemplate.parse(s)
+    if not template.names:
         return s
-
-    is_path = False
-    if isinstance(s, Path):
-        is_path = True
-        s = s.as_posix()
-
-    # check if all wildcards are in the wildcards dict
-    missing_wildcards = set(wildcards_in_string) - set(wildcards.keys())
-    if missing_wildcards:
-        missing_wildcards_str = ", ".join(missing_wildcards)
-        raise KeyError(f"Wildcard values missing for: {missing_wildcards_str}")
-
-    wildcards = {k: v for k, v in wildcards.items() if k in wildcards_in_string}
-    single_value = all(isinstance(v, str) for v in wildcards.values())
+    template._check(wildcards)
+    wildcards = {k: v for k, v in wildcards.items() if k in template.names}
+    if all(isinstance(v, str) for v in wildcards.values()):
+        return template._fill(wildcards)
     # make sure values are lists
-    wildcards = {k: v if isinstance(v, list) else [v] for k, v in wildcards.items()}
-
-    resolved_strings = []
-    for wc in wildcard_product(wildcards):
-        resolved_strings.append(s.format(**wc))
-
-    if is_path:
-        resolved_strings = [Path(p) for p in resolved_strings]
-
-    if single_value:
-        return resolved_strings[0]
-    else:
-        return resolved_strings
+    return template.expand(
+        {k: v if isinstance(v, list) else [v] for k, v in wildcards.items()}
+    )
@@ -8,27 +8,32 @@ This class is responsible for:
 """
 
 import logging
-from copy import deepcopy
+from contextlib import nullcontext
 from pathlib import Path
 from pprint import pformat
 from shutil import copy
-from typing import Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Union
 
-import graphviz
 import yaml
-from jinja2 import Environment, PackageLoader
 
 from hydroflows import __version__
-from hydroflows.templates import TEMPLATE_DIR
-from hydroflows.templates.jinja_cwl_rule import JinjaCWLRule, JinjaCWLWorkflow
-from hydroflows.templates.jinja_snake_rule import JinjaSnakeRule
+from hydroflows.utils.path_utils import cwd
+from hydroflows.workflow.dryrun import DryrunReport
+from hydroflows.workflow.executors import ExecutorType
 from hydroflows.workflow.method import ExpandMethod, Method, ReduceMethod
+from hydroflows.workflow.profiling import profiling
 from hydroflows.workflow.reference import Ref
 from hydroflows.workflow.rule import Rule
 from hydroflows.workflow.rules import Rules
+from hydroflows.workflow.run_state import RunState, hash_params
+from hydroflows.workflow.scheduler import Scheduler
+from hydroflows.workflow.tracing import Tracer
 from hydroflows.workflow.wildcards import Wildcards
 from hydroflows.workflow.workflow_config import WorkflowConfig
 
+if TYPE_CHECKING:
+    import graphviz
+
 logger = logging.getLogger(__name__)
 
 
@@ -83,7 +88,16 @@ class Workflow:
         self._root = Path(root)
         self._root.mkdir(parents=True, exist_ok=True)
 
-    def create_rule(self, method: Method, rule_id: Optional[str] = None) -> Rule:
+    def create_rule(
+        self,
+        method: Method,
+        rule_id: Optional[str] = None,
+        resources: Optional[Dict] = None,
+        retries: int = 0,
+        backoff: float = 1.0,
+        timeout: Optional[float] = None,
+        group: Optional[str] = None,
+    ) -> Rule:
         """Create a rule based on a method.
 
         Parameters
@@ -92,13 +106,42 @@ class Workflow:
             The method to create the rule from.
         rule_id : str, optional
             The rule id, by default None.
+        resources : Dict, optional
+            Resources required to run a single method instance, e.g. {"cores": 4},
+            by default None (the resources of the method, see :py:attr:`Method.resources`).
+        retries : int, optional
+            The number of times a failed method instance is retried, by default 0.
+        backoff : float, optional
+            The delay in seconds before the first retry, which is doubled for each
+            next retry, by default 1.0.
+        timeout : float, optional
+            The maximum wall-clock time in seconds of external programs called by a
+            method instance, by default None (no timeout).
+        group : str, optional
+            The name of a group of rules of which the jobs are run together when exported
+            to Snakemake, e.g. to run a model and its post-processing on the same node,
+            by default None.
         """
-        rule = Rule(method, self, rule_id)
+        rule = Rule(
+            method,
+            self,
+            rule_id,
+            resources=resources,
+            retries=retries,
+            backoff=backoff,
+            timeout=timeout,
+            group=group,
+        )
         self.rules.set_rule(rule)
         return rule
 
     def create_rule_from_kwargs(
-        self, method: str, kwargs: Dict[str, str], rule_id: Optional[str] = None
+        self,
+        method: str,
+        kwargs: Dict[str, str],
+        rule_id: Optional[str] = None,
+        resources: Optional[Dict] = None,
+        **rule_kwargs,
     ) -> None:
         """Add a rule for method 'name' with keyword-arguments 'kwargs'.
 
@@ -110,6 +153,10 @@ class Workflow:
             The keyword arguments for the method.
         rule_id : str, optional
             The rule id, by default None.
+        resources : Dict, optional
+            Resources required to run a single method instance, by default None.
+        **rule_kwargs
+            The retries, backoff, timeout and group of the rule, see :py:meth:`create_rule`.
         """
         # resolve references
         for key, value in kwargs.items():
@@ -117,7 +164,7 @@ class Workflow:
                 kwargs[key] = self.get_ref(value)
         # instantiate the method and add the rule
         m = Method.from_kwargs(str(method), **kwargs)
-        self.create_rule(m, rule_id)
+        self.create_rule(m, rule_id, resources=resources, **rule_kwargs)
 
     def get_ref(self, ref: str) -> Ref:
         """Get a cross-reference to previously set rule parameters or workflow config."""
@@ -147,6 +194,9 @@ class Workflow:
         self,
         snakefile: str = "Snakefile",
         dryrun: bool = False,
+        batch_rules: Optional[List[str]] = None,
+        benchmark: bool = False,
+        batch_jobs: int = 1,
     ) -> None:
         """Save the workflow to a snakemake workflow.
 
@@ -156,10 +206,53 @@ class Workflow:
             The snakefile filename, by default "Snakefile".
         dryrun : bool, optional
             Run the workflow in dryrun mode, by default False.
+        batch_rules : List[str], optional
+            IDs of rules with repeat wildcards of which all method instances are run
+            with one snakemake job, by default None. The method instances of these rules
+            are saved to a manifest file in the ``<snakefile>.batch`` directory, which is
+            run with ``hydroflows method --batch``. This avoids starting a new
+            interpreter for each (short) method instance. A batch job fails if the
+            snakemake config changed since the manifest was written.
+        benchmark : bool, optional
+            Add a ``benchmark`` directive to each rule to record the run time and memory
+            usage of each job in ``benchmarks/<rule_id>/<wildcards>.tsv``,
+            by default False.
+        batch_jobs : int, optional
+            The number of method instances of a batch rule which run in parallel
+            within its job, by default 1. The threads and memory of the job are
+            the resources of a method instance times `batch_jobs`.
         """
+        if batch_jobs < 1:
+            raise ValueError("batch_jobs should be a positive integer.")
         # set paths and creat directory
         snake_path = Path(self.root, snakefile).resolve()
         config_path = Path(snake_path.parent, f"{snake_path.stem}.config.yml").resolve()
+        # the exporters are imported here to keep the import of hydroflows fast
+        from jinja2 import Environment, PackageLoader
+
+        from hydroflows.cli.batch import batch_records, hash_config, write_manifest
+        from hydroflows.methods.script.script_method import ScriptMethod
+        from hydroflows.templates.jinja_snake_rule import JinjaSnakeRule
+
+        # the config file including wildcards
+        config_dict = self.config.to_dict(mode="json", posix_path=True)
+        config_dict.update(
+            **{k.upper(): v for k, v in self.wildcards.to_dict().items()}
+        )
+        # save the method instances of batch rules to a manifest file
+        config_hash = hash_config(config_dict)
+        batch_manifests = {}
+        for rule_id in batch_rules or []:
+            rule = self.rules.get_rule(rule_id)
+            if not rule.wildcards["repeat"]:
+                raise ValueError(f"Rule {rule_id} has no repeat wildcards to batch.")
+            elif isinstance(rule.method, ScriptMethod):
+                raise ValueError(f"Rule {rule_id} with a script cannot be batched.")
+            manifest = f"{snake_path.stem}.batch/{rule_id}.jsonl"
+            records = batch_records(rule.method_instances)
+            write_manifest(Path(snake_path.parent, manifest), records, config_hash)
+            batch_manifests[rule_id] = manifest
+
         # render the snakefile template
         template_env = Environment(
             loader=PackageLoader("hydroflows"),
@@ -167,22 +260,24 @@ class Workflow:
             lstrip_blocks=True,
         )
         template = template_env.get_template("workflow.smk.jinja")
-        snake_rules = [JinjaSnakeRule(r) for r in self.rules]
+        snake_rules = [
+            JinjaSnakeRule(
+                r, batch_manifests, benchmark=benchmark, batch_jobs=batch_jobs
+            )
+            for r in self.rules
+        ]
         _str = template.render(
             version=__version__,
             configfile=config_path.name,
             rules=snake_rules,
             wildcards=self.wildcards.wildcards,
             dryrun=dryrun,
+            batch=bool(batch_manifests),
         )
         # write the snakefile and config file
         with open(snake_path, "w") as f:
             f.write(_str)
-        # save the config file including wildcards
-        config_dict = self.config.to_dict(mode="json", posix_path=True)
-        config_dict.update(
-            **{k.upper(): v for k, v in self.wildcards.to_dict().items()}
-        )
+        # save the config file
         with open(config_path, "w") as f:
             yaml.dump(config_dict, f)
 
@@ -201,6 +296,15 @@ class Workflow:
         dryrun : bool, optional
             Run the workflow in dryrun mode, by default False
         """
+        from jinja2 import Environment, PackageLoader
+
+        from hydroflows.templates import TEMPLATE_DIR
+        from hydroflows.templates.jinja_cwl_rule import (
+            CWLWorkflowView,
+            JinjaCWLRule,
+            JinjaCWLWorkflow,
+        )
+
         if cwlfile is None:
             cwlfile = f"{self.name}.cwl"
         cwlfile = Path(self.root, cwlfile).resolve()
@@ -215,10 +319,10 @@ class Workflow:
         template_workflow = template_env.get_template("workflow.cwl.jinja")
         template_rule = template_env.get_template("rule.cwl.jinja")
 
-        # Make a copy of workflow so any changes CWL parser will make to config, refs do not alter original
-        workflow_copy = deepcopy(self)
+        # the CWL export changes the config and references on a view of the workflow
+        workflow_view = CWLWorkflowView(self)
         cwl_workflow = JinjaCWLWorkflow(
-            rules=[JinjaCWLRule(r) for r in workflow_copy.rules], dryrun=dryrun
+            rules=[JinjaCWLRule(r, workflow_view) for r in self.rules], dryrun=dryrun
         )
 
         # Write CWL files for the methods
@@ -283,47 +387,168 @@ class Workflow:
     def run(
         self,
         max_workers=1,
+        executor: Optional[ExecutorType] = None,
+        force: bool = False,
+        force_rules: Optional[List[str]] = None,
+        checksum: bool = False,
+        cores: Optional[int] = None,
+        mem_mb: Optional[int] = None,
+        keep_going: bool = False,
+        trace: Optional[Path | str] = None,
+        profile: bool | int = False,
     ) -> None:
         """Run the workflow.
 
+        Method instances of all rules are dispatched as soon as the method instances
+        which produce their input files are finished, see :py:class:`Scheduler`.
+        Independent branches of the workflow are therefore run concurrently.
+        Method instances with up-to-date outputs are skipped, unless `force` is True,
+        see :py:class:`RunState`.
+
         Parameters
         ----------
         max_workers : int, optional
-            The maximum number of workers, by default 1.
-            Only used when dryrun is False.
-        missing_file_error : bool, optional
-            Raise an error when a file is missing, by default False.
-            This only works when dryrun is True.
+            The maximum number of method instances to run concurrently over all rules,
+            by default 1.
+        executor : {"threads", "processes", "serial"}, optional
+            The executor to run method instances with, by default None
+            (the default executor of each method, see :py:attr:`Method.executor`).
+            See :py:mod:`hydroflows.workflow.executors` for details.
+        force : bool, optional
+            Run all method instances, even if their outputs are up to date, by default False.
+        force_rules : List[str], optional
+            Rule IDs of which all method instances are run, even if their outputs are up to date.
+        checksum : bool, optional
+            Compare the content hash of modified input files to check if method instances
+            are up to date, by default False.
+        cores : int, optional
+            The number of CPU cores available to all method instances, by default None
+            (all cores of the machine). See :py:attr:`Rule.resources` for the cores required
+            per method instance.
+        mem_mb : int, optional
+            The memory in MB available to all method instances, by default None
+            (total memory of the machine).
+        keep_going : bool, optional
+            Continue with all method instances which do not depend on failed method instances,
+            by default False. If True, a :py:class:`RunError` with a summary of the failed
+            method instances is raised at the end of the run.
+        trace : Path | str, optional
+            Path of a Chrome trace-event JSON file, relative to the workflow root, to save
+            the spans of all method instances to, by default None (no tracing).
+            A summary of the run times per rule is logged.
+            See :py:mod:`hydroflows.workflow.tracing` for details.
+        profile : bool | int, optional
+            Save a memory and CPU profile of each method instance next to its first output
+            file, by default False. If an integer, the number of Python allocation hotspots
+            to profile. See :py:mod:`hydroflows.workflow.profiling` for details.
         """
-        nrules = len(self.rules)
-        for i, rule in enumerate(self.rules):
-            logger.info(
-                f"Run rule {i + 1}/{nrules}: {rule.rule_id} ({rule.n_runs} runs)"
-            )
-            rule.run(max_workers=max_workers)
-
-    def dryrun(self, missing_file_error: bool = False) -> None:
+        if force:
+            force_rules = self.rules.names
+        state = RunState(self.root, checksum=checksum)
+        scheduler = Scheduler(
+            self.rules,
+            max_workers=max_workers,
+            executor=executor,
+            state=state,
+            force_rules=force_rules,
+            cores=cores,
+            mem_mb=mem_mb,
+            keep_going=keep_going,
+        )
+        nrules, njobs = len(self.rules), len(scheduler.jobs)
+        logger.info(f"Run workflow: {nrules} rules ({njobs} runs)")
+        tracer = Tracer() if trace is not None else nullcontext()
+        # set working directory to workflow root
+        try:
+            with cwd(self.root), tracer, profiling(profile):
+                scheduler.run()
+        finally:
+            if trace is not None:
+                tracer.to_json(Path(self.root, trace))
+                logger.info(f"Run times per rule:\n{tracer.summary()}")
+
+    def dryrun(self, missing_file_error: bool = False) -> DryrunReport:
         """Dryrun the workflow.
 
+        The number of method instances per rule which are up to date from a previous run
+        and would be skipped by :py:meth:`run` is logged, see :py:class:`RunState`.
+
         Parameters
         ----------
         missing_file_error : bool, optional
             Raise an error when a file is missing, by default False.
+
+        Returns
+        -------
+        DryrunReport
+            The dryrun report with the number of method instances, missing input files
+            and output files which are not used by other rules per rule.
         """
         nrules = len(self.rules)
-        input_files = []
+        report = DryrunReport()
+        # all files created by previous rules
+        input_files: Set[Path] = set()
+        state = RunState(self.root)
+        # output files (posix paths) of method instances which would be run
+        run_outputs: Set[str] = set()
         for i, rule in enumerate(self.rules):
             logger.info(
                 f"Dryrun rule {i + 1}/{nrules}: {rule.rule_id} ({rule.n_runs} runs)"
             )
-            output_files = rule.dryrun(
+            output_files, missing_files = rule._dryrun(
                 missing_file_error=missing_file_error, input_files=input_files
             )
-            input_files = list(set(input_files + output_files))
+            input_files.update(output_files)
+            report.n_runs[rule.rule_id] = rule.n_runs
+            report.missing_inputs[rule.rule_id] = missing_files
+            if not state.file.is_file():
+                continue
+            n_up_to_date = 0
+            # check the stored records and input stamps first; method instances are
+            # only created if their template hash changed, see RunState.is_current
+            records = state.records(rule.rule_id)
+            with cwd(self.root):
+                for j, (_, outputs) in enumerate(rule._get_instance_paths()):
+                    paths = [path for _, path in outputs]
+                    record = records.get(state._key(paths))
+                    if (
+                        paths
+                        and all(path.is_file() for path in paths)
+                        and state.is_current(record)
+                        and run_outputs.isdisjoint(record["inputs"])
+                        and (
+                            record["template"] == rule._get_template_hash(j)
+                            or record["params"] == hash_params(rule.method_instances[j])
+                        )
+                    ):
+                        n_up_to_date += 1
+                    else:
+                        run_outputs.update(path.as_posix() for path in paths)
+            report.n_up_to_date[rule.rule_id] = n_up_to_date
+            if n_up_to_date > 0:
+                logger.info(
+                    f"{rule.rule_id}: {n_up_to_date}/{rule.n_runs} runs up to date"
+                )
+        # output files of intermediate rules which are not used by any rule
+        used_files = set()
+        for rule in self.rules:
+            for paths in rule.input.values():
+                used_files.update(paths)
+        result_rules = self.rules.result_rules
+        for rule in self.rules:
+            if rule.rule_id in result_rules:
+                continue
+            report.orphan_outputs[rule.rule_id] = [
+                path
+                for paths in rule.output.values()
+                for path in paths
+                if path not in used_files
+            ]
+        return report
 
     def plot_rulegraph(
         self, filename: str | Path | None = "rulegraph.svg", plot_rule_attrs=True
-    ) -> graphviz.Digraph:
+    ) -> "graphviz.Digraph":
         """Plot the rulegraph.
 
         The rulegraph is a directed graph where the nodes are rules and the edges are dependencies.
@@ -345,6 +570,8 @@ class Workflow:
         graphviz.Digraph
             The graphviz Digraph object.
         """
+        import graphviz
+
         node_attr = {
             "shape": "box",
             "style": "rounded",
@@ -1,9 +1,16 @@
 """Testing of command line interface."""
 
+import subprocess
+import sys
+import time
+
+import pytest
 from _pytest.monkeypatch import MonkeyPatch
 from click.testing import CliRunner, Result
 
+from hydroflows.cli.batch import write_manifest
 from hydroflows.cli.main import cli
+from hydroflows.cli.worker import _request_env, forward_method, worker_supported
 
 
 class MockMethod:
@@ -39,3 +46,122 @@ def test_cli_run_method(cli_obj: CliRunner, monkeypatch: MonkeyPatch):
     # uses the MockMethod class above
     result: Result = cli_obj.invoke(cli, ["method", "test_method"] + kwargs, echo=True)
     assert result.exit_code == 0
+
+
+def test_cli_run_workflow(cli_obj: CliRunner, monkeypatch: MonkeyPatch, tmp_path):
+    calls = {}
+
+    class MockWorkflow:
+        @classmethod
+        def from_yaml(cls, file):
+            return cls()
+
+        def run(self, **kwargs):
+            calls.update(kwargs)
+
+    monkeypatch.setattr("hydroflows.cli.main.Workflow", MockWorkflow)
+    workflow_file = tmp_path / "workflow.yml"
+    workflow_file.touch()
+    args = ["run", str(workflow_file), "-j", "2", "--force-rule", "rule1"]
+    args += ["--cores", "8", "--keep-going", "--trace", "trace.json"]
+    args += ["--profile"]
+    result: Result = cli_obj.invoke(cli, args, echo=True)
+    assert result.exit_code == 0
+    assert calls["max_workers"] == 2
+    assert calls["force_rules"] == ["rule1"]
+    assert not calls["force"]
+    assert calls["cores"] == 8
+    assert calls["mem_mb"] is None
+    assert calls["keep_going"]
+    assert calls["trace"] == "trace.json"
+    assert calls["profile"]
+
+
+@pytest.mark.skipif(not worker_supported(), reason="requires Unix sockets and fork")
+def test_cli_worker(cli_obj: CliRunner, monkeypatch: MonkeyPatch, tmp_path):
+    socket_path = tmp_path / "worker.sock"
+    args = [sys.executable, "-m", "hydroflows.cli.main", "worker"]
+    args += ["--socket", str(socket_path), "--preload", "run_dummy_event"]
+    proc = subprocess.Popen(args)
+    try:
+        for _ in range(100):
+            if socket_path.exists():
+                break
+            time.sleep(0.1)
+        assert socket_path.exists()
+        # only the current user can connect to the worker
+        assert socket_path.stat().st_mode & 0o777 == 0o600
+        # forward a method with relative paths to the worker
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "event.csv").touch()
+        (tmp_path / "settings.toml").touch()
+        kwargs = ["event_csv=event.csv", "settings_toml=settings.toml"]
+        kwargs += ["output_dir=output", "event_name=event1", "run_method=docker"]
+        args = ["method", "run_dummy_event", *kwargs, "--socket", str(socket_path)]
+        result = cli_obj.invoke(cli, args + ["--dryrun", "--touch-output"])
+        assert result.exit_code == 0
+        assert (tmp_path / "output" / "event_event1_result.nc").is_file()
+        # failed methods return a non-zero exit code
+        result = cli_obj.invoke(cli, ["method", "not_a_method", *args[2:]])
+        assert result.exit_code == 1
+        # a second worker is refused
+        result = cli_obj.invoke(cli, ["worker", "--socket", str(socket_path)])
+        assert result.exit_code == 1
+        # a socket of another user is not used
+        monkeypatch.setattr("hydroflows.cli.worker._is_owner", lambda path: False)
+        assert forward_method("run_dummy_event", {}, socket_path=socket_path) is None
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+    assert not socket_path.exists()
+    # without worker, the method runs in this process
+    monkeypatch.setattr("hydroflows.cli.main.Method", MockMethod)
+    args = ["method", "test_method", "file_in=a", "file_out=b"]
+    result = cli_obj.invoke(cli, args + ["--socket", str(socket_path)])
+    assert result.exit_code == 0
+
+
+def test_worker_request_env(monkeypatch: MonkeyPatch):
+    monkeypatch.setenv("OMP_NUM_THREADS", "2")
+    monkeypatch.setenv("HYDROFLOWS_PROFILE", "1")
+    monkeypatch.setenv("SECRET_TOKEN", "secret")
+    monkeypatch.delenv("JULIA_NUM_THREADS", raising=False)
+    env = _request_env()
+    assert env["OMP_NUM_THREADS"] == "2"
+    assert env["HYDROFLOWS_PROFILE"] == "1"
+    # variables which are not set are unset in the worker
+    assert env["JULIA_NUM_THREADS"] is None
+    assert "SECRET_TOKEN" not in env
+
+
+def test_cli_run_batch(cli_obj: CliRunner, monkeypatch: MonkeyPatch, tmp_path, caplog):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "event.csv").touch()
+    (tmp_path / "settings.toml").touch()
+    kwargs = {"event_csv": "event.csv", "settings_toml": "settings.toml"}
+    kwargs.update(output_dir="output", run_method="docker")
+    records = [
+        {"method": "run_dummy_event", "kwargs": {**kwargs, "event_name": f"event{i}"}}
+        for i in range(3)
+    ]
+    manifest = tmp_path / "manifest.jsonl"
+    write_manifest(manifest, records)
+    args = ["method", "--batch", str(manifest), "--dryrun", "--touch-output"]
+    result: Result = cli_obj.invoke(cli, args + ["-j", "2"])
+    assert result.exit_code == 0
+    for i in range(3):
+        assert (tmp_path / "output" / f"event_event{i}_result.nc").is_file()
+    # a failed method results in a non-zero exit code
+    write_manifest(manifest, records + [{"method": "not_a_method", "kwargs": {}}])
+    result = cli_obj.invoke(cli, args)
+    assert result.exit_code == 1
+    # a manifest written with another config is not run
+    write_manifest(manifest, records, config_hash="abc")
+    result = cli_obj.invoke(cli, args + ["--config-hash", "abc"])
+    assert result.exit_code == 0
+    result = cli_obj.invoke(cli, args + ["--config-hash", "def"])
+    assert result.exit_code == 1
+    assert "The config changed" in caplog.text
+    # METHOD_NAME cannot be combined with --batch
+    result = cli_obj.invoke(cli, args + ["run_dummy_event"])
+    assert result.exit_code == 2
@@ -1,3 +1,4 @@
+import shutil
 from datetime import datetime
 from pathlib import Path
 from typing import Tuple
@@ -15,7 +16,7 @@ from hydroflows.methods.coastal.coastal_tidal_analysis import CoastalTidalAnalys
 from hydroflows.methods.coastal.future_slr import FutureSLR
 from hydroflows.methods.coastal.get_coast_rp import GetCoastRP
 from hydroflows.methods.coastal.get_gtsm_data import GetGTSMData
-from hydroflows.methods.events import EventSet
+from hydroflows.methods.events import Event, EventSet
 from hydroflows.workflow.wildcards import resolve_wildcards
 
 
@@ -111,9 +112,11 @@ def test_coastal_event_from_rp_data(
     rule.run()
 
 
+@pytest.mark.parametrize("scale_on_read", [False, True])
 def test_future_climate_sea_level(
     test_data_dir: Path,
     tmp_path: Path,
+    scale_on_read: bool,
 ):
     event_set_yaml = test_data_dir / "event-sets" / "coastal_events.yml"
     event_set = EventSet.from_yaml(event_set_yaml)
@@ -125,6 +128,7 @@ def test_future_climate_sea_level(
         event_set_yaml=event_set_yaml,
         slr_unit="cm",
         event_root=out_root,
+        scale_on_read=scale_on_read,
     )
 
     rule.run()
@@ -144,3 +148,28 @@ def test_future_climate_sea_level(
     df_scaled = scaled_event_set.get_event(name).forcings[0].data
     df = event_set.get_event(name).forcings[0].data
     assert np.allclose(df_scaled.values - df.values, 0.5)  # 0.5 m
+
+
+def test_future_climate_sea_level_moved(test_data_dir: Path, tmp_path: Path):
+    # the original forcing is found if the event files are moved together
+    root = tmp_path / "project"
+    shutil.copytree(test_data_dir / "event-sets", root / "event-sets")
+    rule = FutureSLR(
+        scenarios={"RCP85": 50},
+        event_set_yaml=root / "event-sets" / "coastal_events.yml",
+        slr_unit="cm",
+        event_root=root / "future_climate_sea_level",
+        scale_on_read=True,
+    )
+    rule.run()
+    name = rule.params.event_names[0]
+    wildcards = {"scenario": "RCP85", "future_event": name}
+    fn_event = resolve_wildcards(rule.output.future_event_yaml, wildcards)
+    moved_root = root.rename(tmp_path / "moved")
+    fn_event = moved_root / Path(fn_event).relative_to(root)
+    event = Event.from_yaml(fn_event)
+    forcing = event.forcings[0]
+    assert forcing.path.resolve().is_relative_to(moved_root)
+    event_set = EventSet.from_yaml(moved_root / "event-sets" / "coastal_events.yml")
+    df = event_set.get_event(name).forcings[0].data
+    assert np.allclose(forcing.data.values - df.values, 0.5)  # 0.5 m
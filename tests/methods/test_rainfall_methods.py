@@ -1,10 +1,12 @@
+import shutil
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import pytest
 import xarray as xr
 
-from hydroflows.methods.events import EventSet
+from hydroflows.methods.events import Event, EventSet
 from hydroflows.methods.rainfall import (
     FutureClimateRainfall,
     GetERA5Rainfall,
@@ -48,6 +50,24 @@ def test_pluvial_design_events(tmp_precip_time_series_nc: Path, tmp_path: Path):
     assert df.max().max() == 1.0
 
 
+def test_pluvial_design_events_parquet(tmp_precip_time_series_nc: Path, tmp_path: Path):
+    p_events = PluvialDesignEvents(
+        precip_nc=tmp_precip_time_series_nc,
+        event_root=Path(tmp_path, "data"),
+        rps=[2, 10],
+        duration=24,
+        forcing_format="parquet",
+        plot_fig=False,
+    )
+    assert p_events.output.event_csv.suffix == ".parquet"
+    p_events.run()
+
+    event_set = EventSet.from_yaml(p_events.output.event_set_yaml)
+    event = event_set.get_event("p_event_rp002")
+    assert event.forcings[0].path.suffix == ".parquet"
+    assert event.forcings[0].data.max().max() == 1.0
+
+
 @pytest.mark.requires_test_data()
 def test_pluvial_design_events_gpex(region: Path, gpex_data: Path, tmp_path: Path):
     rps = [20, 39, 100]
@@ -79,9 +99,11 @@ def test_get_ERA5_rainfall(region: Path, tmp_path: Path):
     assert da["time"].min() == pd.Timestamp("2023-11-01")
 
 
+@pytest.mark.parametrize("scale_on_read", [False, True])
 def test_future_climate_rainfall(
     tmp_path: Path,
     event_set_file: Path,
+    scale_on_read: bool,
 ):
     out_root = Path(tmp_path / "CC_scaling")
 
@@ -89,7 +111,9 @@ def test_future_climate_rainfall(
         event_set_yaml=event_set_file,
         scenarios={"RCP4.5": 1.0, "RCP8.5": 1.5},
         event_root=out_root,
+        scale_on_read=scale_on_read,
     )
+    assert (fut_clim_rain.output.future_event_csv is None) == scale_on_read
 
     fut_clim_rain.run()
 
@@ -102,3 +126,35 @@ def test_future_climate_rainfall(
     # are all paths absolute
     assert all([Path(event["path"]).is_absolute() for event in scaled_event_set.events])
     assert all([Path(event["path"]).exists() for event in scaled_event_set.events])
+
+    # check that the events are scaled
+    event_set = EventSet.from_yaml(event_set_file)
+    name = scaled_event_set.events[0]["name"]
+    scaled_forcing = scaled_event_set.get_event(name).forcings[0]
+    forcing = event_set.get_event(name).forcings[0]
+    assert np.allclose(scaled_forcing.data.values, forcing.data.values * 1.07)
+    # the original forcing file is referenced if scaled on read
+    assert (scaled_forcing.path == forcing.path) == scale_on_read
+
+
+def test_future_climate_rainfall_moved(tmp_path: Path, test_data_dir: Path):
+    # the original forcing is found if the event files are moved together
+    root = tmp_path / "project"
+    shutil.copytree(test_data_dir / "event-sets", root / "event-sets")
+    fut_clim_rain = FutureClimateRainfall(
+        event_set_yaml=root / "event-sets" / "pluvial_events.yml",
+        scenarios={"RCP4.5": 1.0},
+        event_root=root / "CC_scaling",
+        scale_on_read=True,
+    )
+    fut_clim_rain.run()
+    wildcards = {"scenario": "RCP4.5", "future_event": "p_event01"}
+    fn_event = resolve_wildcards(fut_clim_rain.output.future_event_yaml, wildcards)
+    moved_root = root.rename(tmp_path / "moved")
+    fn_event = moved_root / Path(fn_event).relative_to(root)
+    event = Event.from_yaml(fn_event)
+    forcing = event.forcings[0]
+    assert forcing.path.resolve().is_relative_to(moved_root)
+    event_set = EventSet.from_yaml(moved_root / "event-sets" / "pluvial_events.yml")
+    df = event_set.get_event("p_event01").forcings[0].data
+    assert np.allclose(forcing.data.values, df.values * 1.07)
@@ -112,6 +112,14 @@ def test_script_method_run(tmp_path: Path):
     assert data == json.loads(method2.json_kwargs)
 
 
+def test_script_method_timeout(tmp_path: Path):
+    script_path = tmp_path / "sleep_script.py"
+    script_path.write_text("import time\n\ntime.sleep(10)\n")
+    method = ScriptMethod(script=script_path, output={"output1": tmp_path / "out.txt"})
+    with pytest.raises(subprocess.TimeoutExpired):
+        method.run(timeout=0.5)
+
+
 def test_script_method_snakemake(tmp_path: Path, has_snakemake: bool):
     # initialize workflow
     workflow = Workflow(name="test_workflow")
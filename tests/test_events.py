@@ -1,11 +1,20 @@
-from datetime import datetime
+import os
+import shutil
+from datetime import datetime, timedelta
 from pathlib import Path
 
 import pandas as pd
 import pytest
 from pydantic import ValidationError
 
-from hydroflows.methods.events import Event, EventSet, Forcing
+from hydroflows.methods.events import (
+    EVENT_CACHE,
+    Event,
+    EventSet,
+    Forcing,
+    write_event_store,
+    write_forcing_data,
+)
 
 
 def test_forcings(tmp_csv: Path, tmp_geojson: Path):
@@ -39,6 +48,43 @@ def test_forcings(tmp_csv: Path, tmp_geojson: Path):
         Forcing(type="unknown", path=tmp_csv)
 
 
+@pytest.mark.parametrize("suffix", [".csv", ".parquet", ".feather", ".nc"])
+def test_forcing_formats(suffix: str, tmp_path: Path):
+    times = pd.date_range(start="2021-01-01", periods=10, freq="h")
+    df = pd.DataFrame({1: range(10), 2: range(10, 20)}, index=times, dtype=float)
+    path = tmp_path / f"forcing{suffix}"
+    metadata = write_forcing_data(df, path)
+    assert metadata["timestep"] == timedelta(hours=1)
+
+    # metadata is read without the data
+    forcing = Forcing(type="water_level", path=path)
+    forcing.read_metadata()
+    assert forcing._data_df is None
+    assert forcing.model_dump(include=set(metadata)) == metadata
+
+    forcing = Forcing(type="water_level", path=path)
+    assert forcing.data.shape == (10, 2)
+    assert forcing.data.columns.tolist() == ["1", "2"]
+    assert forcing.tstart == times[0]
+    assert forcing.tstop == times[-1]
+
+    # column projection, time range selection and scaling
+    forcing = Forcing(
+        type="water_level",
+        path=path,
+        columns=["2"],
+        tstart=times[2],
+        tstop=times[5],
+        scale_add=1,
+    )
+    assert forcing.data.columns.tolist() == ["2"]
+    assert forcing.data.index.tolist() == times[2:6].tolist()
+    assert forcing.data["2"].tolist() == [13.0, 14.0, 15.0, 16.0]
+
+    with pytest.raises(NotImplementedError):
+        write_forcing_data(df, tmp_path / "forcing.txt")
+
+
 def test_event(tmp_csv: Path, tmp_path: Path):
     """Test the Event class."""
     forcing_dict = {
@@ -97,6 +143,69 @@ def test_event_set(test_data_dir: Path):
     assert event.return_period == 5.0
 
 
+def test_event_set_cache(test_data_dir: Path, tmp_path: Path):
+    shutil.copytree(test_data_dir / "event-sets", tmp_path, dirs_exist_ok=True)
+    event_set = EventSet.from_yaml(tmp_path / "pluvial_events.yml")
+    EVENT_CACHE.clear()
+
+    event = event_set.get_event("p_event01", read_data=True)
+    assert event.forcings[0]._data_df is not None
+    # modifying the returned event does not change the cached event
+    event.return_period = 1000
+    event2 = event_set.get_event("p_event01")
+    assert event2 is not event
+    assert event2.return_period == 5.0
+    assert event2.forcings[0]._data_df is not None
+
+    # the event is read again if its file changed
+    path = tmp_path / "p_event01.yml"
+    path.write_text(path.read_text().replace("return_period: 5", "return_period: 7"))
+    os.utime(path, ns=(0, 0))
+    assert event_set.get_event("p_event01").return_period == 7.0
+
+    # the index is updated with the events
+    event_set.add_event("p_event04", path)
+    assert event_set.get_event("p_event04").return_period == 7.0
+    assert event_set.get_event("unknown") is None
+    with pytest.raises(ValueError, match="not found"):
+        event_set.get_event("unknown", raise_error=True)
+
+    events = event_set.load_all(read_data=True, parallel=True)
+    assert list(events) == ["p_event01", "p_event02", "p_event03", "p_event04"]
+    assert all(event.forcings[0]._data_df is not None for event in events.values())
+
+
+@pytest.mark.parametrize("suffix", [".nc", ".zarr"])
+def test_event_store(suffix: str, event_set: EventSet, tmp_path: Path):
+    if suffix == ".zarr":
+        pytest.importorskip("zarr")
+    path = tmp_path / f"events{suffix}"
+    write_event_store(path, {"present": event_set, "future": event_set})
+
+    with pytest.raises(ValueError, match="Scenario"):
+        EventSet.from_store(path)
+    store_set = EventSet.from_store(path, scenario="future")
+    assert [event["name"] for event in store_set.events] == [
+        event["name"] for event in event_set.events
+    ]
+    name = event_set.events[0]["name"]
+    event = store_set.get_event(name)
+    forcing = event.forcings[0]
+    assert forcing.path == path
+    assert forcing.selection == {"event": name, "scenario": "future"}
+    # metadata is read without the data
+    assert forcing._data_df is None
+    assert event.tstart is not None
+    assert event.return_period == event_set.get_event(name).return_period
+    expected = event_set.get_event(name, read_data=True).forcings[0].data
+    pd.testing.assert_frame_equal(forcing.data, expected, check_freq=False)
+
+    # events referring to the store can be written to yaml
+    event.to_yaml(tmp_path / "event.yml")
+    event2 = Event.from_yaml(tmp_path / "event.yml")
+    assert event2.forcings[0].selection == forcing.selection
+
+
 def test_event_set_io(event_set: EventSet, tmp_path: Path):
     # write to yaml
     path_out = tmp_path / "eventset.yml"
@@ -0,0 +1,44 @@
+import subprocess
+import sys
+
+import pytest
+
+# import time budget of the CLI in seconds, which is imported for each snakemake job
+IMPORT_TIME_BUDGET = 1.0
+
+# heavy modules which should only be imported when needed
+LAZY_MODULES = [
+    "dask",
+    "graphviz",
+    "hydroflows.methods",
+    "hydroflows.templates",
+    "importlib_metadata",
+    "jinja2",
+    "tqdm",
+]
+
+
+def _import_times(module: str) -> dict[str, int]:
+    """Return the cumulative import time in microseconds per imported module."""
+    cmd = [sys.executable, "-X", "importtime", "-c", f"import {module}"]
+    subprocess.run(cmd, check=True, capture_output=True)  # warm up the bytecode cache
+    stderr = subprocess.run(cmd, check=True, capture_output=True, text=True).stderr
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize("module", ["hydroflows", "hydroflows.cli.main"])
+def test_import_time(module: str):
+    times = _import_times(module)
+    imported = [
+        name
+        for name in times
+        if any(name == lazy or name.startswith(f"{lazy}.") for lazy in LAZY_MODULES)
+    ]
+    assert not imported, f"{module} should not import {imported}"
+    assert times[module] / 1e6 < IMPORT_TIME_BUDGET
@@ -0,0 +1,58 @@
+import subprocess
+import sys
+import time
+
+import pytest
+
+from hydroflows.utils.docker_utils import run_container
+
+
+def test_run_container(mocker):
+    proc = run_container([sys.executable, "-c", "print('ok')"], check=True)
+    assert proc.returncode == 0
+    with pytest.raises(subprocess.CalledProcessError):
+        run_container([sys.executable, "-c", "exit(1)"], check=True)
+    # docker containers are named and killed on a timeout
+    popen = mocker.patch("subprocess.Popen")
+    popen.return_value.__enter__.return_value.wait.side_effect = (
+        subprocess.TimeoutExpired("docker", 1)
+    )
+    run = mocker.patch("subprocess.run")
+    with pytest.raises(subprocess.TimeoutExpired):
+        run_container(["docker", "run", "image"], timeout=1)
+    cmd = popen.call_args[0][0]
+    assert cmd[:4] == ["docker", "run", "--rm", "--name"]
+    assert run.call_args[0][0] == ["docker", "kill", cmd[4]]
+    # without a timeout the command is not changed
+    popen.return_value.__enter__.return_value.wait.side_effect = None
+    run_container(["docker", "run", "image"])
+    assert popen.call_args[0][0] == ["docker", "run", "image"]
+    assert not popen.call_args[1]["start_new_session"]
+
+
+def test_run_container_interrupt(mocker):
+    # the process is killed if the run is interrupted, also without a timeout
+    procs = []
+    wait = subprocess.Popen.wait
+
+    def interrupt(self, timeout=None):
+        if not procs:
+            procs.append(self)
+            raise KeyboardInterrupt
+        return wait(self, timeout)
+
+    mocker.patch.object(subprocess.Popen, "wait", interrupt)
+    with pytest.raises(KeyboardInterrupt):
+        run_container([sys.executable, "-c", "import time; time.sleep(30)"])
+    assert procs[0].returncode is not None
+    assert procs[0].returncode != 0
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="process groups on posix only")
+def test_run_container_timeout(tmp_path):
+    # child processes of the command are killed as well
+    script = "import subprocess, sys; subprocess.run([sys.executable, '-c', 'import time; time.sleep(2); open(\"out\", \"w\")'])"
+    with pytest.raises(subprocess.TimeoutExpired):
+        run_container([sys.executable, "-c", script], timeout=0.5, cwd=tmp_path)
+    time.sleep(2)
+    assert not (tmp_path / "out").exists()
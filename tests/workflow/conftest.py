@@ -29,6 +29,7 @@ class TestMethodParams(Parameters):
 
 class TestMethod(Method):
     name: str = "test_method"
+    clone_instances = True
 
     def __init__(
         self,
@@ -80,6 +81,7 @@ class ExpandMethodParams(Parameters):
 
 class MockExpandMethod(ExpandMethod):
     name: str = "mock_expand_method"
+    clone_instances = True
 
     def __init__(
         self,
@@ -114,6 +116,7 @@ class DoubleExpandMethodParams(Parameters):
 
 class MockDoubleExpandMethod(ExpandMethod):
     name: str = "mock_double_expand_method"
+    clone_instances = True
 
     def __init__(
         self,
@@ -152,6 +155,7 @@ class ReduceOutput(Parameters):
 
 class MockReduceMethod(ReduceMethod):
     name: str = "mock_reduce_method"
+    clone_instances = True
 
     def __init__(self, files: Union[Path, List[Path]], root: Path) -> None:
         self.input: ReduceInput = ReduceInput(files=files)
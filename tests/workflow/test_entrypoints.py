@@ -12,7 +12,10 @@ def test_method_eps():
     ep_str = f"{module}:{cls_name}"
 
     m = MethodEPS({name: ep_str})
+    # installed entry points are discovered when needed
+    assert not m._discovered
     assert len(m.entry_points) == 1
+    assert m._discovered
     # get_ep by name or class name (case insensitive)
     assert isinstance(m.get_ep(name), EntryPoint)
     assert isinstance(m.get_ep(name.upper()), EntryPoint)
@@ -6,6 +6,7 @@ import pytest
 from conftest import (
     MockDoubleExpandMethod,
     MockExpandMethod,
+    MockReduceMethod,
     TestMethod,
     create_test_method,
 )
@@ -60,6 +61,33 @@ def test_method_to_dict(test_method: TestMethod):
     }
 
 
+def test_method_dict_cache(test_method: TestMethod):
+    method_dict = test_method.dict
+    assert test_method.dict is method_dict
+    assert method_dict == test_method.to_dict()
+    # setting a field invalidates the cache
+    test_method.params.param = "new_param"
+    assert test_method.dict is not method_dict
+    assert test_method.dict["params"]["param"] == "new_param"
+    # reassigning the parameters invalidates the cache
+    method_dict = test_method.dict
+    test_method.input = test_method.input.model_copy(update={"input_file1": "new"})
+    assert test_method.dict["input"]["input_file1"] == "new"
+    # equality is based on the (cached) content
+    other = TestMethod(input_file1="new", input_file2="test_file2", param="new_param")
+    assert test_method == other
+    assert test_method._dict_hash == other._dict_hash
+    other.params.param = "other"
+    assert test_method != other
+    # modifying a list field in place invalidates the cache
+    reduce_method = MockReduceMethod(files=["file1", "file2"], root="root")
+    method_dict = reduce_method.dict
+    assert reduce_method.dict is method_dict
+    reduce_method.input.files.append(Path("file3"))
+    assert reduce_method.dict["input"]["files"] == ["file1", "file2", "file3"]
+    assert reduce_method != MockReduceMethod(files=["file1", "file2"], root="root")
+
+
 def test_method_from_kwargs():
     with pytest.raises(
         ValueError, match="Cannot initiate from Method without a method name"
@@ -70,9 +98,44 @@ def test_method_from_kwargs():
     assert test_method.input.input_file1.as_posix() == "test"
 
 
+def test_method_clone(test_method: TestMethod):
+    clone = test_method.clone(
+        input={"input_file1": "clone1"}, params={"param": "clone_param"}
+    )
+    assert isinstance(clone, TestMethod)
+    assert clone.input.input_file1 == Path("clone1")
+    assert clone.input.input_file2 == test_method.input.input_file2
+    assert clone.params.param == "clone_param"
+    # the original method is not changed
+    assert test_method.input.input_file1 != Path("clone1")
+    assert clone.output == test_method.output
+    assert clone.output is not test_method.output
+    # updated fields are validated
+    with pytest.raises(ValueError, match="validation error"):
+        test_method.clone(input={"input_file1": 1})
+    # mutable fields are not shared with the original method
+    reduce_method = MockReduceMethod(files=["file1", "file2"], root="root")
+    clone = reduce_method.clone()
+    clone.input.files.append(Path("file3"))
+    assert reduce_method.input.files == [Path("file1"), Path("file2")]
+    # the dict of the clone reflects the updated fields
+    test_method.to_dict()
+    clone = test_method.clone(params={"param": "clone_param"})
+    assert clone.to_dict()["params"]["param"] == "clone_param"
+
+
 def test_get_subclass():
     method_subclass = Method._get_subclass("test_method")
     assert issubclass(method_subclass, TestMethod)
+    # imported subclasses are registered by name and class name
+    assert Method._registry["test_method"] is TestMethod
+    assert Method._get_subclass("TestMethod") is TestMethod
+    # methods which are not imported are loaded from the entry points
+    method_subclass = Method._get_subclass("run_dummy_event")
+    assert method_subclass.__name__ == "RunDummyEvent"
+    assert Method._registry["rundummyevent"] is method_subclass
+    with pytest.raises(ValueError, match="Method not_a_method not found"):
+        Method._get_subclass("not_a_method")
 
 
 def test_dryrun(tmp_path):
@@ -0,0 +1,106 @@
+import json
+import os
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import dask.array as da
+import pytest
+
+from hydroflows.workflow import Workflow
+from hydroflows.workflow.profiling import PROFILE_ENV, profiling, profiling_top_n
+from tests.workflow.conftest import TestMethod
+
+
+def test_profiling_top_n(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.delenv(PROFILE_ENV, raising=False)
+    assert profiling_top_n() == 0
+    for value, top_n in [("0", 0), ("1", 10), ("true", 10), ("25", 25)]:
+        monkeypatch.setenv(PROFILE_ENV, value)
+        assert profiling_top_n() == top_n
+    monkeypatch.delenv(PROFILE_ENV)
+    with profiling(5):
+        assert profiling_top_n() == 5
+    assert PROFILE_ENV not in os.environ
+
+
+def test_profile_method(tmp_path: Path, mocker):
+    for name in ["test1", "test2"]:
+        (tmp_path / name).touch()
+    method = TestMethod(
+        input_file1=tmp_path / "test1",
+        input_file2=tmp_path / "test2",
+        out_root=tmp_path / "out",
+    )
+    _run = TestMethod._run
+
+    def run(self):
+        da.ones((100, 100), chunks=(10, 10)).sum().compute()
+        _run(self)
+
+    mocker.patch.object(TestMethod, "_run", run)
+    method.run()
+    profile_file = tmp_path / "out" / "output1.txt.profile.json"
+    assert not profile_file.is_file()
+    with profiling(5):
+        method.run()
+    with open(profile_file) as f:
+        profile = json.load(f)
+    assert profile["method"] == "test_method"
+    assert profile["status"] == "success"
+    assert not profile["shared"]
+    assert profile["peak_rss"] > 0
+    assert profile["cpu_time"]["user"] >= 0
+    assert 0 < len(profile["tracemalloc"]["top"]) <= 5
+    assert profile["dask"]["n_tasks"] > 0
+    assert profile["dask"]["tasks"]
+
+
+def test_profile_method_threads(tmp_path: Path, mocker):
+    # instances profiled concurrently share tracemalloc and the process peaks
+    for name in ["test1", "test2"]:
+        (tmp_path / name).touch()
+    methods = [
+        TestMethod(
+            input_file1=tmp_path / "test1",
+            input_file2=tmp_path / "test2",
+            out_root=tmp_path / name,
+        )
+        for name in ["short", "long"]
+    ]
+    barrier = threading.Barrier(2, timeout=10)
+    _run = TestMethod._run
+
+    def run(self):
+        barrier.wait()
+        # the short instance stops profiling while the long instance still runs
+        time.sleep(0.5 if self is methods[1] else 0)
+        _run(self)
+
+    mocker.patch.object(TestMethod, "_run", run)
+    with profiling(5), ThreadPoolExecutor(max_workers=2) as pool:
+        list(pool.map(lambda method: method.run(), methods))
+    assert not tracemalloc.is_tracing()
+    for name in ["short", "long"]:
+        with open(tmp_path / name / "output1.txt.profile.json") as f:
+            profile = json.load(f)
+        assert profile["status"] == "success"
+        assert profile["shared"]
+        assert profile["peak_rss"] is None
+        assert profile["tracemalloc"]["peak"] is None
+
+
+def test_workflow_run_profile(tmp_path: Path):
+    w = Workflow(root=tmp_path, wildcards={"region": ["region1", "region2"]})
+    for region in ["region1", "region2"]:
+        (tmp_path / region).mkdir()
+        (tmp_path / region / "test1").touch()
+        (tmp_path / region / "test2").touch()
+    test_method = TestMethod(input_file1="{region}/test1", input_file2="{region}/test2")
+    w.create_rule(test_method, rule_id="test_rule")
+    w.run(max_workers=2, executor="processes", profile=True)
+    for region in ["region1", "region2"]:
+        assert (tmp_path / region / "output1.txt.profile.json").is_file()
+    assert PROFILE_ENV not in os.environ
@@ -5,9 +5,15 @@ from pathlib import Path
 from weakref import ReferenceType
 
 import pytest
+from pydantic import ValidationError
 
+from hydroflows.utils.path_utils import cwd
 from hydroflows.workflow import Rule
+from hydroflows.workflow import rule as rule_module
+from hydroflows.workflow.failures import RunError
 from hydroflows.workflow.method import Method
+from hydroflows.workflow.resources import Resources
+from hydroflows.workflow.rule import MethodInstances
 from hydroflows.workflow.workflow import Workflow
 from tests.workflow.conftest import (
     ExpandMethodOutput,
@@ -73,6 +79,26 @@ def test_rule_to_dict(rule: Rule):
         "param": "param",
     }
     assert rule_dict["rule_id"] == "test_rule"
+    assert "resources" not in rule_dict
+
+
+def test_rule_resources(mocker, tmp_path: Path):
+    workflow = Workflow(root=tmp_path, wildcards={"region": ["region1", "region2"]})
+    test_method = TestMethod(input_file1="{region}/test1", input_file2="{region}/test2")
+    assert test_method.resources == Resources()
+    rule = Rule(test_method, workflow, resources={"cores": 4, "mem_mb": 1000})
+    assert rule.resources == Resources(cores=4, mem_mb=1000)
+    assert rule.to_dict()["resources"] == {"cores": 4, "mem_mb": 1000}
+    assert rule.resources.max_instances(cores=16, mem_mb=2500) == 2
+    assert rule.resources.max_instances(cores=2) == 1
+    assert Resources(heavy_io=True).max_instances(cores=8) == 1
+    with pytest.raises(ValidationError):
+        Rule(test_method, workflow, resources={"gpus": 1})
+    # the number of workers is limited by the available cores
+    mocker.patch.object(TestMethod, "run")
+    create_executor = mocker.spy(rule_module, "create_executor")
+    rule.run(max_workers=4, cores=8)
+    assert create_executor.call_args.args == ("threads", 2)
 
 
 def test_detect_wildcards_reduce(workflow: Workflow):
@@ -247,6 +273,64 @@ def test_create_method_instance(workflow: Workflow):
     assert method.output.output_file.as_posix() == "region1/{event}/file.yml"
 
 
+class UpperTestMethod(TestMethod):
+    name: str = "upper_test_method"
+    clone_instances = False
+
+    def __init__(self, input_file1: Path, input_file2: Path, **params) -> None:
+        super().__init__(input_file1, input_file2, **params)
+        # field derived from the wildcard value in the input
+        self.params.param = Path(self.input.input_file1).parent.name.upper()
+
+
+class LastRegionTestMethod(TestMethod):
+    def __init__(self, input_file1: Path, input_file2: Path, **params) -> None:
+        super().__init__(input_file1, input_file2, **params)
+        if Path(self.input.input_file1).parent.name == "r2":
+            self.params.param = "last"
+
+
+def test_create_method_instance_clone(mocker):
+    workflow = Workflow(wildcards={"region": ["r1", "r2"], "event": ["e1", "e2"]})
+    # methods are initialized for the first instance and cloned for the others
+    methods = [
+        TestMethod(input_file1="{region}/test1", input_file2="{region}/test2"),
+        MockReduceMethod(files="{region}/test{event}", root="{region}"),
+        MockExpandMethod(
+            input_file="{region}/test_file",
+            root="{region}",
+            events=["1", "2"],
+            wildcard="w",
+        ),
+    ]
+    for method in methods:
+        rule = Rule(method=method, workflow=workflow)
+        assert rule._clone_instances
+        spy = mocker.spy(rule, "_init_method_instance")
+        instances = list(rule._method_instances)
+        assert spy.call_count == 0
+        rule._clone_instances = False
+        assert [m.to_dict() for m in rule._method_instances] == [
+            m.to_dict() for m in instances
+        ]
+    expand_instance = instances[-1]
+    assert expand_instance.output.output_file.as_posix() == "r2/{w}/file.yml"
+    assert expand_instance.output_expanded["output_file"] == [
+        Path("r2/1/file.yml"),
+        Path("r2/2/file.yml"),
+    ]
+
+    # methods which derive fields from wildcard values are initialized
+    method = UpperTestMethod(input_file1="{region}/test1", input_file2="test2")
+    rule = Rule(method=method, workflow=workflow)
+    assert rule._clone_instances is False
+    assert [m.params.param for m in rule._method_instances] == ["R1", "R2"]
+    # cloning these methods is caught by a debug assertion
+    method = LastRegionTestMethod(input_file1="{region}/test1", input_file2="test2")
+    with pytest.raises(AssertionError, match="clone_instances"):
+        Rule(method=method, workflow=workflow)._method_instances[-1]
+
+
 def test_wildcard_product():
     # test normal method with repeat (in- and output) wildcards
     workflow = Workflow(wildcards={"region": ["region1", "xx"]})
@@ -284,6 +368,30 @@ def test_wildcard_product():
     ]
 
 
+def test_method_instances_lazy(mocker):
+    workflow = Workflow(wildcards={"region": ["r1", "r2"], "scen": ["s1", "s2", "s3"]})
+    spy = mocker.spy(Rule, "_create_method_instance")
+    test_method = TestMethod(
+        input_file1="{region}/{scen}/test1", input_file2="{region}/test2"
+    )
+    rule = Rule(method=test_method, workflow=workflow)
+    # only the first instance is created to validate the method
+    assert spy.call_count == 1
+    assert rule.n_runs == 6
+    assert rule.input["input_file2"] == [Path("r1/test2"), Path("r2/test2")]
+    methods = rule.method_instances
+    assert isinstance(methods, MethodInstances)
+    wildcards = rule._wildcard_product
+    assert [methods.get_wildcards(i) for i in range(6)] == wildcards
+    assert [m.input.input_file1 for m in methods] == [
+        Path(f"{wc['region']}/{wc['scen']}/test1") for wc in wildcards
+    ]
+    assert methods[-1].input.input_file1 == methods[5].input.input_file1
+    assert len(methods[1:3]) == 2
+    with pytest.raises(IndexError):
+        methods[6]
+
+
 def test_create_references_for_method_inputs(workflow: Workflow):
     method1 = TestMethod(input_file1="test.file", input_file2="test2.file")
     workflow.create_rule(method=method1, rule_id="method1")
@@ -413,6 +521,53 @@ def test_run(caplog, mocker):
     # test with max_workers
     rule.run(max_workers=2)
     assert TestMethod.run.call_count == 4
+    rule.run(max_workers=2, executor="serial")
+    assert TestMethod.run.call_count == 6
+    with pytest.raises(ValueError, match="Unknown executor"):
+        rule.run(executor="dask")
+
+
+def test_run_keep_going(mocker, tmp_path: Path):
+    workflow = Workflow(root=tmp_path, wildcards={"region": ["region1", "region2"]})
+    test_method = TestMethod(input_file1="{region}/test1", input_file2="{region}/test2")
+    rule = Rule(method=test_method, workflow=workflow)
+    run = mocker.patch.object(TestMethod, "run")
+    run.side_effect = [RuntimeError("failed"), None]
+    with pytest.raises(RuntimeError, match="failed"):
+        rule.run()
+    assert run.call_count == 1
+    # run all method instances and report the failures
+    run.side_effect = [RuntimeError("failed"), None]
+    with pytest.raises(RunError) as excinfo:
+        rule.run(max_workers=2, keep_going=True)
+    assert run.call_count == 3
+    (failure,) = excinfo.value.failures
+    assert failure.rule_id == "test_method"
+    assert failure.wildcards == {"region": "region1"}
+    assert "RuntimeError: failed" in str(excinfo.value)
+    # retry failed method instances
+    rule = Rule(method=test_method, workflow=workflow, retries=1, backoff=0)
+    assert rule.to_dict()["retries"] == 1
+    run.reset_mock()
+    run.side_effect = [RuntimeError("failed"), None, None]
+    rule.run()
+    assert run.call_count == 3
+    with pytest.raises(ValueError, match="retries"):
+        Rule(method=test_method, workflow=workflow, retries=-1)
+
+
+def test_run_processes(tmp_path: Path):
+    workflow = Workflow(root=tmp_path, wildcards={"region": ["region1", "region2"]})
+    for region in ["region1", "region2"]:
+        (tmp_path / region).mkdir()
+        for name in ["test1", "test2"]:
+            (tmp_path / region / name).touch()
+    test_method = TestMethod(input_file1="{region}/test1", input_file2="{region}/test2")
+    rule = Rule(method=test_method, workflow=workflow)
+    with cwd(tmp_path):
+        rule.run(max_workers=2, executor="processes")
+    for method in rule.method_instances:
+        assert all((tmp_path / path).is_file() for _, path in method._output_paths)
 
 
 def test_output_path_refs(w: Workflow):
@@ -96,3 +96,28 @@ def test_rules_order(workflow: Workflow):
     workflow.create_rule(method=method4, rule_id="method4")
 
     assert workflow.rules.names == ["method1", "method4", "method2", "method3"]
+
+
+def test_rules_output_index(w: Workflow):
+    method1 = TestMethod(input_file1="{region}/file1", input_file2="{region}/file2")
+    w.create_rule(method=method1, rule_id="method1")
+    rules = w.rules
+    assert rules._output_paths["region1/output1.txt"] == ("method1", "output_file1")
+    assert rules._output_paths["region2/output2.txt"] == ("method1", "output_file2")
+    assert rules._output_path_refs == {
+        "{region}/output1.txt": "$rules.method1.output.output_file1",
+        "{region}/output2.txt": "$rules.method1.output.output_file2",
+    }
+    # references are created from the index
+    method2 = TestMethod(
+        input_file1="{region}/output1.txt",
+        input_file2="file2",
+        out_root="{region}/root",
+    )
+    w.create_rule(method=method2, rule_id="method2")
+    assert method2.input._refs == {"input_file1": "$rules.method1.output.output_file1"}
+    assert rules.dependency_map["method2"] == ["method1"]
+    assert rules._output_paths["region1/root/output1.txt"] == (
+        "method2",
+        "output_file1",
+    )
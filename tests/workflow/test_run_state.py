@@ -0,0 +1,152 @@
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from hydroflows.utils.path_utils import cwd
+from hydroflows.workflow.executors import peak_memory, run_method
+from hydroflows.workflow.run_state import RunState
+from tests.workflow.conftest import MockExpandMethod, TestMethod
+from tests.workflow.test_scheduler import create_workflow
+
+
+def _touch_later(path: Path) -> None:
+    """Update the modification time of a file."""
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+def test_run_state(tmp_path: Path):
+    (tmp_path / "test1").write_text("a")
+    (tmp_path / "test2").write_text("b")
+    method = TestMethod(input_file1="test1", input_file2="test2")
+    with cwd(tmp_path):
+        state = RunState(tmp_path)
+        assert not state.is_up_to_date("rule", method)
+        method.run()
+        state.record("rule", method, start=0.0, peak_memory=1024)
+        assert state.is_up_to_date("rule", method)
+        # state is saved to file
+        assert RunState(tmp_path).is_up_to_date("rule", method)
+        (record,) = state.runs("rule")
+        assert record["status"] == "success"
+        assert record["start"] == 0.0
+        assert record["end"] > 0.0
+        assert record["peak_memory"] == 1024
+        assert set(record["outputs"]) == {"output1.txt", "output2.txt"}
+        # a run which did not finish is not up to date
+        state.record("rule", method, status="running")
+        assert not state.is_up_to_date("rule", method)
+        state.record("rule", method)
+        # changed params
+        method2 = TestMethod(input_file1="test1", input_file2="test2", param="new")
+        assert not state.is_up_to_date("rule", method2)
+        # modified input file with the same content
+        _touch_later(tmp_path / "test1")
+        assert not state.is_up_to_date("rule", method)
+        state = RunState(tmp_path, checksum=True)
+        state.record("rule", method)
+        _touch_later(tmp_path / "test1")
+        assert state.is_up_to_date("rule", method)
+        (tmp_path / "test1").write_text("c")
+        assert not state.is_up_to_date("rule", method)
+
+
+def test_workflow_run_incremental(tmp_path: Path, mocker):
+    w = create_workflow(tmp_path)
+    w.run()
+    spy = mocker.spy(TestMethod, "_run")
+    # all outputs are up to date
+    w.run()
+    assert spy.call_count == 0
+    w.run(force_rules=["repeat"])
+    assert spy.call_count == w.rules["repeat"].n_runs
+    w.run(force=True)
+    assert spy.call_count == 2 * w.rules["repeat"].n_runs
+    # only the instances downstream of a modified input are run
+    _touch_later(tmp_path / "region1" / "test.yml")
+    w.run()
+    assert spy.call_count == 2 * w.rules["repeat"].n_runs + 2
+    # run state is recorded for all method instances
+    state = RunState(tmp_path)
+    assert len(state.runs()) == sum(rule.n_runs for rule in w.rules)
+    assert all(record["status"] == "success" for record in state.runs())
+
+
+def test_workflow_run_resume(tmp_path: Path, mocker):
+    w = create_workflow(tmp_path)
+    # the first repeat instance fails after the expand instances are finished
+    mocker.patch.object(TestMethod, "_run", side_effect=RuntimeError("failed"))
+    with pytest.raises(RuntimeError, match="failed"):
+        w.run()
+    state = RunState(tmp_path)
+    assert [r["status"] for r in state.runs("repeat")] == ["failed"]
+    assert len(state.runs("expand")) == w.rules["expand"].n_runs
+    # the workflow resumes at the failed instance
+    mocker.stopall()
+    spy = mocker.spy(TestMethod, "_run")
+    spy_expand = mocker.spy(MockExpandMethod, "_run")
+    w.run()
+    assert spy.call_count == w.rules["repeat"].n_runs
+    assert spy_expand.call_count == 0
+
+
+def test_rule_run_state(tmp_path: Path, mocker):
+    w = create_workflow(tmp_path)
+    expand = w.rules["expand"]
+    spy = mocker.spy(MockExpandMethod, "_run")
+    # no run state by default
+    expand.run()
+    assert not (tmp_path / ".hydroflows").exists()
+    state = RunState(tmp_path)
+    expand.run(state=state)
+    assert spy.call_count == 2 * expand.n_runs
+    assert len(state.runs("expand")) == expand.n_runs
+    # all outputs are up to date
+    expand.run(state=state)
+    assert spy.call_count == 2 * expand.n_runs
+
+
+def test_workflow_dryrun_state(tmp_path: Path, mocker):
+    w = create_workflow(tmp_path)
+    w.run()
+    # up-to-date method instances are not created
+    spy = mocker.spy(type(w.rules["repeat"]), "_create_method_instance")
+    report = w.dryrun()
+    assert spy.call_count == 0
+    assert report.n_up_to_date == {rule.rule_id: rule.n_runs for rule in w.rules}
+    # only the instances downstream of a modified input are not up to date
+    _touch_later(tmp_path / "region1" / "test.yml")
+    report = w.dryrun()
+    assert report.n_up_to_date["repeat"] == w.rules["repeat"].n_runs - 2
+    assert report.n_up_to_date["reduce"] == 1
+    # changed params
+    w = create_workflow(tmp_path)
+    w.rules["repeat"].method.params.param = "new"
+    report = w.dryrun()
+    assert report.n_up_to_date["repeat"] == 0
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="Linux only")
+def test_run_method_peak_memory(mocker):
+    # a peak of the process before the run is not attributed to the run
+    data = b"x" * 512 * 2**20
+    del data
+    peak = peak_memory()
+    method = TestMethod(input_file1="test1", input_file2="test2")
+    mocker.patch.object(TestMethod, "run")
+    result = run_method(method)
+    assert 0 < result["peak_memory"] < peak - 256 * 2**20
+
+
+def test_run_method_peak_memory_threads(mocker):
+    # the peak of the process is not attributed to concurrent method instances
+    barrier = threading.Barrier(2, timeout=10)
+    method = TestMethod(input_file1="test1", input_file2="test2")
+    mocker.patch.object(TestMethod, "run", side_effect=lambda **kw: barrier.wait())
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        results = list(pool.map(run_method, [method, method]))
+    assert all(result["peak_memory"] is None for result in results)
@@ -0,0 +1,150 @@
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+import pytest
+
+from hydroflows.workflow import Workflow
+from hydroflows.workflow.failures import RunError
+from hydroflows.workflow.scheduler import Scheduler
+from tests.workflow.conftest import MockExpandMethod, MockReduceMethod, TestMethod
+
+
+def create_workflow(root: Path, resources: Optional[Dict] = None) -> Workflow:
+    w = Workflow(root=root, wildcards={"region": ["region1", "region2"]})
+    for region in ["region1", "region2"]:
+        (root / region).mkdir(parents=True, exist_ok=True)
+        (root / region / "test.yml").write_text("")
+    expand_method = MockExpandMethod(
+        input_file="{region}/test.yml",
+        root="{region}",
+        events=["1", "2"],
+        wildcard="event",
+    )
+    w.create_rule(expand_method, rule_id="expand")
+    test_method = TestMethod(
+        input_file1=expand_method.output.output_file,
+        input_file2=expand_method.output.output_file2,
+    )
+    w.create_rule(test_method, rule_id="repeat", resources=resources)
+    reduce_method = MockReduceMethod(
+        files=test_method.output.output_file1, root="out_{region}"
+    )
+    w.create_rule(reduce_method, rule_id="reduce")
+    return w
+
+
+def test_scheduler_jobs(tmp_path: Path):
+    w = create_workflow(tmp_path)
+    scheduler = Scheduler(w.rules, max_workers=2)
+    assert len(scheduler.jobs) == sum(rule.n_runs for rule in w.rules)
+    jobs = {(job.rule.rule_id, job.index): job for job in scheduler.jobs}
+    # each repeat job depends on the expand job of the same region only
+    for job in scheduler.jobs:
+        if job.rule.rule_id == "expand":
+            assert job.upstream == set()
+        elif job.rule.rule_id == "repeat":
+            assert len(job.upstream) == 1
+            (upstream_job,) = job.upstream
+            region = job.method.input.input_file1.parts[0]
+            assert upstream_job.method.input.input_file.parts[0] == region
+        elif job.rule.rule_id == "reduce":
+            # reduce over all events of a region
+            assert len(job.upstream) == 2
+    assert jobs[("expand", 0)].downstream
+    with pytest.raises(ValueError, match="Unknown executor"):
+        Scheduler(w.rules, executor="dask")
+    with pytest.raises(ValueError, match="max_workers"):
+        Scheduler(w.rules, max_workers=0)
+
+
+def test_scheduler_jobs_no_path_match(tmp_path: Path, mocker):
+    w = create_workflow(tmp_path)
+    # input paths which do not match the output paths of the upstream rule exactly
+    mocker.patch.object(
+        TestMethod,
+        "_input_paths",
+        new_callable=mocker.PropertyMock,
+        return_value=[("input_file1", tmp_path / "other.yml")],
+    )
+    scheduler = Scheduler(w.rules)
+    expand_jobs = {job for job in scheduler.jobs if job.rule.rule_id == "expand"}
+    # each repeat job waits for all expand jobs
+    for job in scheduler.jobs:
+        if job.rule.rule_id == "repeat":
+            assert job.upstream == expand_jobs
+
+
+@pytest.mark.parametrize(
+    ("max_workers", "executor"),
+    [(1, None), (3, None), (3, "serial"), (2, "processes")],
+)
+def test_scheduler_run(tmp_path: Path, max_workers: int, executor: str):
+    w = create_workflow(tmp_path)
+    w.run(max_workers=max_workers, executor=executor)
+    for region in ["region1", "region2"]:
+        assert (tmp_path / f"out_{region}" / "output_file.yml").is_file()
+
+
+def test_scheduler_run_error(tmp_path: Path, mocker):
+    w = create_workflow(tmp_path)
+    mocker.patch.object(TestMethod, "_run", side_effect=RuntimeError("failed"))
+    with pytest.raises(RuntimeError, match="failed"):
+        w.run(max_workers=2)
+    # downstream reduce rule is never started
+    assert not (tmp_path / "out_region1" / "output_file.yml").is_file()
+
+
+def test_scheduler_keep_going(tmp_path: Path, mocker):
+    w = create_workflow(tmp_path)
+    _run = TestMethod._run
+
+    def run(self):
+        if self.input.input_file1.parts[0] == "region1":
+            raise RuntimeError("failed")
+        _run(self)
+
+    mocker.patch.object(TestMethod, "_run", run)
+    with pytest.raises(RunError) as excinfo:
+        w.run(max_workers=2, keep_going=True)
+    # both events of region1 failed; region2 is finished
+    failures = excinfo.value.failures
+    assert [f.wildcards["region"] for f in failures] == ["region1", "region1"]
+    assert excinfo.value.skipped == {"reduce": 1}
+    assert not (tmp_path / "out_region1" / "output_file.yml").is_file()
+    assert (tmp_path / "out_region2" / "output_file.yml").is_file()
+    assert "2 method instance(s) failed" in str(excinfo.value)
+
+
+@pytest.mark.parametrize(
+    ("resources", "cores", "max_running"),
+    [({"cores": 2}, 4, 2), ({"cores": 4}, 2, 1), ({"heavy_io": True}, 4, 1)],
+)
+def test_scheduler_resources(
+    tmp_path: Path, mocker, resources: Dict, cores: int, max_running: int
+):
+    w = create_workflow(tmp_path, resources=resources)
+    assert (
+        w.rules.get_rule("repeat").resources.model_dump(include=resources.keys())
+        == resources
+    )
+    running, counts, lock = [], [], threading.Lock()
+    _run = TestMethod._run
+
+    def run(self):
+        with lock:
+            running.append(self)
+            counts.append(len(running))
+        time.sleep(0.05)
+        _run(self)
+        with lock:
+            running.remove(self)
+
+    mocker.patch.object(TestMethod, "_run", run)
+    w.run(max_workers=4, cores=cores)
+    # the number of concurrent repeat runs is limited by the resources
+    assert len(counts) == 4
+    assert max(counts) == max_running
+    with pytest.raises(ValueError, match="cores"):
+        Scheduler(w.rules, cores=0)
@@ -0,0 +1,69 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from hydroflows.workflow import Workflow
+from hydroflows.workflow.tracing import Tracer, get_tracer, span, trace_context
+from tests.workflow.conftest import TestMethod
+
+
+def test_tracer(tmp_path: Path):
+    with span("untraced") as args:
+        assert args == {}
+    with Tracer() as tracer:
+        assert get_tracer() is tracer
+        with trace_context({"rule": "rule1", "run": 1}):
+            with span("run", method="test_method") as args:
+                with span("_run"):
+                    pass
+                args.update(bytes_read=2**20)
+        with span("other"):
+            pass
+    assert get_tracer() is None
+    names = [event["name"] for event in tracer.events]
+    assert names == ["_run", "run", "other"]
+    assert tracer.events[1]["args"] == {
+        "rule": "rule1",
+        "run": 1,
+        "method": "test_method",
+        "bytes_read": 2**20,
+    }
+    tracer.to_json(tmp_path / "trace.json")
+    with open(tmp_path / "trace.json") as f:
+        trace = json.load(f)
+    assert all(event["ph"] in ["X", "M"] for event in trace["traceEvents"])
+    summary = tracer.summary().splitlines()
+    assert summary[0].split()[:2] == ["rule", "runs"]
+    assert summary[1].split()[:2] == ["rule1", "1"]
+
+
+@pytest.mark.parametrize("executor", ["threads", "processes"])
+def test_workflow_run_trace(tmp_path: Path, executor: str):
+    w = Workflow(root=tmp_path, wildcards={"region": ["region1", "region2"]})
+    for region in ["region1", "region2"]:
+        (tmp_path / region).mkdir()
+        (tmp_path / region / "test1").write_text("test")
+        (tmp_path / region / "test2").write_text("test")
+    test_method = TestMethod(input_file1="{region}/test1", input_file2="{region}/test2")
+    w.create_rule(test_method, rule_id="test_rule")
+    w.run(max_workers=2, executor=executor, trace="trace.json")
+    with open(tmp_path / "trace.json") as f:
+        events = json.load(f)["traceEvents"]
+    spans = [event for event in events if event["ph"] == "X"]
+    names = {event["name"] for event in spans}
+    assert names == {
+        "queued",
+        "run",
+        "check_input_output_paths",
+        "_run",
+        "check_output_exists",
+    }
+    runs = [event for event in spans if event["name"] == "run"]
+    assert len(runs) == 2
+    wildcards = sorted(event["args"]["wildcards"]["region"] for event in runs)
+    assert wildcards == ["region1", "region2"]
+    assert all(event["args"]["rule"] == "test_rule" for event in runs)
+    assert all(event["args"]["bytes_read"] == 8 for event in runs)
+    # spans are not recorded when tracing is not active
+    assert get_tracer() is None
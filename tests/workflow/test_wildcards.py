@@ -5,7 +5,12 @@ from pathlib import Path
 
 import pytest
 
-from hydroflows.workflow.wildcards import Wildcards, resolve_wildcards, wildcard_product
+from hydroflows.workflow.wildcards import (
+    Wildcards,
+    WildcardTemplate,
+    resolve_wildcards,
+    wildcard_product,
+)
 
 
 def test_wildcards(caplog):
@@ -108,3 +113,26 @@ def test_resolve_wildcards():
     assert (
         resolve_wildcards("No wildcards present.", wildcards) == "No wildcards present."
     )
+
+
+def test_wildcard_template():
+    template = WildcardTemplate.parse(Path("{region}/{event}/{region}.nc"))
+    assert WildcardTemplate.parse(Path("{region}/{event}/{region}.nc")) is template
+    assert template.names == ("region", "event")
+    assert template.fill({"region": "r1", "event": "e1", "other": "x"}) == Path(
+        "r1/e1/r1.nc"
+    )
+    # the product is taken in the order of the wildcards dict
+    assert template.expand({"event": ["e1", "e2"], "region": ["r1", "r2"]}) == [
+        Path("r1/e1/r1.nc"),
+        Path("r2/e1/r2.nc"),
+        Path("r1/e2/r1.nc"),
+        Path("r2/e2/r2.nc"),
+    ]
+    with pytest.raises(KeyError, match="Wildcard values missing for: event"):
+        template.fill({"region": "r1"})
+    # strings without wildcards
+    template = WildcardTemplate.parse("no wildcards")
+    assert template.names == ()
+    assert template.fill({}) == "no wildcards"
+    assert template.expand({"region": ["r1", "r2"]}) == ["no wildcards"]
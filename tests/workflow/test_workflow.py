@@ -8,11 +8,13 @@ from pathlib import Path
 import pytest
 import yaml
 
+from hydroflows.cli.batch import hash_config, read_manifest
 from hydroflows.workflow import (
     Rule,
     Workflow,
     WorkflowConfig,
 )
+from hydroflows.workflow.dryrun import DryrunReport
 from hydroflows.workflow.reference import Ref
 from hydroflows.workflow.wildcards import Wildcards
 from tests.workflow.conftest import (
@@ -48,7 +50,9 @@ def create_workflow_with_mock_methods(
         input_file2=mock_expand_method.output.output_file2,
     )
 
-    w.create_rule(mock_method, rule_id="mock_rule")
+    w.create_rule(
+        mock_method, rule_id="mock_rule", resources={"cores": 2, "mem_mb": 1000}
+    )
 
     mock_reduce_method = MockReduceMethod(
         files=mock_method.output.output_file1,
@@ -159,6 +163,9 @@ def test_workflow_to_snakemake(workflow: Workflow, tmp_path, has_snakemake: bool
     w.to_snakemake(snakefile="Snakefile")
     assert "Snakefile.config.yml" in os.listdir(tmp_path)
     assert "Snakefile" in os.listdir(tmp_path)
+    snakefile = (tmp_path / "Snakefile").read_text()
+    assert "threads: 2" in snakefile
+    assert "mem_mb=1000" in snakefile
     if has_snakemake:
         subprocess.run(
             [
@@ -169,6 +176,48 @@ def test_workflow_to_snakemake(workflow: Workflow, tmp_path, has_snakemake: bool
         ).check_returncode()
 
 
+def test_workflow_to_snakemake_group_benchmark(workflow: Workflow, tmp_path):
+    w = create_workflow_with_mock_methods(workflow, root=tmp_path)
+    w.rules.get_rule("mock_rule").group = "event"
+    assert w.rules.get_rule("mock_rule").to_dict()["group"] == "event"
+    w.to_snakemake(snakefile="Snakefile", benchmark=True)
+    snakefile = (tmp_path / "Snakefile").read_text()
+    assert snakefile.count('group: "event"') == 1
+    assert '"benchmarks/mock_rule/{region}/{event}.tsv"' in snakefile
+    assert '"benchmarks/mock_reduce_rule/{region}.tsv"' in snakefile
+    # batch jobs have no wildcards
+    w.to_snakemake(snakefile="Snakefile", benchmark=True, batch_rules=["mock_rule"])
+    snakefile = (tmp_path / "Snakefile").read_text()
+    assert '"benchmarks/mock_rule.tsv"' in snakefile
+
+
+def test_workflow_to_snakemake_batch(workflow: Workflow, tmp_path):
+    w = create_workflow_with_mock_methods(workflow, root=tmp_path)
+    w.to_snakemake(snakefile="Snakefile", batch_rules=["mock_rule"], batch_jobs=2)
+    snakefile = (tmp_path / "Snakefile").read_text()
+    manifest = tmp_path / "Snakefile.batch" / "mock_rule.jsonl"
+    assert f'--batch "{manifest.relative_to(tmp_path).as_posix()}"' in snakefile
+    # threads are reserved for the method instances which run in parallel
+    assert "--config-hash {params.config_hash} -j 2" in snakefile
+    assert "threads: 4" in snakefile
+    assert "mem_mb=2000" in snakefile
+    # the manifest is only valid for the config it was written with
+    with open(tmp_path / "Snakefile.config.yml") as f:
+        config = yaml.safe_load(f)
+    assert "CONFIG_HASH=hash_config(config)" in snakefile
+    read_manifest(manifest, config_hash=hash_config(config))
+    config["changed"] = True
+    with pytest.raises(ValueError, match="The config changed"):
+        read_manifest(manifest, config_hash=hash_config(config))
+    # all method instances are run with one job
+    records = read_manifest(manifest)
+    assert len(records) == w.rules.get_rule("mock_rule").n_runs
+    assert records[0]["method"] == "test_method"
+    assert 'expand("{region}/{event}/output1.txt", region=REGION, event=EVENT)' in (
+        snakefile
+    )
+
+
 def validate_cwl_files(cwl_folder: Path):
     for file in glob.glob((cwl_folder / "*.cwl").as_posix()):
         cmd = ["cwltool", "--validate", file]
@@ -197,6 +246,23 @@ def test_workflow_to_cwl(w: Workflow, tmp_path):
     validate_cwl_workflow(cwl_file)
 
 
+def test_workflow_to_cwl_view(w: Workflow, tmp_path):
+    test_file = tmp_path / "test.yml"
+    w = create_workflow_with_mock_methods(w, root=tmp_path, input_file=test_file)
+    config = w.config.to_dict()
+    refs = [dict(rule.method.input._refs) for rule in w.rules]
+    w.to_cwl(cwlfile=tmp_path / "workflow.cwl")
+    # the workflow is not changed by the export
+    assert w.config.to_dict() == config
+    assert [rule.method.input._refs for rule in w.rules] == refs
+    # resources are exported as ResourceRequirement
+    cwl = yaml.safe_load((tmp_path / "cwl" / "test_method.cwl").read_text())
+    resources = cwl["requirements"]["ResourceRequirement"]
+    assert resources == {"coresMin": 2, "ramMin": 1000}
+    cwl = yaml.safe_load((tmp_path / "cwl" / "mock_expand_method.cwl").read_text())
+    assert "ResourceRequirement" not in cwl["requirements"]
+
+
 def test_workflow_to_yaml(tmp_path, workflow_yaml_dict):
     test_file = tmp_path / "test.yml"
     with open(test_file, "w") as f:
@@ -219,16 +285,35 @@ def test_workflow_dryrun(mocker, workflow: Workflow, tmp_path: Path, caplog):
     caplog.set_level(logging.INFO)
     w = create_workflow_with_mock_methods(workflow, root=tmp_path)
 
-    w.dryrun()
+    report = w.dryrun()
 
     for rule in w.rules:
         assert rule.rule_id in caplog.text
+    assert isinstance(report, DryrunReport)
+    assert report.ok
+    assert report.n_runs == {rule.rule_id: rule.n_runs for rule in w.rules}
+    # output_file2 of mock_expand_rule is used; output_file2 of mock_rule is not
+    assert report.orphan_outputs["mock_expand_rule"] == []
+    assert (
+        report.orphan_outputs["mock_rule"]
+        == w.rules["mock_rule"].output["output_file2"]
+    )
+    assert "mock_reduce_rule" not in report.orphan_outputs
+    assert "mock_rule" in report.summary()
+
+    # missing input file is reported once
+    (tmp_path / "test.yml").unlink()
+    report = w.dryrun()
+    assert not report.ok
+    assert report.missing_inputs["mock_expand_rule"] == [Path("test.yml")]
+    with pytest.raises(FileNotFoundError, match="test.yml"):
+        w.dryrun(missing_file_error=True)
 
     # Run workflow without region wildcard
 
 
 def test_workflow_run(tmp_path: Path):
-    w = Workflow(name="test_workflow")
+    w = Workflow(name="test_workflow", root=tmp_path)
     root = tmp_path / "test_root"
     root.mkdir()
     input_file = "test.txt"